@@ -12,6 +12,10 @@ class Anomaly(dict):
 
 	TYPE = None
 
+	# Timestamp and status of the latest symptom, maintained by `add_symptom()`
+	LastSymptomTimestamp = None
+	LastSymptomStatus = "open"
+
 	def is_closed(self):
 		"""
 		Description:
@@ -32,6 +36,58 @@ class Anomaly(dict):
 		self["D"] = self["ts_end"] - self["@timestamp"]
 		self["status"] = "closed"
 
+	def add_symptom(self, symptom):
+		"""
+		Description: Appends the symptom to the anomaly and updates the latest symptom.
+		Symptoms should be added by this method, so that the latest symptom does not need to be searched for.
+
+		"""
+		self["symptoms"].append(symptom)
+
+		if self.LastSymptomTimestamp is None:
+			self._find_last_symptom()
+			return
+
+		timestamp = symptom.get("@timestamp")
+		if timestamp > self.LastSymptomTimestamp:
+			self.LastSymptomTimestamp = timestamp
+			self.LastSymptomStatus = symptom.get("status", "open")
+
+	def last_symptom(self):
+		"""
+		Description:
+
+		:return: tuple of the timestamp and the status of the latest symptom, the timestamp is 0 if there is no symptom
+
+		"""
+		if self.LastSymptomTimestamp is None:
+			self._find_last_symptom()
+		return self.LastSymptomTimestamp, self.LastSymptomStatus
+
+	def _find_last_symptom(self):
+		# Used only for anomalies, whose symptoms were not added by add_symptom(), e.g. loaded ones
+		last_timestamp = 0
+		last_status = "open"
+		for symptom in self.get("symptoms", []):
+			timestamp = symptom.get("@timestamp")
+			if timestamp > last_timestamp:
+				last_timestamp = timestamp
+				last_status = symptom.get("status", "open")
+
+		self.LastSymptomTimestamp = last_timestamp
+		self.LastSymptomStatus = last_status
+
+	def get_deadline(self):
+		"""
+		Description: Tells the AnomalyStorage, when `on_tick()` has to be called again.
+		The anomaly is always ticked after a new symptom is added.
+
+		:return: time after which `on_tick()` is called, `math.inf` for never or `None` for every tick (default)
+
+		:hint: Override to avoid ticking of all open anomalies.
+		"""
+		return None
+
 	async def on_tick(self, current_time):
 		"""
 		Description:
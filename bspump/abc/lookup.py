@@ -1,5 +1,6 @@
 import asyncio
 import collections.abc
+import functools
 import json
 import logging
 from typing import Optional
@@ -209,13 +210,113 @@ class MappingLookup(Lookup, collections.abc.Mapping):
 
 class AsyncLookupMixin(Lookup):
 	"""
-	Description:
+	Description: Lookup, which obtains values asynchronously via `get()`, typically from a database.
+
+	Values of missing keys should be obtained by `fetch()`, which coalesces concurrent requests for the same key
+	into one query (single-flight). When `batch_size` is set, keys requested within `batch_delay` seconds
+	are collected and fetched by one multi-key query (see `_fetch_many()`), up to `batch_size` keys at once.
+
+	Override `_fetch_one()` to fetch a single key, and `_fetch_many()` to fetch more keys by one query.
 
 	"""
 
+	ConfigDefaults = {
+		'batch_size': 0,  # Maximal number of keys fetched by one query, 0 disables batching
+		'batch_delay': 0.005,  # Seconds to wait for other keys to the batch
+	}
+
+	def __init__(self, app, id=None, config=None, lazy=False):
+		super().__init__(app, id=id, config=config, lazy=lazy)
+		self.BatchSize = int(self.Config['batch_size'])
+		self.BatchDelay = float(self.Config['batch_delay'])
+
+		self.InFlight = {}  # Key -> future of the fetch
+		self.Batch = {}  # Key -> future of keys waiting for the batch
+		self.BatchHandle = None
+
 	async def get(self, key):
 		raise NotImplementedError()
 
+	async def fetch(self, key):
+		"""
+		Description: Fetches the value of the `key` from the backend.
+		Concurrent calls with the same key share one query.
+
+		:return: value or None
+
+		|
+
+		"""
+		future = self.InFlight.get(key)
+		if future is None:
+			if self.BatchSize > 0:
+				future = self._enqueue(key)
+			else:
+				future = asyncio.ensure_future(self._fetch_one(key))
+
+			self.InFlight[key] = future
+			future.add_done_callback(functools.partial(self._on_fetched, key))
+
+		# The shared fetch is not cancelled together with one of its waiters
+		return await asyncio.shield(future)
+
+	async def _fetch_one(self, key):
+		"""
+		Description: Override this method to fetch a value of one key.
+
+		:return: value or None
+
+		"""
+		return await self._find_one(key)
+
+	async def _fetch_many(self, keys):
+		"""
+		Description: Override this method to fetch values of more keys by one query.
+		By default, keys are fetched by concurrent `_fetch_one()` calls.
+
+		:return: dictionary, which maps keys to values, missing keys are considered to be None
+
+		"""
+		values = await asyncio.gather(*[self._fetch_one(key) for key in keys])
+		return dict(zip(keys, values))
+
+	def _on_fetched(self, key, future):
+		if self.InFlight.get(key) is future:
+			del self.InFlight[key]
+
+	def _enqueue(self, key):
+		future = self.Loop.create_future()
+		self.Batch[key] = future
+
+		if len(self.Batch) >= self.BatchSize:
+			self._flush_batch()
+		elif self.BatchHandle is None:
+			self.BatchHandle = self.Loop.call_later(self.BatchDelay, self._flush_batch)
+
+		return future
+
+	def _flush_batch(self):
+		if self.BatchHandle is not None:
+			self.BatchHandle.cancel()
+			self.BatchHandle = None
+
+		batch, self.Batch = self.Batch, {}
+		if len(batch) > 0:
+			asyncio.ensure_future(self._fetch_batch(batch))
+
+	async def _fetch_batch(self, batch):
+		try:
+			values = await self._fetch_many(list(batch.keys()))
+		except Exception as e:
+			for future in batch.values():
+				if not future.done():
+					future.set_exception(e)
+			return
+
+		for key, future in batch.items():
+			if not future.done():
+				future.set_result(values.get(key))
+
 
 class DictionaryLookup(MappingLookup):
 	"""
@@ -98,6 +98,32 @@ class ProcessorBase(asab.Configurable):
 		raise NotImplementedError()
 
 
+	def process_batch(self, context, events):
+		"""
+		Can be implemented to process a list of events at once, see :meth:`Pipeline.process_batch() <bspump.Pipeline.process_batch()>`.
+		All events of the batch share the same context.
+
+		The default implementation calls `process()` for each event.
+
+		**Parameters**
+
+		context :
+				Additional information passed to the method.
+
+		events : list
+				List of events.
+
+		:return: List of events that are passed to the next :meth:`processor <bspump.Processor()>`.
+
+		"""
+		processed = []
+		for event in events:
+			event = self.process(context, event)
+			if event is not None:
+				processed.append(event)
+		return processed
+
+
 	def locate_address(self):
 		"""
 		Returns an ID of a :meth:`processor <bspump.Processor()>` and a :meth:`Pipeline <bspump.Pipeline()>`.
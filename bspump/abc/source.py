@@ -71,6 +71,29 @@ class Source(asab.Configurable):
 			self.EventsToPublish -= 1
 
 
+	async def process_batch(self, events, context=None):
+		"""
+		This method is used to emit a list of events into a :meth:`Pipeline <bspump.Pipeline()>` at once.
+		All events of the batch share the same context.
+
+		**Parameters**
+
+		events : list
+				List of events that are emitted into a :meth:`Pipeline <bspump.Pipeline()>`.
+
+		context : default None
+				Additional information.
+
+		"""
+		await self.Pipeline.process_batch(events, context=context)
+
+		self.EventCount += len(events)
+		if self.MQTTService and self.EventsToPublish > 0:
+			for event in events[:self.EventsToPublish]:
+				self.MQTTService.publish_event(self.Pipeline.Id, self, event, self.EventsToPublish)
+				self.EventsToPublish -= 1
+
+
 	def start(self, loop):
 		"""
 		Starts the :meth:`Pipeline <bspump.Pipeline()>` through the _main method, but if main method is implemented
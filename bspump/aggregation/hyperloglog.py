@@ -1,13 +1,17 @@
 import numpy as np
-import zlib
 
 
 class HyperLogLog(object):
 	'''
-		This is the implementation of HyperLogLog++ algorithm,
+		This is the implementation of HyperLogLog algorithm,
 		which estimates cardinality of the set with average 2%,
 		described in http://algo.inria.fr/flajolet/Publications/FlFuGaMe07.pdf
 		and https://storage.googleapis.com/pub-tools-public-publication-data/pdf/40671.pdf
+
+		Values are hashed by a 64-bit hash, so no large range correction is needed.
+		The registers are kept in an array passed to the methods (e.g. a row of a `NamedMatrix`),
+		batches of values are added at once by `add_many()`.
+		Registers of the same size can be merged (union of sets) by `merge()` or `union()`.
 	'''
 
 	alphas = {16: 0.673, 32: 0.697, 64: 0.709}
@@ -15,17 +19,16 @@ class HyperLogLog(object):
 	def __init__(self, m=2048):
 
 		'''
-			`m` is number of registers. It is bounded with b, b = log2m. Higher `m` is,
-			the more precise calculation, however, in the paper above it is proved, that
+			`m` is number of registers, it must be a power of 2. It is bounded with b, b = log2m.
+			Higher `m` is, the more precise calculation, however, in the paper above it is proved, that
 			`m` = 2048 is optimal and produces error around 2%, other values can deviate
 			up to 20%.
-			`b` is the number of last bits of the value to take.
+			`b` is the number of first bits of the hash, that selects the register.
 			`alpha` is the parameter from papers above.
 		'''
 
-		self.num_bits = 32
-		self.b = int(np.ceil(np.log2(m)))
-		self.max = 2 ** self.num_bits
+		self.num_bits = 64
+		self.b = int(np.log2(m))
 		self.m = m
 
 		if m >= 128:
@@ -33,9 +36,18 @@ class HyperLogLog(object):
 		else:
 			self.alpha = self.alphas.get(m)
 
-		if self.alpha is None:
+		if self.alpha is None or 2 ** self.b != m:
 			raise RuntimeError("Incorrect m, it should be 16, 32 or 64, or powers of 2 >= 128")
 
+		# Data type of registers, e.g. for a `NamedMatrix`
+		self.DType = "({},)u1".format(m)
+
+
+	def zeros(self):
+		'''
+			Returns empty registers.
+		'''
+		return np.zeros(self.m, dtype=np.uint8)
 
 
 	def add(self, value, array):
@@ -44,33 +56,135 @@ class HyperLogLog(object):
 			`array` is a storage to 'add' the value.
 		'''
 
-		hashed_value = self.hash_data(value)
-		position = self._compute_position(hashed_value)
-		rho = self._compute_rho(hashed_value)
-		array[position] = np.max([array[position], rho])
+		self.add_many([value], array)
+
+
+	def add_many(self, values, array, rows=None):
+		'''
+			Adds a list (or a NumPy array) of values to the registers in `array`.
+			If `rows` are given, `array` is two-dimensional and each value is added to the row of the same position in `rows`.
+		'''
+
+		hashed_values = self.hash_values(values)
+		position = self._compute_position(hashed_values)
+		rho = self._compute_rho(hashed_values)
+
+		if rows is None:
+			np.maximum.at(array, position, rho)
+		else:
+			np.maximum.at(array, (np.asarray(rows, dtype=np.intp), position), rho)
 
 
 	def count(self, array):
 		'''
 			Count unique values in array.
+			If the array is two-dimensional, the array of counts of each row is returned.
 		'''
 
+		array = np.asarray(array)
 		z = self._compute_z(array)
 		e = self._compute_e(z, array)
-		return int(e)
+
+		if array.ndim == 1:
+			return int(e)
+
+		return e.astype(np.int64)
+
+
+	def merge(self, array, other):
+		'''
+			Merges registers of `other` into `array`, so that `array` counts the union of both sets.
+		'''
+
+		if array.shape[-1] != other.shape[-1]:
+			raise ValueError("Cannot merge registers of different sizes {} and {}".format(array.shape[-1], other.shape[-1]))
+
+		np.maximum(array, other, out=array)
+
+
+	def union(self, *arrays):
+		'''
+			Returns new registers that count the union of all sets.
+		'''
+
+		result = self.zeros()
+		for array in arrays:
+			self.merge(result, array)
+		return result
+
+
+	def serialize(self, array):
+		'''
+			Returns registers as bytes, the first byte is `b`.
+		'''
+
+		return bytes([self.b]) + np.asarray(array, dtype=np.uint8).tobytes()
+
+
+	def deserialize(self, data):
+		'''
+			Returns registers from bytes produced by `serialize()`.
+		'''
+
+		if len(data) != self.m + 1 or data[0] != self.b:
+			raise ValueError("Serialized registers do not match m={}".format(self.m))
+
+		return np.frombuffer(data, dtype=np.uint8, offset=1).copy()
 
 
 	def hash_data(self, value):
+		'''
+			Returns a 64-bit hash of the value.
+		'''
+
+		return int(self.hash_values([value])[0])
+
+
+	def hash_values(self, values):
 		'''
 			Override it, if you want to use different hash.
-			Hash must be 32bit and fast (don't use cryptographic hashes then)
+			Hash must be 64bit and fast (don't use cryptographic hashes then).
+
+			Integers are hashed by the SplitMix64 finalizer.
+			Other values are hashed by FNV-1a of their string representation, followed by the same finalizer.
+			Both are vectorized for NumPy arrays.
 		'''
 
-		if not isinstance(value, str):
-			value = str(value)
+		if isinstance(values, np.ndarray):
+			if values.dtype.kind in "ib":
+				return _mix64(values.astype(np.int64).view(np.uint64))
+			if values.dtype.kind == "u":
+				return _mix64(values.astype(np.uint64))
+			if values.dtype.kind == "U":
+				return _hash_strings(values)
+
+		hashed_values = np.empty(len(values), dtype=np.uint64)
 
-		value = value.encode('utf8')
-		return zlib.crc32(value)
+		int_positions = []
+		int_values = []
+		str_positions = []
+		str_values = []
+
+		for i, value in enumerate(values):
+			if isinstance(value, str):
+				str_positions.append(i)
+				str_values.append(value)
+
+			elif isinstance(value, (int, np.integer)) and -0x8000000000000000 <= value <= 0xFFFFFFFFFFFFFFFF:
+				int_positions.append(i)
+				int_values.append(int(value) & 0xFFFFFFFFFFFFFFFF)
+
+			else:
+				str_positions.append(i)
+				str_values.append(value.decode("latin-1") if isinstance(value, bytes) else str(value))
+
+		if len(int_positions) > 0:
+			hashed_values[int_positions] = _mix64(np.array(int_values, dtype=np.uint64))
+
+		if len(str_positions) > 0:
+			hashed_values[str_positions] = _hash_strings(np.array(str_values, dtype=np.str_))
+
+		return hashed_values
 
 
 	def compute_error(self, ground_truth, hll_count):
@@ -82,54 +196,76 @@ class HyperLogLog(object):
 
 
 	def _compute_z(self, array):
-		twos = [0.5] * len(array)
-		z = 1 / float(np.sum(np.power(twos, array)))
-		return z
+		return 1.0 / np.sum(np.exp2(-array.astype(np.float64)), axis=-1)
 
 
 	def _compute_e(self, z, array):
 		e = z * self.alpha * self.m ** 2
-		if e < 5 / 2 * self.m:
-			v = self._get_zeros(array)
-			if v != 0:
-				e_star = float(self._linear_count(v))
 
-			else:
-				e_star = e
-
-		elif e < 1 / 30 * self.max:
-			e_star = e
-
-		else:
-			e_star = -self.max * float(np.log(1 - e / self.max))
-		return e_star
+		# Small range correction by the linear counting
+		v = self._get_zeros(array)
+		linear = self._linear_count(np.maximum(v, 1))
+		return np.where((e <= 5 / 2 * self.m) & (v != 0), linear, e)
 
 
 	def _get_zeros(self, array):
-		return len(array[array == 0])
+		return np.count_nonzero(array == 0, axis=-1)
 
 
 	def _linear_count(self, v):
 		return self.m * np.log(self.m / v)
 
 
-	def _compute_position(self, hashed_value):
+	def _compute_position(self, hashed_values):
 		'''
-			takes b right bits.
+			takes b left bits.
 		'''
-		move = hashed_value & (self.max - 1) >> (self.num_bits - self.b)
-		return move
+		return (hashed_values >> np.uint64(self.num_bits - self.b)).astype(np.intp)
 
 
-	def _compute_rho(self, hashed_value):
+	def _compute_rho(self, hashed_values):
 		'''
-			rho = 1 + <leftmost 1 position>
+			rho = 1 + <number of leading zeros of the remaining bits>
 		'''
-		# SLOW: TODO: find the way to do it better
-		x = hashed_value
-		pos = self.num_bits
-		while x > 1:
-			x = x >> 1
-			pos -= 1
+		remaining = hashed_values << np.uint64(self.b)
+		return (self.num_bits + 1 - np.maximum(_bit_length(remaining), self.b)).astype(np.uint8)
+
+
+def _mix64(x):
+	'''
+		SplitMix64 finalizer, arithmetic overflows of uint64 are intended.
+	'''
+	x = x + np.uint64(0x9E3779B97F4A7C15)
+	x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+	x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+	return x ^ (x >> np.uint64(31))
+
 
-		return pos
+def _hash_strings(array):
+	'''
+		FNV-1a over UTF-32 code units of strings, computed column by column of the array.
+		The padding of shorter strings is skipped, so the hash does not depend on the width of the array.
+	'''
+	width = array.dtype.itemsize // 4
+	codes = array.view(np.uint32).reshape(len(array), width)
+	# NumPy strips trailing NULs of strings, so the length is given by the last non-zero code unit
+	nonzero = codes != 0
+	lengths = np.where(nonzero.any(axis=1), width - np.argmax(nonzero[:, ::-1], axis=1), 0)
+
+	x = np.full(len(array), 0xCBF29CE484222325, dtype=np.uint64)
+	prime = np.uint64(0x100000001B3)
+	for i in range(width):
+		mask = lengths > i
+		np.bitwise_xor(x, codes[:, i], out=x, casting="unsafe")
+		np.multiply(x, prime, out=x, where=mask)
+
+	return _mix64(x)
+
+
+def _bit_length(x):
+	'''
+		Bit length of uint64 values, halves of 32 bits are exact in float64.
+	'''
+	high = np.frexp((x >> np.uint64(32)).astype(np.float64))[1]
+	low = np.frexp((x & np.uint64(0xFFFFFFFF)).astype(np.float64))[1]
+	return np.where(high > 0, high + 32, low)
@@ -6,6 +6,7 @@ from .geoanalyzer import GeoAnalyzer
 from .latch import LatchAnalyzer
 from .analyzingsource import AnalyzingSource
 from .threshold import ThresholdAnalyzer
+from .cardinalityanalyzer import CardinalityAnalyzer
 
 
 __all__ = (
@@ -17,4 +18,5 @@ __all__ = (
 	'LatchAnalyzer',
 	'AnalyzingSource',
 	'ThresholdAnalyzer',
+	'CardinalityAnalyzer',
 )
@@ -0,0 +1,142 @@
+import logging
+
+import numpy as np
+
+from .sessionanalyzer import SessionAnalyzer
+from ..aggregation.hyperloglog import HyperLogLog
+
+###
+
+L = logging.getLogger(__name__)
+
+###
+
+
+class CardinalityAnalyzer(SessionAnalyzer):
+	'''
+		Counts distinct values of `value_attribute` for each value of `key_attribute`,
+		e.g. distinct source IPs per destination IP, by `HyperLogLog`.
+
+		Each key has a row in the `SessionMatrix`, the row contains registers of the HyperLogLog.
+		Batches of events are added at once, see `process_batch()`.
+		Override `analyze()` to work with estimates from `count()` or `counts()`.
+	'''
+
+	ConfigDefaults = {
+		'key_attribute': '',  # Name of the attribute with the key, e.g. destination IP
+		'value_attribute': '',  # Name of the attribute with counted values, e.g. source IP
+	}
+
+	def __init__(self, app, pipeline, registers=2048, matrix_id=None, analyze_on_clock=False, persistent=False, id=None, config=None):
+		"""
+		Description:
+
+		**Parameters**
+
+		app : Application
+			Name of the Application.
+
+		pipeline : Pipeline
+			Name of the Pipeline
+
+		registers : int, default = 2048
+			Number of registers of the HyperLogLog for each key.
+
+		matrix_id : str, default = None
+
+		analyze_on_clock : bool, default = False
+
+		persistent : bool, default = False
+
+		id : str, default = None
+
+		config : JSON, default = None
+			configuration file with additional information.
+
+		"""
+		self.HyperLogLog = HyperLogLog(m=registers)
+		super().__init__(
+			app, pipeline,
+			matrix_id=matrix_id,
+			dtype=self.HyperLogLog.DType,
+			analyze_on_clock=analyze_on_clock,
+			persistent=persistent,
+			id=id,
+			config=config
+		)
+		self.KeyAttribute = self.Config['key_attribute']
+		self.ValueAttribute = self.Config['value_attribute']
+
+
+	def predicate(self, context, event):
+		if self.KeyAttribute not in event:
+			return False
+
+		if self.ValueAttribute not in event:
+			return False
+
+		return True
+
+
+	def evaluate(self, context, event):
+		row_index = self.get_row_index(event[self.KeyAttribute])
+		self.HyperLogLog.add(event[self.ValueAttribute], self.Sessions.Array[row_index])
+
+
+	def process_batch(self, context, events):
+		'''
+		Values of all events of the batch are hashed and added to registers at once.
+		'''
+		row_indexes = []
+		values = []
+		for event in events:
+			if self.predicate(context, event):
+				row_indexes.append(self.get_row_index(event[self.KeyAttribute]))
+				values.append(event[self.ValueAttribute])
+
+		if len(values) > 0:
+			self.HyperLogLog.add_many(values, self.Sessions.Array, rows=row_indexes)
+
+		return events
+
+
+	def get_row_index(self, key):
+		'''
+		Returns the row of the key, the row is added if missing.
+		'''
+		row_index = self.Sessions.get_row_index(key)
+		if row_index is None:
+			row_index = self.Sessions.add_row(key)
+		return row_index
+
+
+	def count(self, key):
+		'''
+		Returns the estimated number of distinct values of the key or None if the key is unknown.
+		'''
+		row_index = self.Sessions.get_row_index(key)
+		if row_index is None:
+			return None
+		return self.HyperLogLog.count(self.Sessions.Array[row_index])
+
+
+	def counts(self):
+		'''
+		Returns a dictionary with estimated numbers of distinct values of all keys.
+		'''
+		counts = self.HyperLogLog.count(self.Sessions.Array)
+		result = {}
+		for row_index in np.flatnonzero(counts):
+			# Closed rows have no name
+			key = self.Sessions.get_row_name(int(row_index))
+			if key is not None:
+				result[key] = int(counts[row_index])
+		return result
+
+
+	def merge(self, key, registers):
+		'''
+		Merges registers, e.g. from another pump, into the row of the key.
+		'''
+		row_index = self.get_row_index(key)
+		self.HyperLogLog.merge(self.Sessions.Array[row_index], registers)
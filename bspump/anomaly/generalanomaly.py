@@ -1,3 +1,5 @@
+import math
+
 import asab
 
 from ..abc.anomaly import Anomaly
@@ -31,6 +33,18 @@ class GeneralAnomaly(Anomaly):
 			key_value = key_value_str.split(":")
 			self.CloseRules[key_value[0]] = key_value[1]
 
+	def get_deadline(self):
+		close_rule = self.CloseRules.get(self["type"], self.CloseRules.get("default"))
+		if close_rule == "status":
+			# The status can change only with a new symptom
+			return math.inf
+
+		last_timestamp, _ = self.last_symptom()
+		if last_timestamp == 0:
+			return math.inf
+
+		return last_timestamp + int(close_rule)
+
 	async def on_tick(self, current_time):
 		if self["status"] == "closed":
 			return
@@ -38,13 +52,7 @@ class GeneralAnomaly(Anomaly):
 		close_rule = self.CloseRules.get(self["type"], self.CloseRules.get("default"))
 
 		# Obtain last symptom
-		last_timestamp = 0
-		last_status = "open"
-		for symptom in self["symptoms"]:
-			timestamp = symptom.get("@timestamp")
-			if timestamp > last_timestamp:
-				last_timestamp = timestamp
-				last_status = symptom.get("status", "open")
+		last_timestamp, last_status = self.last_symptom()
 
 		if close_rule == "status" and last_status == "closed":
 			self["status"] = "closed"
@@ -35,6 +35,9 @@ class AnomalyManager(Processor):
 
 		self.AnomalyStorage = anomaly_storage
 		self.AnomalyClasses = anomaly_classes
+		self.AnomalyClassMap = {}
+		for anomaly_class in reversed(anomaly_classes):
+			self.AnomalyClassMap[anomaly_class.TYPE] = anomaly_class
 
 		metrics_service = app.get_service('asab.MetricsService')
 		self.AnomalyManagerCounter = metrics_service.create_counter(
@@ -49,13 +52,7 @@ class AnomalyManager(Processor):
 		)
 
 	def create_anomaly(self, key_dimensions, timestamp_started, anomaly_type):
-		selected_anomaly_class = GeneralAnomaly
-		for anomaly_class in self.AnomalyClasses:
-			if anomaly_class.TYPE == anomaly_type:
-				selected_anomaly_class = anomaly_class
-				break
-
-		anomaly = selected_anomaly_class()
+		anomaly = self.AnomalyClassMap.get(anomaly_type, GeneralAnomaly)()
 		anomaly["@timestamp"] = timestamp_started
 		anomaly["type"] = anomaly_type
 		anomaly["status"] = "open"
@@ -99,11 +96,11 @@ class AnomalyManager(Processor):
 			return None
 
 		# Store the open anomaly in the storage
-		if key not in self.AnomalyStorage["open"]:
+		anomaly = self.AnomalyStorage["open"].get(key)
+		if anomaly is None:
 			anomaly = self.create_anomaly(key_dimensions, timestamp, anomaly_type)
-			self.AnomalyStorage["open"][key] = anomaly
 
 		# Append symptom to the anomaly
-		self.AnomalyStorage["open"][key]["symptoms"].append(symptom)
+		self.AnomalyStorage.add_symptom(key, anomaly, symptom)
 
 		return event
@@ -1,4 +1,6 @@
+import math
 import time
+import heapq
 import logging
 import collections
 
@@ -21,6 +23,11 @@ class AnomalyStorage(asab.Configurable, collections.OrderedDict):
 	separated to "open" (anomalies that are not closed by status attribute in a symptom) and "closed".
 
 	The closed anomalies are periodically flushed from the storage to an external system.
+
+	Only anomalies that need it are ticked during the flush: anomalies with a new symptom,
+	anomalies whose close deadline (see `Anomaly.get_deadline()`) has passed and anomalies without a deadline.
+	The deadlines are kept in a min-heap. Only anomalies that were changed or closed since the last flush
+	are passed to the storage pipeline.
 	"""
 
 	ConfigDefaults = {
@@ -39,10 +46,24 @@ class AnomalyStorage(asab.Configurable, collections.OrderedDict):
 		self.Pipeline = pipeline
 		self.AnomalyStoragePipelineSource = anomaly_storage_pipeline_source
 		self.AnomalyClasses = anomaly_classes
+		self.AnomalyClassMap = {}
+		for anomaly_class in reversed(anomaly_classes):
+			self.AnomalyClassMap[anomaly_class.TYPE] = anomaly_class
 		self.ClosedAnomalyLongevity = int(self.Config["closed_anomaly_longevity"])
 		self.Index = str(self.Config["index"])
 		self.Connection = es_connection
 
+		# Min-heap of (deadline, sequence, key), outdated entries are skipped
+		self.DeadlineHeap = []
+		self.Deadlines = {}
+		self.DeadlineSequence = 0
+		# Keys of open anomalies without a deadline, which are ticked every flush
+		self.Untimed = set()
+		# Keys of open anomalies to be ticked in the next flush
+		self.ToTick = set()
+		# Keys of open anomalies to be passed to the storage pipeline in the next flush
+		self.Changed = set()
+
 		# Subscribe to periodically flush old closed anomalies
 		self.App.PubSub.subscribe("Application.tick/300!", self.flush)
 
@@ -62,6 +83,54 @@ class AnomalyStorage(asab.Configurable, collections.OrderedDict):
 	def set_pipeline(self, pipeline):
 		self.Pipeline = pipeline
 
+	def add_symptom(self, key, anomaly, symptom):
+		"""
+		Adds the symptom to the anomaly, the anomaly is stored as open, if it is not yet.
+		"""
+		self["open"][key] = anomaly
+		anomaly.add_symptom(symptom)
+		self.ToTick.add(key)
+		self.Changed.add(key)
+
+	def _schedule(self, key, anomaly):
+		deadline = anomaly.get_deadline()
+		if deadline is None:
+			self.Untimed.add(key)
+			self.Deadlines.pop(key, None)
+			return
+
+		self.Untimed.discard(key)
+		if self.Deadlines.get(key) == deadline:
+			return
+
+		self.Deadlines[key] = deadline
+		if deadline != math.inf:
+			self.DeadlineSequence += 1
+			heapq.heappush(self.DeadlineHeap, (deadline, self.DeadlineSequence, key))
+
+	def _unschedule(self, key):
+		self.Deadlines.pop(key, None)
+		self.Untimed.discard(key)
+		self.ToTick.discard(key)
+		self.Changed.discard(key)
+
+	def _pop_due(self, current_time):
+		# Keys of anomalies whose deadline has passed
+		due = set()
+		heap = self.DeadlineHeap
+		while len(heap) > 0 and heap[0][0] < current_time:
+			deadline, _, key = heapq.heappop(heap)
+			if self.Deadlines.get(key) == deadline:
+				due.add(key)
+				del self.Deadlines[key]
+
+		# Drop outdated entries, when they prevail
+		if len(heap) > 2 * len(self.Deadlines) + 1024:
+			self.DeadlineHeap = [entry for entry in heap if self.Deadlines.get(entry[2]) == entry[0]]
+			heapq.heapify(self.DeadlineHeap)
+
+		return due
+
 	async def load(self):
 		query = {
 			"size": 10000,
@@ -135,17 +204,13 @@ class AnomalyStorage(asab.Configurable, collections.OrderedDict):
 				# Modify timestamp
 				event["@timestamp"] = int(event["@timestamp"] / 1000)
 				# Select proper anomaly class
-				selected_anomaly_class = GeneralAnomaly
-				for anomaly_class in self.AnomalyClasses:
-					if anomaly_class.TYPE == event["type"]:
-						selected_anomaly_class = anomaly_class
-						break
+				anomaly = self.AnomalyClassMap.get(event["type"], GeneralAnomaly)()
 				# Add all data
-				anomaly = selected_anomaly_class()
 				for a_key, a_value in event.items():
 					anomaly[a_key] = a_value
-				# Save the anomaly
+				# Save the anomaly, it is ticked in the next flush
 				self["open"][key] = anomaly
+				self.ToTick.add(key)
 
 		L.info("Open anomalies loaded ...")
 
@@ -157,10 +222,6 @@ class AnomalyStorage(asab.Configurable, collections.OrderedDict):
 
 		current_time = int(time.time())
 
-		# Throttle the parental pipeline
-		if self.Pipeline is not None:
-			self.Pipeline.throttle(self.Id, True)
-
 		svc = self.App.get_service("bspump.PumpService")
 		anomaly_storage_pipeline_source = svc.locate(self.AnomalyStoragePipelineSource)
 
@@ -168,44 +229,63 @@ class AnomalyStorage(asab.Configurable, collections.OrderedDict):
 			L.warning("The anomaly storage pipeline is not yet ready, skipping ...")
 			return
 
-		keys_to_be_deleted = []
+		# Throttle the parental pipeline
+		if self.Pipeline is not None:
+			self.Pipeline.throttle(self.Id, True)
 
 		# Update anomalies & close them, if it is possible
-		for key, anomaly in self["open"].items():
+		to_tick = self._pop_due(current_time)
+		to_tick.update(self.ToTick)
+		to_tick.update(self.Untimed)
+		self.ToTick = set()
+
+		closed = []
+		for key in to_tick:
+			anomaly = self["open"].get(key)
+			if anomaly is None:
+				continue
 			await anomaly.on_tick(current_time)
 			if anomaly["status"] == "closed":
 				anomaly.close(current_time)
-				self["closed"][key] = anomaly
-				keys_to_be_deleted.append(key)
-
-		# Remove moved anomalies from the storage
-		for key in keys_to_be_deleted:
-			del self["open"][key]
-
-		keys_to_be_deleted = []
+				closed.append(key)
+			else:
+				self._schedule(key, anomaly)
+
+		# Move closed anomalies to the closed part of the storage
+		for key in closed:
+			self._unschedule(key)
+			# Keep the closed anomalies ordered by the time of closing
+			self["closed"].pop(key, None)
+			self["closed"][key] = self["open"].pop(key)
+
+		# Delete old closed anomalies, they are ordered by the time of closing
+		while len(self["closed"]) > 0:
+			key = next(iter(self["closed"]))
+			if current_time <= self["closed"][key]["ts_end"] + self.ClosedAnomalyLongevity:
+				break
+			del self["closed"][key]
+			self.AnomalyStorageCounter.add("anomalies.closed.flushed", 1)
 
-		# FLUSH old closed anomalies to external database
+		# FLUSH newly closed anomalies to external database
 		await asyncio.sleep(0.01)
-		# Synchronous to make atomic cycle
-		for key, anomaly in self["closed"].items():
+		for key in closed:
+			anomaly = self["closed"].get(key)
+			if anomaly is None:
+				continue
 			# Pass anomaly to the storage pipeline
 			context = {
 				"es_id": key,
 			}
 			await anomaly_storage_pipeline_source.put_async(context, anomaly)
-			# Delete the closed anomaly after some time
-			if current_time > anomaly["ts_end"] + self.ClosedAnomalyLongevity:
-				self.AnomalyStorageCounter.add("anomalies.closed.flushed", 1)
-				keys_to_be_deleted.append(key)
-
-		# Remove old closed anomalies from the storage
-		for key in keys_to_be_deleted:
-			del self["closed"][key]
 
-		# FLUSH open anomalies for persistence to external system
+		# FLUSH changed open anomalies for persistence to external system
 		await asyncio.sleep(0.01)
-		# Synchronous to make atomic cycle
-		for key, anomaly in self["open"].items():
+		changed = self.Changed
+		self.Changed = set()
+		for key in changed:
+			anomaly = self["open"].get(key)
+			if anomaly is None:
+				continue
 			context = {
 				"es_id": key,
 			}
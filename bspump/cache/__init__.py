@@ -1,7 +1,13 @@
 from .cachedict import CacheDict
+from .lrucache import LRUCache
 from .lrucachedict import LRUCacheDict
+from .frequencysketch import FrequencySketch
+from .disktier import DiskCacheTier
 
 __all__ = (
 	'CacheDict',
+	'LRUCache',
 	'LRUCacheDict',
+	'FrequencySketch',
+	'DiskCacheTier',
 )
@@ -0,0 +1,141 @@
+import collections
+import dbm
+import logging
+import pickle
+
+###
+
+L = logging.getLogger(__name__)
+
+###
+
+
+class DiskCacheTier(object):
+	"""
+	DiskCacheTier is the optional second tier of `LRUCache`, which keeps cached entries in a local `dbm` file,
+	so that the state of the cache survives restarts of the application.
+	Keys and values have to be picklable.
+
+	The file is bounded by `max_size` entries and `max_bytes` bytes of stored records (0 means unlimited),
+	the entries that were least recently stored or loaded are removed first.
+	Expiration times and sizes of records are kept in an index in memory, which is built when the file is opened,
+	so that evictions and sweeps do not read the file.
+	"""
+
+	def __init__(self, path, max_size=0, max_bytes=0):
+		self.Path = path
+		self.MaxSize = int(max_size)
+		self.MaxBytes = int(max_bytes)
+		self.DB = dbm.open(path, 'c')
+
+		# Pickled key -> (expires, size), ordered from the least recently used
+		self.Index = collections.OrderedDict()
+		self.Bytes = 0
+		for k in self.DB.keys():
+			data = self.DB[k]
+			try:
+				_, expires = pickle.loads(data)
+			except Exception:
+				del self.DB[k]
+				continue
+			self.Index[k] = (expires, len(k) + len(data))
+			self.Bytes += len(k) + len(data)
+
+		self._evict()
+
+
+	def get(self, key):
+		'''
+		Returns a tuple `(value, expires)` or `None`, if the key is not stored.
+		'''
+		k = pickle.dumps(key)
+		try:
+			data = self.DB[k]
+		except KeyError:
+			return None
+
+		try:
+			entry = pickle.loads(data)
+		except Exception as e:
+			L.warning("Failed to load '{}' from the disk cache: {}".format(key, e))
+			return None
+
+		if k in self.Index:
+			self.Index.move_to_end(k)
+		return entry
+
+
+	def set(self, key, value, expires):
+		try:
+			k = pickle.dumps(key)
+			data = pickle.dumps((value, expires))
+			self.DB[k] = data
+		except Exception as e:
+			L.warning("Failed to store '{}' to the disk cache: {}".format(key, e))
+			return
+
+		self._unindex(k)
+		self.Index[k] = (expires, len(k) + len(data))
+		self.Bytes += len(k) + len(data)
+		self._evict()
+
+
+	def delete(self, key):
+		k = pickle.dumps(key)
+		try:
+			del self.DB[k]
+		except KeyError:
+			pass
+		self._unindex(k)
+
+
+	def sweep(self, now):
+		'''
+		Removes expired entries and returns their count.
+		'''
+		expired = [k for k, (expires, _) in self.Index.items() if expires and expires <= now]
+		for k in expired:
+			self._delete(k)
+		return len(expired)
+
+
+	def clear(self):
+		for k in list(self.DB.keys()):
+			del self.DB[k]
+		self.Index.clear()
+		self.Bytes = 0
+
+
+	def close(self):
+		self.DB.close()
+
+
+	def __len__(self):
+		return len(self.Index)
+
+
+	def _evict(self):
+		while len(self.Index) > 0 and self._is_full():
+			self._delete(next(iter(self.Index)))
+
+
+	def _is_full(self):
+		if self.MaxSize > 0 and len(self.Index) > self.MaxSize:
+			return True
+		if self.MaxBytes > 0 and self.Bytes > self.MaxBytes:
+			return True
+		return False
+
+
+	def _delete(self, k):
+		try:
+			del self.DB[k]
+		except KeyError:
+			pass
+		self._unindex(k)
+
+
+	def _unindex(self, k):
+		entry = self.Index.pop(k, None)
+		if entry is not None:
+			self.Bytes -= entry[1]
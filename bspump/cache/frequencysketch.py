@@ -0,0 +1,47 @@
+class FrequencySketch(object):
+	"""
+	FrequencySketch is an approximate counter of key accesses (Count-Min sketch),
+	which is used by `LRUCache` for TinyLFU admission.
+	Counters are periodically halved, so that the sketch reflects the recent popularity of keys.
+	For more information, please see: https://arxiv.org/abs/1512.00727
+	"""
+
+	Seeds = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+	MaxCount = 15
+
+
+	def __init__(self, width=1024):
+		# The width is rounded up to the power of two, so that the index is obtained by a mask
+		self.Width = 1 << max(4, (int(width) - 1).bit_length())
+		self.Mask = self.Width - 1
+		self.Table = [bytearray(self.Width) for _ in self.Seeds]
+		self.SampleSize = 10 * self.Width
+		self.Samples = 0
+
+
+	def _indexes(self, key):
+		h = hash(key)
+		return [((h * seed) >> 16) & self.Mask for seed in self.Seeds]
+
+
+	def increment(self, key):
+		for row, i in zip(self.Table, self._indexes(key)):
+			if row[i] < self.MaxCount:
+				row[i] += 1
+
+		self.Samples += 1
+		if self.Samples >= self.SampleSize:
+			self.reset()
+
+
+	def frequency(self, key):
+		return min(row[i] for row, i in zip(self.Table, self._indexes(key)))
+
+
+	def reset(self):
+		'''
+		Halves all counters (the aging of the sketch).
+		'''
+		for row in self.Table:
+			row[:] = bytes(c >> 1 for c in row)
+		self.Samples //= 2
@@ -0,0 +1,310 @@
+import collections
+import collections.abc
+import itertools
+import logging
+import sys
+
+import asab
+
+from .disktier import DiskCacheTier
+from .frequencysketch import FrequencySketch
+
+###
+
+L = logging.getLogger(__name__)
+
+###
+
+_IdGenerator = itertools.count(1)
+
+
+def sizeof(key, value):
+	'''
+	Estimates the memory footprint of a cache entry in bytes.
+	Containers are measured one level deep, which is enough for typical lookup results.
+	'''
+	size = sys.getsizeof(key) + sys.getsizeof(value)
+	if isinstance(value, dict):
+		size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+	elif isinstance(value, (list, tuple, set, frozenset)):
+		size += sum(sys.getsizeof(v) for v in value)
+	return size
+
+
+class LRUCache(asab.Configurable, collections.abc.MutableMapping):
+	"""
+	LRUCache implements the "Least recently used" cache strategy with O(1) reads and writes.
+
+	Entries are removed, when they are the least recently used ones and the cache exceeds
+	`max_size` entries or `max_bytes` bytes, or when they expire (`ttl` seconds after they have been written).
+	Expiration is lazy, expired entries are removed on read and by a periodic sweeper (`sweep_interval`).
+
+	Optional features:
+	`negative_ttl` - `None` values (i.e. keys that were not found by a lookup) are cached with this TTL.
+	`admission` - `tinylfu` admits a new key to the full cache only if it is more frequently used than the LRU victim.
+	`path` - entries are also stored in a local file, which survives restarts of the application.
+	The file is bounded by `disk_max_size` entries and `disk_max_bytes` bytes, the least recently stored or loaded entries are removed.
+
+	Hits, misses, expirations, evictions and rejections are counted in the `cache` metric tagged by `id`.
+	The configuration is read from the `[cache:<id>]` section. Without `id`, a unique one is generated.
+
+	The following example illustrates how to use LRUCache with MySQLLookup:
+
+		self.MySQLLookup = MySQLLookup(self,
+			connection=mysql_connection,
+			id="MySQLLookup",
+			cache=bspump.cache.LRUCache(app, id="MySQLLookupCache", config={'max_size': 1000, 'ttl': 600})
+		)
+
+	For more information, please see: https://en.wikipedia.org/wiki/Cache_replacement_policies#Least_recently_used_(LRU)
+	"""
+
+	ConfigDefaults = {
+		'max_size': 1000,  # Maximal number of entries, 0 means unlimited
+		'max_bytes': 0,  # Maximal estimated size of entries in bytes, 0 means unlimited
+		'ttl': 0,  # Seconds after write, when the entry expires, 0 means never
+		'negative_ttl': 0,  # TTL of `None` values, 0 means that `ttl` is used
+		'sweep_interval': 60,  # Seconds between removals of expired entries, 0 disables the sweeper
+		'admission': 'lru',  # 'lru' admits every new entry, 'tinylfu' admits only frequently used ones
+		'path': '',  # Path of the second (disk) tier, empty means memory only
+		'disk_max_size': 100000,  # Maximal number of entries of the disk tier, 0 means unlimited
+		'disk_max_bytes': 0,  # Maximal size of records of the disk tier in bytes, 0 means unlimited
+	}
+
+
+	def __init__(self, app, id=None, config=None, sizeof=sizeof):
+		if id is None:
+			# Each cache has its own metrics and configuration section, provide `id` to configure the cache by a file
+			id = '{}.{}'.format(self.__class__.__name__, next(_IdGenerator))
+		self.Id = id
+		super().__init__("cache:{}".format(self.Id), config=config)
+
+		self.App = app
+		self.SizeOf = sizeof
+
+		self.MaxSize = int(self.Config['max_size'])
+		self.MaxBytes = int(self.Config['max_bytes'])
+		self.TTL = float(self.Config['ttl'])
+		self.NegativeTTL = float(self.Config['negative_ttl'])
+
+		# Key -> (value, expires, size)
+		self.Data = collections.OrderedDict()
+		self.Bytes = 0
+
+		admission = self.Config['admission'].lower()
+		if admission == 'tinylfu':
+			self.Sketch = FrequencySketch(max(self.MaxSize, 1024))
+		elif admission == 'lru':
+			self.Sketch = None
+		else:
+			raise RuntimeError("Unknown admission policy '{}'".format(admission))
+
+		path = self.Config['path']
+		if len(path) > 0:
+			self.Disk = DiskCacheTier(
+				path,
+				max_size=int(self.Config['disk_max_size']),
+				max_bytes=int(self.Config['disk_max_bytes']),
+			)
+		else:
+			self.Disk = None
+
+		metrics_service = app.get_service('asab.MetricsService')
+		self.Counter = metrics_service.create_counter(
+			"cache",
+			tags={
+				'cache': self.Id,
+			},
+			init_values={
+				'hit': 0,
+				'miss': 0,
+				'expired': 0,
+				'evicted': 0,
+				'rejected': 0,
+			}
+		)
+		self.Gauge = metrics_service.create_gauge(
+			"cache.size",
+			tags={
+				'cache': self.Id,
+			},
+			init_values={
+				'entries': 0,
+				'bytes': 0,
+			}
+		)
+
+		sweep_interval = float(self.Config['sweep_interval'])
+		if sweep_interval > 0 and (self.TTL > 0 or self.NegativeTTL > 0):
+			self.Timer = asab.Timer(app, self._on_sweep_timer, autorestart=True)
+			self.Timer.start(sweep_interval)
+		else:
+			self.Timer = None
+
+		if self.Disk is not None:
+			app.PubSub.subscribe("Application.exit!", self._on_exit)
+
+
+	def __getitem__(self, key):
+		if self.Sketch is not None:
+			self.Sketch.increment(key)
+
+		entry = self.Data.get(key)
+		if entry is None:
+			value = self._load(key)
+			self.Counter.add('hit', 1)
+			return value
+
+		value, expires, _ = entry
+		if expires and expires <= self.App.time():
+			self._remove(key)
+			self.Counter.add('expired', 1)
+			self.Counter.add('miss', 1)
+			raise KeyError(key)
+
+		self.Data.move_to_end(key)
+		self.Counter.add('hit', 1)
+		return value
+
+
+	def __setitem__(self, key, value):
+		ttl = self.NegativeTTL if (value is None and self.NegativeTTL > 0) else self.TTL
+		expires = self.App.time() + ttl if ttl > 0 else 0
+		self._store(key, value, expires)
+
+		if self.Disk is not None:
+			self.Disk.set(key, value, expires)
+
+
+	def __delitem__(self, key):
+		self._remove(key)
+		if self.Disk is not None:
+			self.Disk.delete(key)
+
+
+	def __contains__(self, key):
+		entry = self.Data.get(key)
+		if entry is None:
+			return False
+		expires = entry[1]
+		return not (expires and expires <= self.App.time())
+
+
+	def __iter__(self):
+		return iter(list(self.Data.keys()))
+
+
+	def __len__(self):
+		return len(self.Data)
+
+
+	def items(self):
+		return ((key, value) for key, (value, _, _) in self.Data.items())
+
+
+	def values(self):
+		return (value for value, _, _ in self.Data.values())
+
+
+	def clear(self):
+		self.Data.clear()
+		self.Bytes = 0
+		if self.Disk is not None:
+			self.Disk.clear()
+		self._update_gauge()
+
+
+	def sweep(self):
+		'''
+		Removes expired entries from the cache.
+		'''
+		now = self.App.time()
+		expired = [key for key, (_, expires, _) in self.Data.items() if expires and expires <= now]
+		for key in expired:
+			self._remove(key)
+
+		if self.Disk is not None:
+			self.Disk.sweep(now)
+
+		if len(expired) > 0:
+			self.Counter.add('expired', len(expired))
+		self._update_gauge()
+
+
+	def _load(self, key):
+		'''
+		Promotes the entry from the disk tier or raises `KeyError`.
+		'''
+		entry = self.Disk.get(key) if self.Disk is not None else None
+		if entry is None:
+			self.Counter.add('miss', 1)
+			raise KeyError(key)
+
+		value, expires = entry
+		if expires and expires <= self.App.time():
+			self.Disk.delete(key)
+			self.Counter.add('expired', 1)
+			self.Counter.add('miss', 1)
+			raise KeyError(key)
+
+		self._store(key, value, expires)
+		return value
+
+
+	def _store(self, key, value, expires):
+		size = self.SizeOf(key, value) if self.MaxBytes > 0 else 0
+
+		old = self.Data.pop(key, None)
+		if old is not None:
+			self.Bytes -= old[2]
+
+		elif self.Sketch is not None and self._is_full(1, size) and len(self.Data) > 0:
+			# TinyLFU admission, the new key has to be more popular than the victim
+			victim = next(iter(self.Data))
+			if self.Sketch.frequency(key) <= self.Sketch.frequency(victim):
+				self.Counter.add('rejected', 1)
+				return
+
+		self.Data[key] = (value, expires, size)
+		self.Bytes += size
+
+		evicted = 0
+		while len(self.Data) > 1 and self._is_full(0, 0):
+			_, (_, _, victim_size) = self.Data.popitem(last=False)
+			self.Bytes -= victim_size
+			evicted += 1
+
+		if evicted > 0:
+			self.Counter.add('evicted', evicted)
+		self._update_gauge()
+
+
+	def _remove(self, key):
+		entry = self.Data.pop(key, None)
+		if entry is not None:
+			self.Bytes -= entry[2]
+			self._update_gauge()
+
+
+	def _is_full(self, entries, size):
+		'''
+		Checks, whether the cache would exceed its capacity with additional `entries` of `size` bytes.
+		'''
+		if self.MaxSize > 0 and len(self.Data) + entries > self.MaxSize:
+			return True
+		if self.MaxBytes > 0 and self.Bytes + size > self.MaxBytes:
+			return True
+		return False
+
+
+	def _update_gauge(self):
+		self.Gauge.set('entries', len(self.Data))
+		self.Gauge.set('bytes', self.Bytes)
+
+
+	async def _on_sweep_timer(self):
+		self.sweep()
+
+
+	def _on_exit(self, event_name):
+		self.Disk.close()
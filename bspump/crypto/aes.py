@@ -5,6 +5,7 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 
 from ..abc.processor import Processor
+from .offload import OffloadMixin
 
 
 class CommonAESMixin(object):
@@ -27,30 +28,56 @@ class CommonAESMixin(object):
 
 
 
-class EncryptAESProcessor(Processor, CommonAESMixin):
+class EncryptAESProcessor(Processor, CommonAESMixin, OffloadMixin):
+	'''
+	Encrypts the event (bytes) by AES in CBC mode with PKCS7 padding.
+	Batches of events can be encrypted in parallel threads, see `offload_chunk`.
+	'''
 
 
 	def __init__(self, app, pipeline, id=None, config=None):
 		super().__init__(app, pipeline, id, config)
 		self.initalize_aes()
+		self.initialize_offload(app)
 
 
 	def process(self, context, event):
+		return self.encrypt(event)
+
+
+	def process_batch(self, context, events):
+		return self.offload(self.encrypt, events)
+
+
+	def encrypt(self, event):
 		encryptor = self.cipher.encryptor()
 		padder = self.padding.padder()
 		data = padder.update(event) + padder.finalize()
 		return encryptor.update(data) + encryptor.finalize()
 
 
-class DecryptAESProcessor(Processor, CommonAESMixin):
+class DecryptAESProcessor(Processor, CommonAESMixin, OffloadMixin):
+	'''
+	Decrypts the event (bytes) encrypted by AES in CBC mode with PKCS7 padding.
+	Batches of events can be decrypted in parallel threads, see `offload_chunk`.
+	'''
 
 
 	def __init__(self, app, pipeline, id=None, config=None):
 		super().__init__(app, pipeline, id, config)
 		self.initalize_aes()
+		self.initialize_offload(app)
 
 
 	def process(self, context, event):
+		return self.decrypt(event)
+
+
+	def process_batch(self, context, events):
+		return self.offload(self.decrypt, events)
+
+
+	def decrypt(self, event):
 		decryptor = self.cipher.decryptor()
 		unpadder = self.padding.unpadder()
 		data = decryptor.update(event) + decryptor.finalize()
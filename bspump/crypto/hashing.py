@@ -4,6 +4,7 @@ from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
 
 from ..abc.processor import Processor
+from .offload import OffloadMixin
 
 #
 
@@ -12,7 +13,7 @@ L = logging.getLogger(__name__)
 #
 
 
-class HashingBaseProcessor(Processor):
+class HashingBaseProcessor(Processor, OffloadMixin):
 
 	ConfigDefaults = {
 		"algorithm": "sha256",
@@ -49,18 +50,28 @@ class HashingBaseProcessor(Processor):
 			L.error("Unknown hashing algorithm '{}'".format(self.Config['algorithm']))
 			raise RuntimeError("Unknown hashing algorithm '{}'".format(self.Config['algorithm']))
 
+		self.initialize_offload(app)
+
+
+	def digest(self, event):
+		digest = hashes.Hash(self.Algorithm, self.Backend)
+		digest.update(event)
+		return digest.finalize()
+
 
 
 class HashingProcessor(HashingBaseProcessor):
 
 	'''
 	Create hash of the event.
+	Batches of events can be hashed in parallel threads, see `offload_chunk`.
 	'''
 
 	def process(self, context, event):
-		digest = hashes.Hash(self.Algorithm, self.Backend)
-		digest.update(event)
-		return digest.finalize()
+		return self.digest(event)
+
+	def process_batch(self, context, events):
+		return self.offload(self.digest, events)
 
 
 class CoHashingProcessor(HashingBaseProcessor):
@@ -70,7 +81,5 @@ class CoHashingProcessor(HashingBaseProcessor):
 	'''
 
 	def process(self, context, event):
-		digest = hashes.Hash(self.Algorithm, self.Backend)
-		digest.update(event)
-		context['hash'] = digest.finalize()
+		context['hash'] = self.digest(event)
 		return event
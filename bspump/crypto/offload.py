@@ -0,0 +1,45 @@
+class OffloadMixin(object):
+	'''
+	Description: Runs CPU-bound work on events of a batch in threads of `asab.ProactorService`.
+
+	The batch (see `Pipeline.process_batch()`) is split into chunks of `offload_chunk` events,
+	chunks are processed in parallel and the results are returned in the original order.
+	The first chunk is processed by the calling thread, the other ones by threads of the executor.
+	`hashlib` and `cryptography` release the GIL while working on the data, so the work is spread over more cores.
+	Value 0 of `offload_chunk` disables the offloading, batches smaller than one chunk are processed inline.
+
+	`offload()` returns when the whole batch is done, so it blocks the event loop (and other pipelines) meanwhile,
+	the batch is only processed faster than by a single thread. Keep batches reasonably small.
+	'''
+
+
+	ConfigDefaults = {
+		"offload_chunk": 0,  # Number of events processed by one thread, 0 means no offloading
+	}
+
+
+	def initialize_offload(self, app):
+		self.OffloadChunk = int(self.Config['offload_chunk'])
+		self.Executor = app.get_service('asab.ProactorService').Executor
+
+
+	def offload(self, function, events):
+		'''
+		Returns a list of `function(event)` for each of `events`.
+		'''
+		chunk_size = self.OffloadChunk
+		if chunk_size <= 0 or len(events) <= chunk_size:
+			return [function(event) for event in events]
+
+		chunks = [events[i:i + chunk_size] for i in range(0, len(events), chunk_size)]
+		futures = [self.Executor.submit(_map_chunk, function, chunk) for chunk in chunks[1:]]
+
+		# The calling thread does not wait idle
+		results = _map_chunk(function, chunks[0])
+		for future in futures:
+			results.extend(future.result())
+		return results
+
+
+def _map_chunk(function, chunk):
+	return [function(event) for event in chunk]
@@ -6,6 +6,8 @@ from .timewindowanalyzer import DeclarativeTimeWindowAnalyzer
 
 from .builder import ExpressionBuilder
 from .optimizer import ExpressionOptimizer
+from .compiler import ExpressionCompiler
+from .cache import DeclarationCache, get_declaration_cache
 from .declerror import DeclarationError
 from .segmentbuilder import SegmentBuilder
 
@@ -17,7 +19,8 @@ from .dot import declaration_to_dot, declaration_to_dot_stream
 
 asab.Config.add_defaults({
 	"declarations": {
-		"timezone": ""  # Default timezone to be used by DATETIME expression, such as Europe/Prague
+		"timezone": "",  # Default timezone to be used by DATETIME expression, such as Europe/Prague
+		"cache_size": 1000,  # Maximal number of declarations in the declaration cache
 	}
 })
 
@@ -32,6 +35,9 @@ __all__ = [
 	"SegmentBuilder",
 
 	"ExpressionOptimizer",
+	"ExpressionCompiler",
+	"DeclarationCache",
+	"get_declaration_cache",
 
 	"Expression",
 	"SequenceExpression",
@@ -47,6 +47,13 @@ class Expression(object):
 	def optimize(self):
 		return None
 
+	def compile(self, emitter):
+		"""
+		Returns a Python source of the expression, see `ExpressionCompiler`.
+		`None` means that the expression is called during the evaluation of the compiled function.
+		"""
+		return None
+
 	def walk(self, parent=None, key=None):
 		'''
 		key in the Expression is the string, which is a name of the attribute with the child expression
@@ -66,6 +73,13 @@ class Expression(object):
 			else:
 				yield (self, key, v)
 
+	def children(self):
+		'''
+		Yields `(key, child)` for direct children of the expression, see `walk()`.
+		'''
+		for key in self.Attributes.copy():
+			yield (key, getattr(self, key, None))
+
 	def set(self, key, value):
 		setattr(self, key, value)
 
@@ -133,6 +147,10 @@ class SequenceExpression(Expression):
 				raise NotImplementedError(":-(")
 
 
+	def children(self):
+		return list(enumerate(self.Items))
+
+
 	def set(self, key, value):
 		self.Items[key] = value
 
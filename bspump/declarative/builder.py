@@ -48,6 +48,11 @@ class ExpressionBuilder(object):
 
 		# Cache for loaded includes during the parsing
 		self.LoadedIncludes = {}
+		# Declarations of loaded includes, see `DeclarationCache`
+		self.IncludeDeclarations = {}
+
+		# The YAML loader class with constructors of registered expressions, built on the first parse
+		self.LoaderClass = None
 
 		# Register the common expression module
 		from . import expression
@@ -60,6 +65,7 @@ class ExpressionBuilder(object):
 	def register_class(self, class_name, expression_class):
 		class_name = class_name.replace('_', '.')
 		self.ExpressionClasses[class_name] = expression_class
+		self.LoaderClass = None
 
 	def add_config_value(self, key, value):
 		self.Config[key] = value
@@ -100,38 +106,10 @@ class ExpressionBuilder(object):
 
 		while True:
 
-			loader = yaml.Loader(declaration)
+			loader = self._get_loader_class()(declaration)
 			if source_name is not None:
 				loader.name = source_name
 
-			# Register the constructor for each registered expression class
-			for name in self.ExpressionClasses:
-				loader.add_constructor("!{}".format(name), self._constructor)
-
-			loader.add_constructor("!INCLUDE", self._construct_include)
-			loader.add_constructor("!CONFIG", self._construct_config)
-
-			loader.add_constructor("tag:yaml.org,2002:ui256", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:ui128", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:ui64", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:ui32", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:ui16", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:ui8", self._construct_scalar)
-
-			loader.add_constructor("tag:yaml.org,2002:si256", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:si128", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:si64", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:si32", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:si16", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:si8", self._construct_scalar)
-
-			loader.add_constructor("tag:yaml.org,2002:fp128", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:fp64", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:fp32", self._construct_scalar)
-			loader.add_constructor("tag:yaml.org,2002:fp16", self._construct_scalar)
-
-			loader.add_constructor("tag:yaml.org,2002:str", self._construct_scalar)
-
 			try:
 				expressions = []
 
@@ -164,6 +142,7 @@ class ExpressionBuilder(object):
 			except IncludeNeeded as e:
 				# If include is needed, load its declaration to the loaded include cache
 				include_declaration = await self.read(e.Identifier)
+				self.IncludeDeclarations[e.Identifier] = include_declaration
 				parsed_declaration = await self.parse(include_declaration, "<INCLUDE>")
 
 				# Include can be only one expression
@@ -176,6 +155,35 @@ class ExpressionBuilder(object):
 			return expressions
 
 
+	def _get_loader_class(self):
+		'''
+		Constructors are registered to a loader class of this builder only once.
+		`add_constructor()` is a class method, so registering them on `yaml.Loader` would affect every YAML loader.
+		'''
+		if self.LoaderClass is not None:
+			return self.LoaderClass
+
+		loader_class = type("ExpressionLoader", (yaml.Loader,), {})
+
+		# Register the constructor for each registered expression class
+		for name in self.ExpressionClasses:
+			loader_class.add_constructor("!{}".format(name), self._constructor)
+
+		loader_class.add_constructor("!INCLUDE", self._construct_include)
+		loader_class.add_constructor("!CONFIG", self._construct_config)
+
+		for tag in (
+			"ui256", "ui128", "ui64", "ui32", "ui16", "ui8",
+			"si256", "si128", "si64", "si32", "si16", "si8",
+			"fp128", "fp64", "fp32", "fp16",
+			"str",
+		):
+			loader_class.add_constructor("tag:yaml.org,2002:{}".format(tag), self._construct_scalar)
+
+		self.LoaderClass = loader_class
+		return loader_class
+
+
 	async def parse_ext(self, declaration, source_name=None):
 		'''
 		Wrap top-level declaration into a function, value etc.
@@ -0,0 +1,133 @@
+import collections
+import hashlib
+import logging
+import weakref
+
+import asab
+
+###
+
+L = logging.getLogger(__name__)
+
+###
+
+
+class DeclarationCacheEntry(object):
+
+	def __init__(self, key):
+		self.Key = key
+		self.Expressions = None  # Parsed and optimized expressions
+		self.Compiled = None  # Compiled function, see `ExpressionCompiler.compile_processor()`
+		self.Includes = {}  # Include identifier -> digest of its declaration
+
+
+class DeclarationCache(object):
+	"""
+	Caches parsed and optimized expressions of declarations, so that the same declaration is not
+	parsed and optimized again by every `DeclarativeProcessor` (or every reload of the rule library).
+
+	Entries are keyed by a digest of the declaration text, its identifier, the configuration of the builder
+	and the registered expression classes. Declarations of includes are compared on every lookup,
+	so a change of an included declaration invalidates the entry.
+	The cache holds at most `cache_size` entries from the `[declarations]` section, the least recently used are dropped.
+
+	Expressions from the cache are shared by processors with the same declaration.
+	"""
+
+	def __init__(self, app):
+		self.App = app
+		self.MaxSize = int(asab.Config["declarations"]["cache_size"])
+		self.Entries = collections.OrderedDict()
+
+
+	async def lookup(self, builder, declaration):
+		"""
+		Returns the cache entry of the declaration.
+		`Expressions` of the entry are None, when the declaration has not been cached yet, see `store()`.
+		"""
+		text = declaration
+		if not (isinstance(declaration, str) and declaration.startswith('---')):
+			text = await builder.read(declaration)
+
+		key = self.digest(builder, declaration, text)
+		entry = self.Entries.get(key)
+
+		if entry is not None and not await self._includes_valid(builder, entry):
+			entry = None
+
+		if entry is None:
+			entry = DeclarationCacheEntry(key)
+			self.Entries[key] = entry
+			while len(self.Entries) > self.MaxSize:
+				self.Entries.popitem(last=False)
+
+		else:
+			self.Entries.move_to_end(key)
+
+		return entry
+
+
+	def store(self, entry, builder, expressions):
+		entry.Expressions = expressions
+		entry.Compiled = None
+		entry.Includes = {
+			identifier: _digest(include_declaration)
+			for identifier, include_declaration in builder.IncludeDeclarations.items()
+		}
+
+
+	def clear(self):
+		self.Entries.clear()
+
+
+	def digest(self, builder, declaration, text):
+		h = hashlib.sha256()
+		h.update(text.encode("utf-8"))
+		if declaration is not text:
+			# The identifier is a part of locations of expressions
+			h.update(b"\0identifier\0")
+			h.update(str(declaration).encode("utf-8"))
+
+		h.update(b"\0config\0")
+		for key, value in sorted(builder.Config.items()):
+			h.update(repr((key, value)).encode("utf-8"))
+
+		h.update(b"\0classes\0")
+		for name, expression_class in sorted(builder.ExpressionClasses.items()):
+			h.update("{}={}.{};".format(name, expression_class.__module__, expression_class.__qualname__).encode("utf-8"))
+
+		h.update(b"\0include\0")
+		h.update(repr(builder.IncludePaths).encode("utf-8"))
+		return h.hexdigest()
+
+
+	async def _includes_valid(self, builder, entry):
+		for identifier, digest in entry.Includes.items():
+			try:
+				include_declaration = await builder.read(identifier)
+			except RuntimeError:
+				return False
+
+			if _digest(include_declaration) != digest:
+				L.info("Declaration '{}' has changed, the cached declaration is dropped".format(identifier))
+				return False
+
+		return True
+
+
+def _digest(text):
+	return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+_Caches = weakref.WeakKeyDictionary()
+
+
+def get_declaration_cache(app):
+	"""
+	Returns the declaration cache of the application.
+	"""
+	cache = _Caches.get(app)
+	if cache is None:
+		cache = DeclarationCache(app)
+		_Caches[app] = cache
+	return cache
@@ -0,0 +1,163 @@
+import logging
+
+from .abc import Expression
+from .declerror import DeclarationError
+
+###
+
+L = logging.getLogger(__name__)
+
+###
+
+
+class ExpressionCompiler(object):
+	"""
+	Compiles an (optimized) expression into a Python function.
+
+	Each expression class can implement `compile(emitter)`, which returns a Python source of the expression.
+	Sources of nested expressions are obtained by `emitter.emit(child)`, so that the whole syntax tree becomes
+	a single flat Python expression, with native short-circuiting of `AND`, `OR`, `IF` and `WHEN`.
+	Expressions that do not implement `compile()` are called as they are.
+
+	The compiled function has the same signature as the expression, i.e. `function(context, event, *args, **kwargs)`.
+	"""
+
+	def __init__(self, app):
+		self.App = app
+
+
+	def compile(self, expression):
+		"""
+		Returns a function that evaluates the expression.
+		"""
+		emitter = Emitter(self)
+		return emitter.build_function(expression)
+
+
+	def compile_many(self, expressions):
+		return [self.compile(expression) for expression in expressions]
+
+
+	def compile_processor(self, expressions):
+		"""
+		Returns a function `function(context, event)` that applies all expressions one after another,
+		as `DeclarativeProcessor.process()` does.
+		"""
+		emitter = Emitter(self)
+		return emitter.build_processor(expressions)
+
+
+class Emitter(object):
+	"""
+	Collects the Python source and constants of one compiled function.
+	"""
+
+	def __init__(self, compiler):
+		self.Compiler = compiler
+		self.Namespace = {
+			"DeclarationError": DeclarationError,
+		}
+		self.Constants = {}
+
+
+	def emit(self, expression):
+		"""
+		Returns the Python source of the expression.
+		"""
+		if not isinstance(expression, Expression):
+			return self.constant(expression)
+
+		source = expression.compile(self)
+		if source is None:
+			# The expression does not support the compilation, it is called
+			return "{}(context, event, *args, **kwargs)".format(self.constant(expression))
+
+		return source
+
+
+	def constant(self, value):
+		"""
+		Returns the Python source of the value, literals are inlined and other objects are bound to the function.
+		"""
+		if value is None or isinstance(value, (bool, int, str, bytes)):
+			return repr(value)
+
+		if isinstance(value, float) and value == value and value not in (float('inf'), float('-inf')):
+			return repr(value)
+
+		name = self.Constants.get(id(value))
+		if name is None:
+			name = "_c{}".format(len(self.Constants))
+			self.Constants[id(value)] = name
+			self.Namespace[name] = value
+
+		return name
+
+
+	def compile(self, expression):
+		"""
+		Compiles the expression into a separate function, e.g. when an exception of it has to be handled.
+		Exceptions of the function are not wrapped into `DeclarationError`.
+		"""
+		return Emitter(self.Compiler).build_function(expression, wrap=False)
+
+
+	def build_function(self, expression, wrap=True):
+		if not wrap:
+			lines = [
+				"def _compiled(context, event, *args, **kwargs):",
+				"\treturn {}".format(self.emit(expression)),
+			]
+			return self._build(lines, expression)
+
+		location = self.constant(expression.get_location() if isinstance(expression, Expression) else None)
+		lines = [
+			"def _compiled(context, event, *args, **kwargs):",
+			"\ttry:",
+			"\t\treturn {}".format(self.emit(expression)),
+			"\texcept DeclarationError:",
+			"\t\traise",
+			"\texcept Exception as e:",
+			"\t\traise DeclarationError(original_exception=e, location={})".format(location),
+		]
+		return self._build(lines, expression)
+
+
+	def build_processor(self, expressions):
+		lines = [
+			"def _compiled(context, event, *args, **kwargs):",
+		]
+
+		for expression in expressions:
+			location = self.constant(expression.get_location() if isinstance(expression, Expression) else None)
+			lines.extend([
+				"\ttry:",
+				"\t\tevent = {}".format(self.emit(expression)),
+				"\texcept DeclarationError:",
+				"\t\traise",
+				"\texcept Exception as e:",
+				"\t\traise DeclarationError(original_exception=e, location={})".format(location),
+				"\tif event is None:",
+				"\t\treturn None",
+			])
+
+		lines.extend([
+			"\tif not event:",
+			"\t\treturn None",
+			"\treturn event",
+		])
+		return self._build(lines, expressions)
+
+
+	def _build(self, lines, expression):
+		source = "\n".join(lines)
+		try:
+			code = compile(source, "<declaration>", "exec")
+		except SyntaxError:
+			L.exception("Failed to compile '{}':\n{}".format(expression, source))
+			raise
+
+		exec(code, self.Namespace)
+		function = self.Namespace["_compiled"]
+		function.Source = source
+		return function
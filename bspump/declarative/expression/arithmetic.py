@@ -23,6 +23,9 @@ class ADD(SequenceExpression):
 	def __call__(self, context, event, *args, **kwargs):
 		return self.reduce(operator.add, context, event, *args, **kwargs)
 
+	def compile(self, emitter):
+		return _compile_reduce(emitter, self.Items, "+")
+
 
 	def get_outlet_type(self):
 		return _get_outlet_type_from_first(self.Items)
@@ -51,6 +54,9 @@ class DIV(SequenceExpression):
 	def __call__(self, context, event, *args, **kwargs):
 		return self.reduce(operator.truediv, context, event, *args, **kwargs)
 
+	def compile(self, emitter):
+		return _compile_reduce(emitter, self.Items, "/")
+
 	def get_outlet_type(self):
 		# TODO: Check if there is float among integers
 		return _get_outlet_type_from_first(self.Items)
@@ -78,6 +84,9 @@ class MUL(SequenceExpression):
 	def __call__(self, context, event, *args, **kwargs):
 		return self.reduce(operator.mul, context, event, *args, **kwargs)
 
+	def compile(self, emitter):
+		return _compile_reduce(emitter, self.Items, "*")
+
 	def get_outlet_type(self):
 		# TODO: Check if there is float among integers
 		return _get_outlet_type_from_first(self.Items)
@@ -106,6 +115,9 @@ class SUB(SequenceExpression):
 	def __call__(self, context, event, *args, **kwargs):
 		return self.reduce(operator.sub, context, event, *args, **kwargs)
 
+	def compile(self, emitter):
+		return _compile_reduce(emitter, self.Items, "-")
+
 	def get_outlet_type(self):
 		# TODO: Check if there is float among integers
 		return _get_outlet_type_from_first(self.Items)
@@ -132,6 +144,9 @@ class MOD(SequenceExpression):
 	def __call__(self, context, event, *args, **kwargs):
 		return self.reduce(operator.mod, context, event, *args, **kwargs)
 
+	def compile(self, emitter):
+		return _compile_reduce(emitter, self.Items, "%")
+
 
 	def get_outlet_type(self):
 		return _get_outlet_type_from_first(self.Items)
@@ -154,6 +169,20 @@ class POW(SequenceExpression):
 	def __call__(self, context, event, *args, **kwargs):
 		return self.reduce(operator.pow, context, event, *args, **kwargs)
 
+	def compile(self, emitter):
+		return _compile_reduce(emitter, self.Items, "**")
+
+
+def _compile_reduce(emitter, items, operator):
+	if len(items) == 0:
+		return None
+
+	# Left to right, as functools.reduce()
+	source = "({})".format(emitter.emit(items[0]))
+	for item in items[1:]:
+		source = "({} {} ({}))".format(source, operator, emitter.emit(item))
+	return source
+
 
 def _get_outlet_type_from_first(items):
 	if len(items) == 0:
@@ -14,6 +14,8 @@ class ComparisonExpression(SequenceExpression):
 
 	Category = "Compare"
 
+	PythonOperator = None  # Used by the compilation
+
 
 	def __call__(self, context, event, *args, **kwargs):
 		it = iter(self.Items)
@@ -38,6 +40,15 @@ class ComparisonExpression(SequenceExpression):
 		return True
 
 
+	def compile(self, emitter):
+		if self.PythonOperator is None or len(self.Items) < 2:
+			return None
+		# Python chained comparison evaluates each item once and stops on the first False
+		return "(True if {} else False)".format(
+			" {} ".format(self.PythonOperator).join("({})".format(emitter.emit(item)) for item in self.Items)
+		)
+
+
 	def get_outlet_type(self):
 		return bool.__name__
 
@@ -47,6 +58,7 @@ class LT(ComparisonExpression):
 	Operator '<'
 	'''
 	Operator = operator.lt
+	PythonOperator = "<"
 
 
 class LE(ComparisonExpression):
@@ -54,6 +66,7 @@ class LE(ComparisonExpression):
 	Operator '<='
 	'''
 	Operator = operator.le
+	PythonOperator = "<="
 
 
 class EQ(ComparisonExpression):
@@ -61,6 +74,7 @@ class EQ(ComparisonExpression):
 	Operator '=='
 	'''
 	Operator = operator.eq
+	PythonOperator = "=="
 
 	Attributes = {
 		"Items": [
@@ -119,6 +133,10 @@ class EQ_optimized_simple(EQ):
 		return self.A(context, event, *args, **kwargs) == self.B
 
 
+	def compile(self, emitter):
+		return "({} == {})".format(emitter.emit(self.A), emitter.constant(self.B))
+
+
 	def optimize(self):
 		return None
 
@@ -139,6 +157,12 @@ class EQ_optimized_EVENT_VALUE(EQ):
 		return event.get(self.Akey, self.Adefault) == self.B
 
 
+	def compile(self, emitter):
+		return "(event.get({}, {}) == {})".format(
+			emitter.constant(self.Akey), emitter.constant(self.Adefault), emitter.constant(self.B)
+		)
+
+
 	def optimize(self):
 		return None
 
@@ -148,6 +172,7 @@ class NE(ComparisonExpression):
 	Operator '!='
 	'''
 	Operator = operator.ne
+	PythonOperator = "!="
 
 
 class GE(ComparisonExpression):
@@ -155,6 +180,7 @@ class GE(ComparisonExpression):
 	Operator '>='
 	"""
 	Operator = operator.ge
+	PythonOperator = ">="
 
 
 class GT(ComparisonExpression):
@@ -162,6 +188,7 @@ class GT(ComparisonExpression):
 	Operator '>'
 	"""
 	Operator = operator.gt
+	PythonOperator = ">"
 
 
 	def get_items_inlet_type(self):
@@ -174,6 +201,7 @@ class IS(ComparisonExpression):
 	Operator 'is'
 	"""
 	Operator = operator.is_
+	PythonOperator = "is"
 
 
 # TODO: This operator is obsoleted and should be removed (AT Jan 2021)
@@ -182,6 +210,7 @@ class ISNOT(ComparisonExpression):
 	Operator 'is not'
 	"""
 	Operator = operator.is_not
+	PythonOperator = "is not"
 
 
 	def get_items_inlet_type(self):
@@ -133,6 +133,9 @@ class ITEM_optimized_EVENT_VALUE(ITEM):
 	def __call__(self, context, event, *args, **kwargs):
 		return event.get(self.Key, self.DefaultValue)
 
+	def compile(self, emitter):
+		return "event.get({}, {})".format(emitter.constant(self.Key), emitter.constant(self.DefaultValue))
+
 
 class ITEM_optimized_CONTEXT_VALUE(ITEM):
 
@@ -165,7 +168,10 @@ class ITEM_optimized_CONTEXT_VALUE(ITEM):
 		return None
 
 	def __call__(self, context, event, *args, **kwargs):
-		return context.get(self.Key, self.Default)
+		return context.get(self.Key, self.DefaultValue)
+
+	def compile(self, emitter):
+		return "context.get({}, {})".format(emitter.constant(self.Key), emitter.constant(self.DefaultValue))
 
 
 class ITEM_optimized_CONTEXT_VALUE_NESTED(ITEM):
@@ -1,3 +1,6 @@
+import bisect
+import socket
+
 from netaddr import IPNetwork, IPAddress
 
 import netaddr.core
@@ -34,6 +37,18 @@ class IP_INSUBNET(Expression):
 			self.Subnet = VALUE(app, value=arg_subnet)
 
 
+	def optimize(self):
+		if isinstance(self.Subnet, VALUE):
+			try:
+				subnet_table = SubnetTable(self.Subnet.Value)
+			except netaddr.core.AddrFormatError:
+				# Invalid subnets are reported during the evaluation
+				return None
+			return IP_INSUBNET_optimized_VALUE(self, subnet_table)
+
+		return None
+
+
 	def __call__(self, context, event, *args, **kwargs):
 		value = self.Value(context, event, *args, **kwargs)
 		subnet = self.Subnet(context, event, *args, **kwargs)
@@ -51,3 +66,100 @@ class IP_INSUBNET(Expression):
 			return None
 
 		return False
+
+
+class IP_INSUBNET_optimized_VALUE(IP_INSUBNET):
+	"""
+	Subnets are given by a value, they are merged into a table of address ranges,
+	that is searched by bisection.
+	"""
+
+	def __init__(self, orig, subnet_table):
+		super().__init__(
+			orig.App,
+			arg_subnet=orig.Subnet,
+			arg_what=orig.Value,
+		)
+		self.SubnetTable = subnet_table
+
+
+	def optimize(self):
+		# This is to prevent re-optimising the class
+		return None
+
+
+	def __call__(self, context, event, *args, **kwargs):
+		return self.SubnetTable.contains(self.Value(context, event, *args, **kwargs))
+
+
+	def compile(self, emitter):
+		return "{}({})".format(emitter.constant(self.SubnetTable.contains), emitter.emit(self.Value))
+
+
+class SubnetTable(object):
+	"""
+	Sorted table of disjoint address ranges for each IP version.
+	Membership of an address is found by a bisection, i.e. in O(log n) for n subnets.
+	"""
+
+	def __init__(self, subnets):
+		if not isinstance(subnets, list):
+			subnets = [subnets]
+
+		ranges = {4: [], 6: []}
+		for subnet in subnets:
+			network = IPNetwork(subnet)
+			ranges[network.version].append((network.first, network.last))
+
+		self.Starts = {}
+		self.Ends = {}
+		for version, version_ranges in ranges.items():
+			starts = []
+			ends = []
+			for first, last in sorted(version_ranges):
+				if len(ends) > 0 and first <= ends[-1] + 1:
+					# Overlapping or adjacent ranges are merged
+					ends[-1] = max(ends[-1], last)
+				else:
+					starts.append(first)
+					ends.append(last)
+			self.Starts[version] = starts
+			self.Ends[version] = ends
+
+		self.Empty = len(subnets) == 0
+
+
+	def contains(self, value):
+		"""
+		Returns True if the address is in one of subnets, None if the address is invalid.
+		"""
+		if self.Empty:
+			return False
+
+		version, address = self._parse(value)
+		if version is None:
+			return None
+
+		i = bisect.bisect_right(self.Starts[version], address) - 1
+		return i >= 0 and address <= self.Ends[version][i]
+
+
+	def _parse(self, value):
+		if isinstance(value, str):
+			# Fast path for the most common forms
+			try:
+				return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, value), 'big')
+			except OSError:
+				pass
+			try:
+				return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, value), 'big')
+			except OSError:
+				pass
+
+		try:
+			address = IPAddress(value)
+		except netaddr.core.AddrFormatError:
+			# IP address could not be detected
+			return None, None
+
+		return address.version, address.value
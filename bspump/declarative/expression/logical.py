@@ -26,6 +26,12 @@ class AND(SequenceExpression):
 		return True
 
 
+	def compile(self, emitter):
+		return "(True if {} else False)".format(" and ".join(
+			"({})".format(emitter.emit(item)) for item in self.Items
+		))
+
+
 	def get_outlet_type(self):
 		return bool.__name__
 
@@ -57,6 +63,12 @@ class OR(SequenceExpression):
 		return False
 
 
+	def compile(self, emitter):
+		return "(True if {} else False)".format(" or ".join(
+			"({})".format(emitter.emit(item)) for item in self.Items
+		))
+
+
 	def get_outlet_type(self):
 		return bool.__name__
 
@@ -94,5 +106,18 @@ class NOT(Expression):
 			return False
 
 
+	def compile(self, emitter):
+		# The TypeError has to be caught, so the operand is compiled into a separate function
+		what = emitter.compile(self.What)
+
+		def _not(context, event, *args, **kwargs):
+			try:
+				return not what(context, event, *args, **kwargs)
+			except TypeError:
+				return False
+
+		return "{}(context, event, *args, **kwargs)".format(emitter.constant(_not))
+
+
 	def get_outlet_type(self):
 		return bool.__name__
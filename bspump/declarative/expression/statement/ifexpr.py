@@ -52,5 +52,11 @@ class IF(Expression):
 			return self.Else(context, event, *args, **kwargs)
 
 
+	def compile(self, emitter):
+		return "(({}) if ({}) else ({}))".format(
+			emitter.emit(self.Then), emitter.emit(self.Test), emitter.emit(self.Else)
+		)
+
+
 	def get_outlet_type(self):
 		return self.Then.get_outlet_type()
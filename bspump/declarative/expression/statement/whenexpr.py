@@ -110,5 +110,12 @@ class WHEN(Expression):
 		return self.Else(context, event, *args, **kwargs)
 
 
+	def compile(self, emitter):
+		source = "({})".format(emitter.emit(self.Else))
+		for test, then in reversed(self.ItemsNormalized):
+			source = "(({}) if ({}) else {})".format(emitter.emit(then), emitter.emit(test), source)
+		return source
+
+
 	def get_outlet_type(self):
 		return self.OutletType
@@ -38,13 +38,22 @@ class REGEX(Expression):
 
 	def __call__(self, context, event, *args, **kwargs):
 		value = self.Value(context, event, *args, **kwargs)
-		match = re.search(self.Regex, value)
+		match = self.Regex.search(value)
 		if match is None:
 			return self.Miss(context, event, *args, **kwargs)
 		else:
 			return self.Hit(context, event, *args, **kwargs)
 
 
+	def compile(self, emitter):
+		return "(({}) if {}({}) is not None else ({}))".format(
+			emitter.emit(self.Hit),
+			emitter.constant(self.Regex.search),
+			emitter.emit(self.Value),
+			emitter.emit(self.Miss),
+		)
+
+
 class REGEX_PARSE(Expression):
 	"""
 	Search `value` forr `regex` with regular expressions groups.
@@ -125,7 +134,7 @@ class REGEX_PARSE(Expression):
 	def __call__(self, context, event, *args, **kwargs):
 		value = self.Value(context, event, *args, **kwargs)
 		try:
-			match = re.search(self.Regex, value)
+			match = self.Regex.search(value)
 		except TypeError:
 			match = None
 		if match is None:
@@ -74,6 +74,10 @@ class IN(Expression):
 		return self.What(context, event, *args, **kwargs) in self.Where(context, event, *args, **kwargs)
 
 
+	def compile(self, emitter):
+		return "(({}) in ({}))".format(emitter.emit(self.What), emitter.emit(self.Where))
+
+
 	def get_outlet_type(self):
 		return bool.__name__
 
@@ -98,6 +102,10 @@ class IN_optimized_list_where(IN):
 		return self.What(context, event, *args, **kwargs) in self._where_value
 
 
+	def compile(self, emitter):
+		return "(({}) in {})".format(emitter.emit(self.What), emitter.constant(self._where_value))
+
+
 class IN_optimized_set_where(IN):
 
 	def __init__(self, orig):
@@ -119,6 +127,10 @@ class IN_optimized_set_where(IN):
 		return self.What(context, event, *args, **kwargs) in self._where_value
 
 
+	def compile(self, emitter):
+		return "(({}) in {})".format(emitter.emit(self.What), emitter.constant(self._where_value))
+
+
 class IN_optimized_EVENT_VALUE(IN):
 
 	def __init__(self, orig):
@@ -136,3 +148,6 @@ class IN_optimized_EVENT_VALUE(IN):
 
 	def __call__(self, context, event, *args, **kwargs):
 		return self._what_value in event
+
+	def compile(self, emitter):
+		return "({} in event)".format(emitter.constant(self._what_value))
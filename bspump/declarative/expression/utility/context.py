@@ -22,6 +22,9 @@ Usage:
 	def __call__(self, context, event, *args, **kwargs):
 		return context
 
+	def compile(self, emitter):
+		return "context"
+
 
 class CONTEXT_SET(Expression):
 
@@ -22,6 +22,9 @@ Usage:
 	def __call__(self, context, event, *args, **kwargs):
 		return event
 
+	def compile(self, emitter):
+		return "event"
+
 	def get_outlet_type(self):
 		return dict.__name__
 
@@ -49,6 +52,8 @@ Usage:
 	def __call__(self, context, event, *args, **kwargs):
 		return kwargs
 
+	def compile(self, emitter):
+		return "kwargs"
 
 
 class KWARG(Expression):
@@ -71,6 +76,9 @@ Usage:
 	def __call__(self, context, event, *args, **kwargs):
 		return kwargs[self.ArgName]
 
+	def compile(self, emitter):
+		return "kwargs[{}]".format(emitter.constant(self.ArgName))
+
 
 class ARGS(Expression):
 
@@ -84,6 +92,9 @@ class ARGS(Expression):
 	def __call__(self, context, event, *args, **kwargs):
 		return args
 
+	def compile(self, emitter):
+		return "args"
+
 
 class ARG(Expression):
 
@@ -97,3 +108,6 @@ class ARG(Expression):
 
 	def __call__(self, context, event, *args, **kwargs):
 		return args[self.ArgNumber]
+
+	def compile(self, emitter):
+		return "args[{}]".format(self.ArgNumber)
@@ -27,5 +27,9 @@ class VALUE(Expression):
 		return self.Value
 
 
+	def compile(self, emitter):
+		return emitter.constant(self.Value)
+
+
 	def get_outlet_type(self):
 		return self.OutletType
@@ -12,7 +12,12 @@ L = logging.getLogger(__name__)
 
 class ExpressionOptimizer(object):
 	"""
-	Optimizes an expression using walk strategy and individual optimize methods.
+	Optimizes an expression using individual optimize methods.
+
+	The syntax tree is optimized bottom-up in a single pass: children of a node are optimized first,
+	then the node itself is optimized till its `optimize()` returns None.
+	An optimized variant of a node is optimized again, but children that were already optimized are skipped,
+	so the optimization is linear with the size of the tree.
 	"""
 
 	def __init__(self, app):
@@ -20,46 +25,50 @@ class ExpressionOptimizer(object):
 
 
 	def optimize(self, expression):
+		if not isinstance(expression, Expression):
+			expression = VALUE(self.App, value=expression)
+
+		# id() of the original node -> (the original node, its optimized variant)
+		# The original node is kept in the map, so that its id() is not reused
+		optimized = {}
+		return self._optimize(expression, optimized)
 
-		# We run optimizations till we finish tree walk without any optimization found
-		retry = True
-		counter = 0
-		while retry:
-			retry = False
 
-			counter += 1
+	def optimize_many(self, expressions):
+		return [self.optimize(expression) for expression in expressions]
 
-			if not isinstance(expression, Expression):
-				expression = VALUE(self.App, value=expression)
 
-			# Walk the syntax tree
-			for parent, key, obj in expression.walk():
+	def _optimize(self, expression, optimized):
+		entry = optimized.get(id(expression))
+		if entry is not None:
+			# The node is shared by more parents (e.g. by `!INCLUDE`)
+			return entry[1]
 
-				if not isinstance(obj, Expression):
-					continue
+		variants = [expression]
+		while True:
 
-				# Check if the node could be optimized
-				opt_obj = obj.optimize()
-				if opt_obj is None:
+			for key, child in expression.children():
+				if not isinstance(child, Expression):
 					continue
 
-				assert(obj is not opt_obj)
+				opt_child = self._optimize(child, optimized)
+				if opt_child is not child:
+					expression.set(key, opt_child)
 
-				if parent is None:
-					expression = opt_obj
-				else:
-					# If yes, replace a given node by the optimized variant
-					parent.set(key, opt_obj)
+			# Check if the node could be optimized
+			opt_expression = expression.optimize()
+			if opt_expression is None:
+				break
 
-				if counter > 100000:
-					raise RuntimeError("Optimization likely stucked at '{}'-'{}'-'{}'/'{}'".format(parent, key, obj, opt_obj))
+			assert(expression is not opt_expression)
 
-				# ... and start again
-				retry = True
-				break
+			if len(variants) > 1000:
+				raise RuntimeError("Optimization likely stucked at '{}'/'{}'".format(expression, opt_expression))
 
-		return expression
+			expression = opt_expression
+			variants.append(expression)
 
+		for variant in variants:
+			optimized[id(variant)] = (variant, expression)
 
-	def optimize_many(self, expressions):
-		return [self.optimize(expression) for expression in expressions]
+		return expression
@@ -1,9 +1,32 @@
+import logging
+
 from ..abc.processor import Processor
 from .builder import ExpressionBuilder
 from .optimizer import ExpressionOptimizer
+from .compiler import ExpressionCompiler
+from .cache import get_declaration_cache
+
+###
+
+L = logging.getLogger(__name__)
+
+###
 
 
 class DeclarativeProcessor(Processor):
+	"""
+	Applies expressions of the declaration to the event.
+
+	The expressions are optimized and compiled into a single Python function (see `ExpressionCompiler`),
+	the compilation can be disabled by the `compile` option.
+	Processors with the same declaration share the optimized expressions and the compiled function
+	through the `DeclarationCache`, unless the `cache` option is disabled.
+	"""
+
+	ConfigDefaults = {
+		"compile": "yes",
+		"cache": "yes",
+	}
 
 	@classmethod
 	def construct(cls, app, pipeline, definition: dict):
@@ -17,13 +40,43 @@ class DeclarativeProcessor(Processor):
 		self.Declaration = declaration
 		self.Builder = ExpressionBuilder(app, library)
 		self.ExpressionOptimizer = ExpressionOptimizer(app)
+		self.ExpressionCompiler = ExpressionCompiler(app) if self.Config.getboolean("compile") else None
+		self.Cache = get_declaration_cache(app) if self.Config.getboolean("cache") else None
 		self.Expressions = None
+		self.Compiled = None
 
 	async def initialize(self):
-		expressions = await self.Builder.parse(self.Declaration)
-		self.Expressions = self.ExpressionOptimizer.optimize_many(expressions)
+		entry = None
+		if self.Cache is not None:
+			entry = await self.Cache.lookup(self.Builder, self.Declaration)
+
+		if entry is not None and entry.Expressions is not None:
+			self.Expressions = entry.Expressions
+		else:
+			expressions = await self.Builder.parse(self.Declaration)
+			self.Expressions = self.ExpressionOptimizer.optimize_many(expressions)
+			if entry is not None:
+				self.Cache.store(entry, self.Builder, self.Expressions)
+
+		self.Compiled = None
+		if self.ExpressionCompiler is not None:
+			if entry is not None and entry.Compiled is not None:
+				self.Compiled = entry.Compiled
+				return
+
+			try:
+				self.Compiled = self.ExpressionCompiler.compile_processor(self.Expressions)
+			except (SyntaxError, RecursionError):
+				# E.g. the declaration is nested too deep for the Python parser
+				L.warning("Failed to compile the declaration of '{}', it is going to be interpreted".format(self.Id))
+
+			if entry is not None:
+				entry.Compiled = self.Compiled
 
 	def process(self, context, event):
+		if self.Compiled is not None:
+			return self.Compiled(context, event)
+
 		for expression in self.Expressions:
 			event = expression(context, event)
 			if event is None:
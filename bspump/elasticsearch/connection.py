@@ -6,6 +6,7 @@ import re
 import aiohttp
 
 from ..abc.connection import Connection
+from ..http.client.sessionpool import HTTPClientSessionPool
 
 #
 
@@ -244,6 +245,18 @@ class ElasticSearchConnection(Connection):
 	precise_error_handling : bool, default = False
 			If True all Errors will be logged, If false soft errors will be omitted in the Logs.
 
+	session_limit : int, default = 100
+			Maximal number of connections of the shared session used by lookups.
+
+	session_limit_per_host : int, default = 0
+			Maximal number of connections of the shared session to one node, 0 means unlimited.
+
+	session_keepalive_timeout : float, default = 15
+			Seconds for which an idle connection of the shared session is kept open.
+
+	dns_cache_ttl : int, default = 10
+			Seconds for which DNS resolutions of the shared session are cached.
+
 
 
 	"""
@@ -259,6 +272,10 @@ class ElasticSearchConnection(Connection):
 		'timeout': 300,
 		'fail_log_max_size': 20,
 		'precise_error_handling': False,
+		'session_limit': 100,
+		'session_limit_per_host': 0,
+		'session_keepalive_timeout': 15,
+		'dns_cache_ttl': 10,
 	}
 
 	def __init__(self, app, id=None, config=None):
@@ -303,6 +320,15 @@ class ElasticSearchConnection(Connection):
 
 		self._loader_per_url = int(self.Config['loader_per_url'])
 
+		self.SessionPool = HTTPClientSessionPool(
+			app, "elasticsearch:{}".format(self.Id),
+			auth=self._auth,
+			limit=self.Config['session_limit'],
+			limit_per_host=self.Config['session_limit_per_host'],
+			ttl_dns_cache=self.Config['dns_cache_ttl'],
+			keepalive_timeout=self.Config['session_keepalive_timeout'],
+		)
+
 		self._bulk_out_max_size = int(self.Config['bulk_out_max_size'])
 		self._bulks = {}
 
@@ -361,6 +387,16 @@ class ElasticSearchConnection(Connection):
 		"""
 		return aiohttp.ClientSession(auth=self._auth)
 
+	def get_shared_session(self):
+		"""
+		Returns the persistent session with a pool of keep-alive connections, that is shared by lookups.
+		The session must not be closed by the caller.
+
+		:return: aiohttp.ClientSession
+
+		"""
+		return self.SessionPool.get()
+
 	def consume(self, index, data_feeder_generator, bulk_class=ElasticSearchBulk):
 		"""
 		Checks the content of data_feeder_generator and bulk and if There is data to be send it calls enqueue method.
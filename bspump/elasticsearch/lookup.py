@@ -28,6 +28,14 @@ class ElasticSearchLookup(MappingLookup, AsyncLookupMixin):
 	*scroll_timeout* - Timeout of single scroll request (default is '1m'). Allowed time units:
 	https://www.elastic.co/guide/en/elasticsearch/reference/current/common-options.html#time-units
 
+	*batch_query* - How keys of a batch (see `batch_size`) are fetched: 'msearch' (default) sends queries built by
+	`build_find_one_query()` in one `_msearch` request, so a batch finds the same documents as single lookups.
+	'terms' sends one query built by `build_find_many_query()`, which matches exact values,
+	so the `key` field has to be a `keyword` (not analyzed `text`) field.
+
+	Requests are sent over the persistent session of the connection (see `ElasticSearchConnection.get_shared_session()`),
+	which keeps connections to ElasticSearch alive between lookups.
+
 	Example:
 
 	.. code:: python
@@ -58,6 +66,7 @@ class ElasticSearchLookup(MappingLookup, AsyncLookupMixin):
 		'key': '',  # Specify field name to match
 		'cache_non_existent': False,  # True - if key is not found, it will be cached as None
 		'scroll_timeout': '1m',
+		'batch_query': 'msearch',  # 'msearch' or 'terms'
 	}
 
 	def __init__(self, app, connection, id=None, config=None, cache=None, lazy=False):
@@ -90,6 +99,9 @@ class ElasticSearchLookup(MappingLookup, AsyncLookupMixin):
 		self.ScrollTimeout = self.Config['scroll_timeout']
 		self.Key = self.Config['key']
 		self.CacheNonExistent = self.Config['cache_non_existent']
+		self.BatchQuery = self.Config['batch_query'].lower()
+		if self.BatchQuery not in ('terms', 'msearch'):
+			raise RuntimeError("Unknown batch query '{}'".format(self.BatchQuery))
 
 		self.Count = -1
 		if cache is None:
@@ -110,27 +122,110 @@ class ElasticSearchLookup(MappingLookup, AsyncLookupMixin):
 		}
 		url = self.Connection.get_url() + '{}/{}'.format(self.Index, prefix)
 
-		async with self.Connection.get_session() as session:
-			async with session.post(
-					url,
-					json=request,
-					headers={'Content-Type': 'application/json'}
-			) as response:
+		session = self.Connection.get_shared_session()
+		async with session.post(
+			url,
+			json=request,
+			headers={'Content-Type': 'application/json'}
+		) as response:
 
-				if response.status != 200:
-					data = await response.text()
-					L.error("Failed to fetch data from ElasticSearch: {} from {}\n{}".format(response.status, url, data))
+			if response.status != 200:
+				data = await response.text()
+				L.error("Failed to fetch data from ElasticSearch: {} from {}\n{}".format(response.status, url, data))
 
 
-				msg = await response.json()
-				try:
-					hit = msg['hits']['hits'][0]
-				except Exception:
-					return None
+			msg = await response.json()
+			try:
+				hit = msg['hits']['hits'][0]
+			except Exception:
+				return None
 
 		return hit["_source"]
 
 
+	async def _fetch_many(self, keys):
+		if self.BatchQuery == 'msearch':
+			return await self._fetch_many_msearch(keys)
+
+		prefix = '_search'
+		request = {
+			"size": len(keys),
+			"query": self.build_find_many_query(keys)
+		}
+		url = self.Connection.get_url() + '{}/{}'.format(self.Index, prefix)
+
+		session = self.Connection.get_shared_session()
+		async with session.post(
+			url,
+			json=request,
+			headers={'Content-Type': 'application/json'}
+		) as response:
+
+			if response.status != 200:
+				data = await response.text()
+				L.error("Failed to fetch data from ElasticSearch: {} from {}\n{}".format(response.status, url, data))
+				return {}
+
+			msg = await response.json()
+
+		values = {}
+		for hit in msg.get('hits', {}).get('hits', []):
+			source = hit["_source"]
+			values.setdefault(self._get_key(source), source)
+		return values
+
+
+	def _get_key(self, source):
+		'''
+		Returns the value of the `key` field of the document, dotted names of nested fields are resolved.
+		'''
+		if self.Key in source:
+			return source[self.Key]
+
+		value = source
+		for name in self.Key.split('.'):
+			if not isinstance(value, dict):
+				return None
+			value = value.get(name)
+		return value
+
+
+	async def _fetch_many_msearch(self, keys):
+		url = self.Connection.get_url() + '{}/_msearch'.format(self.Index)
+
+		lines = []
+		header = json.dumps({})
+		for key in keys:
+			lines.append(header)
+			lines.append(json.dumps({
+				"size": 1,
+				"query": self.build_find_one_query(key)
+			}))
+		body = '\n'.join(lines) + '\n'
+
+		session = self.Connection.get_shared_session()
+		async with session.post(
+			url,
+			data=body.encode('utf-8'),
+			headers={'Content-Type': 'application/x-ndjson'}
+		) as response:
+
+			if response.status != 200:
+				data = await response.text()
+				L.error("Failed to fetch data from ElasticSearch: {} from {}\n{}".format(response.status, url, data))
+				return {}
+
+			msg = await response.json()
+
+		values = {}
+		for key, result in zip(keys, msg.get('responses', [])):
+			try:
+				values[key] = result['hits']['hits'][0]["_source"]
+			except (KeyError, IndexError):
+				pass
+		return values
+
+
 	async def get(self, key):
 		"""
 		Obtain the value from lookup asynchronously.
@@ -151,7 +246,7 @@ class ElasticSearchLookup(MappingLookup, AsyncLookupMixin):
 			self.CacheCounter.add('hit', 1)
 		except KeyError:
 			try:
-				value = await self._find_one(key)
+				value = await self.fetch(key)
 				if value is not None:
 					self.Cache[key] = value
 					self.CacheCounter.add('miss', 1)
@@ -189,6 +284,28 @@ class ElasticSearchLookup(MappingLookup, AsyncLookupMixin):
 		}
 
 
+	def build_find_many_query(self, keys) -> dict:
+		"""
+		Override this method to build your own multi-key query, which is used when `batch_size` is set
+		and `batch_query` is 'terms'. Documents are matched to keys by the value of the `key` field,
+		the default `terms` query requires a `keyword` field.
+
+		**Parameters**
+
+		keys : list
+
+		:return: Default multi-key query
+
+		|
+
+		"""
+		return {
+			'terms': {
+				self.Key: keys
+			}
+		}
+
+
 	async def _count(self):
 		prefix = "_count"
 		request = {
@@ -199,19 +316,19 @@ class ElasticSearchLookup(MappingLookup, AsyncLookupMixin):
 
 		url = self.Connection.get_url() + '{}/{}'.format(self.Index, prefix)
 
-		async with self.Connection.get_session() as session:
-			async with session.post(
-					url,
-					json=request,
-					headers={'Content-Type': 'application/json'}
-			) as response:
+		session = self.Connection.get_shared_session()
+		async with session.post(
+			url,
+			json=request,
+			headers={'Content-Type': 'application/json'}
+		) as response:
 
-				if response.status != 200:
-					data = await response.text()
-					L.error("Failed to fetch data from ElasticSearch: {} from {}\n{}".format(response.status, url, data))
+			if response.status != 200:
+				data = await response.text()
+				L.error("Failed to fetch data from ElasticSearch: {} from {}\n{}".format(response.status, url, data))
 
 
-				msg = await response.json()
+			msg = await response.json()
 
 		return int(msg["count"])
 
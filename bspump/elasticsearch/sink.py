@@ -121,6 +121,33 @@ class ElasticSearchSink(Sink):
 			bulk_class=self.BulkClass,
 		)
 
+	def process_batch(self, context, events):
+		"""
+		Description: Inserts all events of the batch into the same index.
+
+		**Parameters**
+
+		context :
+
+		events : list
+				List of dict events.
+
+		"""
+		index = context.get("es_index", self.Index)
+		for event in events:
+			try:
+				_id = event.pop("_id", None)
+			except TypeError:
+				if isinstance(event, dict) is False:
+					L.error("You are trying to pass event of type: {} to ElasticSearchSink, but only dict is supported".format(type(event)))
+				raise
+			self.Connection.consume(
+				index,
+				self.__data_feeder(event, _id),
+				bulk_class=self.BulkClass,
+			)
+		return []
+
 	def _connection_throttle(self, event_name, connection):
 		if connection != self.Connection:
 			return
@@ -3,6 +3,7 @@ from .fileblocksource import FileBlockSource
 from .filecsvsink import FileCSVSink
 from .filecsvsource import FileCSVSource
 from .filejsonsource import FileJSONSource
+from .filewriterpool import FileWriterPool
 from .filelinesource import FileLineSource
 from .filelinesource import FileMultiLineSource
 from .lookupprovider import FileBatchLookupProvider
@@ -13,6 +14,7 @@ __all__ = (
 	'FileCSVSink',
 	'FileCSVSource',
 	'FileJSONSource',
+	'FileWriterPool',
 	'FileLineSource',
 	'FileMultiLineSource',
 	'FileBatchLookupProvider',
@@ -30,6 +30,7 @@ class FileABCSource(TriggerSource):
 		'lines_per_event': 10000,  # the number of lines after which the read method enters the idle state to allow other operations to perform their tasks
 		'event_idle_time': 0.01,  # the time for which the read method enters the idle state (see above)
 		'files_per_cycle': 1,
+		'batch_size': 0,  # the number of lines (events) sent to the pipeline at once, 0 means event by event
 	}
 
 
@@ -72,6 +73,9 @@ class FileABCSource(TriggerSource):
 				The time for which the read method enters the idle state (see above).
 			files_per_cycle : int, default = 1
 				The number of files that are processed in one cycle.
+			batch_size : int, default = 0
+				The number of events that are sent to the pipeline at once using `process_batch()`.
+				All events of the batch share the same context. 0 means that events are processed one by one.
 		"""
 		super().__init__(app, pipeline, id=id, config=config)
 		self.path = self.Config['path']
@@ -123,6 +127,7 @@ class FileABCSource(TriggerSource):
 		self.LinesCounter = 0
 		self.LinesPerEvent = int(self.Config["lines_per_event"])
 		self.EventIdleTime = float(self.Config["event_idle_time"])
+		self.BatchSize = int(self.Config["batch_size"])
 
 	async def cycle(self):
 		"""
@@ -241,15 +246,20 @@ class FileABCSource(TriggerSource):
 			self.Pipeline.set_error(None, None, e)
 			return
 
-	async def simulate_event(self):
+	async def simulate_event(self, count=1):
 		"""
 		The simulate_event method should be called in read method after a file line has been processed.
 
 		It ensures that all other asynchronous events receive enough time to perform their tasks.
 		Otherwise, the application loop is blocked by a file reader and no other activity makes a progress.
 
+		**Parameters**
+
+		count : int, default = 1
+			The number of lines that has been processed, e.g. the size of a batch.
+
 		"""
-		self.LinesCounter += 1
+		self.LinesCounter += count
 		if self.LinesCounter >= self.LinesPerEvent:
 			await asyncio.sleep(self.EventIdleTime)
 			self.LinesCounter = 0
@@ -269,6 +279,38 @@ class FileABCSource(TriggerSource):
 		"""
 		raise NotImplementedError()
 
+	async def read_batch(self, filename, iterable):
+		"""
+		Description: Sends events from `iterable` (e.g. lines or rows of the file) to the pipeline
+		in batches of `batch_size` events, which share one context.
+
+		**Parameters**
+
+		filename : file
+			Name of the file.
+
+		iterable :
+			Events read from the file.
+
+		"""
+		context = {
+			"filename": filename
+		}
+
+		batch = []
+		for event in iterable:
+			batch.append(event)
+			if len(batch) < self.BatchSize:
+				continue
+
+			await self.process_batch(batch, context)
+			await self.simulate_event(len(batch))
+			batch = []
+
+		if len(batch) > 0:
+			await self.process_batch(batch, context)
+			await self.simulate_event(len(batch))
+
 try:
   import pytest
   @staticmethod
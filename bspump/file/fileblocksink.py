@@ -1,6 +1,7 @@
 import os
 import logging
 from ..abc.sink import Sink
+from .filewriterpool import FileWriterPool
 
 
 L = logging.getLogger(__file__)
@@ -18,12 +19,18 @@ class FileBlockSink(Sink):
 
 	flags : O_CREAT
 
+	buffered : no - if yes, events are appended to files by `FileWriterPool`, see it for other options
+
 	"""
 
 	ConfigDefaults = {
 		'path': '',
 		'mode': "wb",
 		'flags': "O_CREAT",
+
+		# Buffered mode
+		'buffered': 'no',
+		**FileWriterPool.ConfigDefaults
 	}
 
 	OFlagDict = {
@@ -60,6 +67,11 @@ class FileBlockSink(Sink):
 			except KeyError:
 				L.warning("Unknown oflag '{}'".format(flag))
 
+		if self.Config.getboolean('buffered'):
+			self.WriterPool = FileWriterPool(self, self.Config)
+		else:
+			self.WriterPool = None
+
 
 	def get_file_name(self, context, event):
 		"""
@@ -94,6 +106,12 @@ class FileBlockSink(Sink):
 		"""
 		fname = self.get_file_name(context, event)
 
+		if self.WriterPool is not None:
+			if isinstance(event, str):
+				event = event.encode('utf-8')
+			self.WriterPool.write(fname, event)
+			return
+
 		fd = os.open(fname, os.O_WRONLY | self._oflags)
 		with os.fdopen(fd, self.Config['mode']) as fo:
 			fo.write(event)
@@ -1,8 +1,10 @@
 import csv
+import io
 import logging
 import os
 
 from ..abc.sink import Sink
+from .filewriterpool import FileWriterPool
 
 #
 
@@ -37,6 +39,8 @@ class FileCSVSink(Sink):
 
 	strict : False
 
+	buffered : no - if yes, rows are appended to files by `FileWriterPool`, see it for other options
+
 	"""
 	ConfigDefaults = {
 		'path': '',
@@ -49,6 +53,10 @@ class FileCSVSink(Sink):
 		'quoting': csv.QUOTE_MINIMAL,  # 0 - 3 for [QUOTE_MINIMAL, QUOTE_ALL, QUOTE_NONNUMERIC, QUOTE_NONE]
 		'skipinitialspace': False,
 		'strict': False,
+
+		# Buffered mode
+		'buffered': 'no',
+		**FileWriterPool.ConfigDefaults
 	}
 
 	def __init__(self, app, pipeline, id=None, config=None):
@@ -60,6 +68,13 @@ class FileCSVSink(Sink):
 		self.Dialect = csv.get_dialect(self.Config['dialect'])
 		self._csv_writer = None
 
+		if self.Config.getboolean('buffered'):
+			self.WriterPool = FileWriterPool(self, self.Config)
+			self._row_buffer = io.StringIO()
+			self._header = None
+		else:
+			self.WriterPool = None
+
 	def get_file_name(self, context, event):
 		"""
 		Description: Override this method to gain control over output file name.
@@ -129,6 +144,10 @@ class FileCSVSink(Sink):
 			Information with timestamp.
 
 		"""
+		if self.WriterPool is not None:
+			self._process_buffered(context, event)
+			return
+
 		if self._csv_writer is None:
 			# Open CSV file if needed
 			fieldnames = event.keys()
@@ -140,6 +159,21 @@ class FileCSVSink(Sink):
 		self._csv_writer.writerow(event)
 		self.fd.flush()
 
+	def _process_buffered(self, context, event):
+		if self._csv_writer is None:
+			self._csv_writer = self.writer(self._row_buffer, event.keys())
+			self._csv_writer.writeheader()
+			self._header = self._take_rows()
+
+		self._csv_writer.writerow(event)
+		self.WriterPool.write(self.get_file_name(context, event), self._take_rows(), header=self._header)
+
+	def _take_rows(self):
+		data = self._row_buffer.getvalue().encode('utf-8')
+		self._row_buffer.seek(0)
+		self._row_buffer.truncate()
+		return data
+
 	def rotate(self):
 		"""
 		Description: Call this to close the currently open file.
@@ -104,6 +104,10 @@ class FileCSVSource(FileABCSource):
 
 		"""
 
+		if self.BatchSize > 0:
+			await self.read_batch(filename, self.reader(f))
+			return
+
 		for line in self.reader(f):
 			await self.process(line, {
 				"filename": filename
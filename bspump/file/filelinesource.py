@@ -50,6 +50,10 @@ class FileLineSource(FileABCSource):
 
 		"""
 
+		if self.BatchSize > 0:
+			await self.read_batch(filename, f)
+			return
+
 		for line in f:
 
 			await self.process(line, {
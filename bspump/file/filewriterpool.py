@@ -0,0 +1,242 @@
+import asyncio
+import collections
+import gzip
+import logging
+import os
+import threading
+import time
+
+###
+
+L = logging.getLogger(__name__)
+
+###
+
+
+class FileWriterPool(object):
+	"""
+	Description: Write-behind buffer of file sinks in the buffered mode.
+
+	Data are collected in memory per file name and written by a worker thread of `asab.ProactorService`,
+	when the buffer of the file exceeds `flush_size` bytes or when it is older than `flush_age` seconds.
+	Open files are kept in a pool of at most `max_open_files` handles.
+	Files are optionally compressed (`gzip` or `zstd`) and rotated by size (`rotate_size`) or age (`rotate_time`);
+	the rotated file is renamed to `<path>.<YYYYmmddHHMMSS>`.
+	When more than `watermark.high` bytes wait for the write, the pipeline is throttled until the buffer drops below `watermark.low`.
+
+	Options are read from the configuration of the sink, sinks include `ConfigDefaults` in their own.
+
+	"""
+
+	ConfigDefaults = {
+		'flush_size': 1048576,  # Bytes buffered per file before the write
+		'flush_age': 1.0,  # Seconds after which the buffer is written
+		'max_open_files': 32,
+		'rotate_size': 0,  # Bytes written to a file before its rotation, 0 means never
+		'rotate_time': 0,  # Seconds after which a file is rotated, 0 means never
+		'compression': '',  # '', 'gzip' or 'zstd'
+		'watermark.high': 67108864,  # Buffered bytes, when the pipeline is throttled
+		'watermark.low': 16777216,  # Buffered bytes, when the pipeline is unthrottled
+	}
+
+	def __init__(self, sink, config):
+		self.Sink = sink
+		self.Pipeline = sink.Pipeline
+		self.Loop = sink.Pipeline.Loop
+		self.ProactorService = sink.Pipeline.App.get_service('asab.ProactorService')
+
+		self.FlushSize = int(config['flush_size'])
+		self.FlushAge = float(config['flush_age'])
+		self.MaxOpenFiles = max(int(config['max_open_files']), 1)
+		self.RotateSize = int(config['rotate_size'])
+		self.RotateTime = float(config['rotate_time'])
+		self.Compression = config['compression'].strip().lower()
+		self.HighWatermark = int(config['watermark.high'])
+		self.LowWatermark = int(config['watermark.low'])
+
+		if self.Compression not in ('', 'gzip', 'zstd'):
+			raise RuntimeError("Unknown compression '{}'".format(self.Compression))
+
+		if self.Compression == 'zstd':
+			# Optional dependency, checked here so that the misconfiguration does not drop data in the worker thread
+			try:
+				import zstandard
+			except ImportError:
+				raise RuntimeError("Compression 'zstd' requires the 'zstandard' package, install 'bspump[zstd]'")
+			self.ZstdCompressor = zstandard.ZstdCompressor
+		else:
+			self.ZstdCompressor = None
+
+		# File name -> [chunks, size, time of the first chunk]
+		self.Buffers = {}
+		self.Headers = {}
+		self.Buffered = 0
+		self.IsThrottling = False
+
+		self.FlushFuture = None
+		self.FlushPending = False
+
+		# Batches are written in the order they were taken, by the worker thread or on exit.
+		# Handles are used only under the lock.
+		self.Pending = collections.deque()
+		self.Lock = threading.Lock()
+		self.Handles = collections.OrderedDict()
+
+		sink.Pipeline.App.PubSub.subscribe("Application.tick!", self._on_tick)
+		sink.Pipeline.App.PubSub.subscribe("Application.exit!", self._on_exit)
+
+
+	def write(self, fname, data: bytes, header: bytes = None):
+		"""
+		Description: Appends `data` to the buffer of the file `fname`.
+		The `header` is written at the beginning of each new file.
+
+		"""
+		if header is not None:
+			self.Headers[fname] = header
+
+		buffer = self.Buffers.get(fname)
+		if buffer is None:
+			buffer = [[], 0, self.Loop.time()]
+			self.Buffers[fname] = buffer
+
+		buffer[0].append(data)
+		buffer[1] += len(data)
+		self.Buffered += len(data)
+
+		if buffer[1] >= self.FlushSize:
+			self._schedule_flush()
+
+		if not self.IsThrottling and self.Buffered > self.HighWatermark:
+			self.IsThrottling = True
+			self.Pipeline.throttle(self.Sink, True)
+
+
+	def _take_buffers(self, force=False):
+		now = self.Loop.time()
+		batch = []
+		for fname, (chunks, size, since) in list(self.Buffers.items()):
+			if force or size >= self.FlushSize or (now - since) >= self.FlushAge:
+				del self.Buffers[fname]
+				batch.append((fname, chunks, size))
+		return batch
+
+
+	def _schedule_flush(self):
+		if self.FlushFuture is not None and not self.FlushFuture.done():
+			self.FlushPending = True
+			return
+
+		self.FlushFuture = asyncio.ensure_future(self._flush())
+
+
+	async def _flush(self):
+		while True:
+			self.FlushPending = False
+			batch = self._take_buffers()
+			if len(batch) == 0:
+				break
+
+			self.Pending.append(batch)
+			try:
+				await self.ProactorService.execute(self._write_pending)
+			except Exception as e:
+				L.exception("Error when writing files: '{}'".format(e))
+
+			self.Buffered -= sum(size for _, _, size in batch)
+			if self.IsThrottling and self.Buffered < self.LowWatermark:
+				self.IsThrottling = False
+				self.Pipeline.throttle(self.Sink, False)
+
+			if not self.FlushPending:
+				break
+
+
+	def _write_pending(self):
+		with self.Lock:
+			while len(self.Pending) > 0:
+				self._write(self.Pending.popleft())
+
+
+	def _write(self, batch):
+		touched = set()
+		for fname, chunks, size in batch:
+			handle = self._get_handle(fname)
+			handle[0].write(b''.join(chunks))
+			handle[2] += size
+			touched.add(fname)
+
+			if (self.RotateSize > 0 and handle[2] >= self.RotateSize) \
+				or (self.RotateTime > 0 and time.time() - handle[1] >= self.RotateTime):
+				self._rotate(fname)
+				touched.discard(fname)
+
+		for fname in touched:
+			handle = self.Handles.get(fname)
+			if handle is not None:
+				handle[0].flush()
+
+
+	def _get_handle(self, fname):
+		handle = self.Handles.get(fname)
+		if handle is not None:
+			self.Handles.move_to_end(fname)
+			return handle
+
+		while len(self.Handles) >= self.MaxOpenFiles:
+			_, (f, _, _) = self.Handles.popitem(last=False)
+			f.close()
+
+		is_new = not os.path.exists(fname) or os.path.getsize(fname) == 0
+		f = self._open(fname)
+		handle = [f, time.time(), 0]
+
+		header = self.Headers.get(fname)
+		if is_new and header is not None:
+			f.write(header)
+			handle[2] += len(header)
+
+		self.Handles[fname] = handle
+		return handle
+
+
+	def _open(self, fname):
+		if self.Compression == 'gzip':
+			return gzip.open(fname, 'ab')
+
+		if self.Compression == 'zstd':
+			return self.ZstdCompressor().stream_writer(open(fname, 'ab'))
+
+		return open(fname, 'ab')
+
+
+	def _rotate(self, fname):
+		f, _, _ = self.Handles.pop(fname)
+		f.close()
+
+		rotated = "{}.{}".format(fname, time.strftime("%Y%m%d%H%M%S"))
+		i = 1
+		while os.path.exists(rotated):
+			rotated = "{}.{}.{}".format(fname, time.strftime("%Y%m%d%H%M%S"), i)
+			i += 1
+		os.rename(fname, rotated)
+
+
+	def _on_tick(self, event_name):
+		if len(self.Buffers) > 0:
+			self._schedule_flush()
+
+
+	def _on_exit(self, event_name):
+		"""
+		Description: Writes the rest of buffers synchronously and closes all files.
+
+		"""
+		self.Pending.append(self._take_buffers(force=True))
+		self._write_pending()
+		self.Buffered = 0
+
+		with self.Lock:
+			while len(self.Handles) > 0:
+				_, (f, _, _) = self.Handles.popitem(last=False)
+				f.close()
@@ -1,7 +1,10 @@
 from .client.source import HTTPClientLineSource
+from .client.source import HTTPClientNDJSONSource
+from .client.source import HTTPClientJSONArraySource
 from .client.source import HTTPClientSource
 from .client.source import HTTPClientTextSource
 from .client.wssink import HTTPClientWebSocketSink
+from .client.sessionpool import HTTPClientSessionPool
 from .web.sink import WebServiceSink
 from .web.source import WebServiceSource
 from .web.wssource import WebSocketSource
@@ -11,7 +14,10 @@ __all__ = (
 	'HTTPClientSource',
 	'HTTPClientTextSource',
 	'HTTPClientLineSource',
+	'HTTPClientNDJSONSource',
+	'HTTPClientJSONArraySource',
 	'HTTPClientWebSocketSink',
+	'HTTPClientSessionPool',
 	'WebServiceSource',
 	'WebServiceSink',
 	'WebSocketSource',
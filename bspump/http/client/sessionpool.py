@@ -0,0 +1,125 @@
+import logging
+
+import aiohttp
+
+#
+
+L = logging.getLogger(__name__)
+
+#
+
+
+class HTTPClientSessionPool(object):
+	"""
+	Description: Persistent `aiohttp.ClientSession` shared by lookups and other short requests.
+
+	Connections are kept alive (`keepalive_timeout`) and reused by following requests,
+	their number is limited in total (`limit`) and per host (`limit_per_host`, 0 means unlimited).
+	DNS resolutions are cached for `ttl_dns_cache` seconds.
+	The session is created on the first use and closed on the application exit.
+
+	Utilization of the pool is exported in the `http.client.pool` gauge:
+	requests waiting for their response (`acquired`), connections created and reused since the last export (`created`, `reused`).
+	It is tracked by the pool itself from request traces of the session.
+
+	**Parameters**
+
+	app : Application
+			Name of the Application.
+
+	id : str
+			Identification of the pool in metrics.
+
+	auth : aiohttp.BasicAuth, default None
+			Authentication of all requests.
+
+	"""
+
+	def __init__(self, app, id, auth=None, limit=100, limit_per_host=0, ttl_dns_cache=10, keepalive_timeout=15):
+		self.Id = id
+		self.Auth = auth
+		self.Limit = int(limit)
+		self.LimitPerHost = int(limit_per_host)
+		self.TTLDNSCache = int(ttl_dns_cache)
+		self.KeepAliveTimeout = float(keepalive_timeout)
+
+		self.Session = None
+
+		self.Acquired = 0
+		self.Created = 0
+		self.Reused = 0
+
+		metrics_service = app.get_service('asab.MetricsService')
+		self.Gauge = metrics_service.create_gauge(
+			"http.client.pool",
+			tags={
+				'pool': self.Id,
+			},
+			init_values={
+				'acquired': 0,
+				'created': 0,
+				'reused': 0,
+				'limit': self.Limit,
+			}
+		)
+
+		app.PubSub.subscribe("Application.tick/10!", self._on_tick)
+		app.PubSub.subscribe("Application.exit!", self._on_exit)
+
+
+	def get(self) -> aiohttp.ClientSession:
+		"""
+		Returns the shared session. The session must not be closed by the caller.
+
+		.. code-block:: python
+
+			session = self.SessionPool.get()
+			async with session.get(url) as response:
+				data = await response.json()
+
+		"""
+		if self.Session is None or self.Session.closed:
+			connector = aiohttp.TCPConnector(
+				limit=self.Limit,
+				limit_per_host=self.LimitPerHost,
+				ttl_dns_cache=self.TTLDNSCache,
+				keepalive_timeout=self.KeepAliveTimeout,
+			)
+			trace_config = aiohttp.TraceConfig()
+			trace_config.on_request_start.append(self._on_request_start)
+			trace_config.on_request_end.append(self._on_request_end)
+			trace_config.on_request_exception.append(self._on_request_end)
+			trace_config.on_connection_create_end.append(self._on_connection_create_end)
+			trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+			self.Session = aiohttp.ClientSession(connector=connector, auth=self.Auth, trace_configs=[trace_config])
+		return self.Session
+
+
+	async def _on_request_start(self, session, trace_config_ctx, params):
+		self.Acquired += 1
+
+
+	async def _on_request_end(self, session, trace_config_ctx, params):
+		self.Acquired -= 1
+
+
+	async def _on_connection_create_end(self, session, trace_config_ctx, params):
+		self.Created += 1
+
+
+	async def _on_connection_reuseconn(self, session, trace_config_ctx, params):
+		self.Reused += 1
+
+
+	def _on_tick(self, event_name):
+		self.Gauge.set('acquired', self.Acquired)
+		self.Gauge.set('created', self.Created)
+		self.Gauge.set('reused', self.Reused)
+		self.Created = 0
+		self.Reused = 0
+
+
+	async def _on_exit(self, event_name):
+		if self.Session is not None:
+			await self.Session.close()
+			self.Session = None
@@ -1,3 +1,7 @@
+import codecs
+import json
+import re
+
 from .abcsource import HTTPABCClientSource
 
 
@@ -12,6 +16,7 @@ class HTTPClientTextSource(HTTPABCClientSource):
 
 	ConfigDefaults = {
 		'encoding': '',
+		'chunk_size': 64 * 1024,  # Size of chunks of the streamed response body
 	}
 
 	def __init__(self, app, pipeline, id=None, config=None, headers={}):
@@ -21,16 +26,149 @@ class HTTPClientTextSource(HTTPABCClientSource):
 		if self.encoding == '':
 			self.encoding = None
 
+		self.ChunkSize = int(self.Config['chunk_size'])
+
 	async def read(self, response):
 		response = await response.text(encoding=self.encoding)
 		await self.process(response)
 
+	def incremental_decoder(self, response):
+		'''
+		Returns an incremental decoder of the response body, the encoding is taken from the configuration
+		or from the Content-Type of the response (UTF-8 by default).
+		'''
+		return codecs.getincrementaldecoder(self.encoding or response.charset or 'utf-8')()
+
+	async def iter_text(self, response):
+		'''
+		Yields decoded chunks of the response body as they arrive, the body is never held in memory as a whole.
+		'''
+		decoder = self.incremental_decoder(response)
+		async for chunk in response.content.iter_chunked(self.ChunkSize):
+			text = decoder.decode(chunk)
+			if len(text) > 0:
+				yield text
+
+		text = decoder.decode(b'', final=True)
+		if len(text) > 0:
+			yield text
+
 
 class HTTPClientLineSource(HTTPClientTextSource):
+	'''
+	Emits each line of the response body as an event.
+	The body is read and decoded in chunks of `chunk_size` bytes, so that lines are emitted as they arrive.
+	'''
+
+	async def read(self, response):
+		# Parts of the unfinished line, they are joined when its end arrives
+		pending = []
+		async for text in self.iter_text(response):
+			lines = text.split('\n')
+			if len(lines) == 1:
+				pending.append(text)
+				continue
+
+			pending.append(lines[0])
+			await self.process_line(''.join(pending))
+			pending = [lines.pop()]
+			for line in lines[1:]:
+				await self.process_line(line)
+
+		await self.process_line(''.join(pending))
+
+	async def process_line(self, line):
+		await self.process(line)
+
+
+class HTTPClientNDJSONSource(HTTPClientLineSource):
+	'''
+	Emits each JSON document of the newline delimited JSON (NDJSON) response body as an event.
+	Empty lines are skipped.
+	'''
+
+	async def process_line(self, line):
+		if len(line) == 0 or line.isspace():
+			return
+		await self.process(json.loads(line))
+
 
+class HTTPClientJSONArraySource(HTTPClientTextSource):
+	'''
+	Emits each item of the JSON array in the response body as an event.
+	The array is parsed incrementally, items are emitted as they arrive.
+	'''
+
+	Whitespace = re.compile(r'[ \t\n\r]*')
+	NumberEnd = re.compile(r'[ \t\n\r]*[,\]]')
+
+	def __init__(self, app, pipeline, id=None, config=None, headers={}):
+		super().__init__(app, pipeline, id=id, config=config, headers=headers)
+		self.Decoder = json.JSONDecoder()
 
 	async def read(self, response):
-		response = await response.text(encoding=self.encoding)
+		buffer = ''
+		started = False  # The opening bracket has been read
+		separator = False  # An item has been read, a comma or the closing bracket follows
+		empty = True  # No item has been read yet
+		finished = False
+		retry_at = 0  # An incomplete item is parsed again once the buffer doubles, to keep the parsing linear
+
+		chunks = self.iter_text(response)
+		eof = False
+		while not (eof or finished):
+			try:
+				buffer += await chunks.__anext__()
+			except StopAsyncIteration:
+				eof = True
+
+			if not eof and len(buffer) < retry_at:
+				continue
+			retry_at = 0
+
+			pos = 0
+			while True:
+				pos = self.Whitespace.match(buffer, pos).end()
+				if pos == len(buffer):
+					break
+
+				if not started:
+					if buffer[pos] != '[':
+						raise ValueError("The response is not a JSON array")
+					started = True
+					pos += 1
+					continue
+
+				if buffer[pos] == ']' and (separator or empty):
+					finished = True
+					break
+
+				if separator:
+					if buffer[pos] != ',':
+						raise ValueError("Expecting ',' delimiter in the JSON array")
+					separator = False
+					pos += 1
+					continue
+
+				try:
+					item, end = self.Decoder.raw_decode(buffer, pos)
+				except ValueError:
+					if eof:
+						raise
+					retry_at = 2 * (len(buffer) - pos)
+					break
+
+				if not eof and type(item) in (int, float) and self.NumberEnd.match(buffer, end) is None:
+					# The number may continue in the next chunk
+					retry_at = 2 * (len(buffer) - pos)
+					break
+
+				await self.process(item)
+				pos = end
+				separator = True
+				empty = False
+
+			buffer = buffer[pos:]
 
-		for line in response.split('\n'):
-			await self.process(line)
+		if not finished:
+			raise ValueError("The JSON array is not terminated")
@@ -8,6 +8,7 @@ import asyncio
 import asab
 
 from bspump.abc.lookupprovider import LookupBatchProviderABC
+from .client.sessionpool import HTTPClientSessionPool
 
 ###
 
@@ -20,6 +21,7 @@ class HTTPBatchLookupProvider(LookupBatchProviderABC):
 	"""
 	Fetches lookup data from given URL over HTTP. This lookupprovider embeds loading and caching functions of the
 	original bspump.Lookup in "slave" mode.
+	The connection to the lookup master is kept alive between loads.
 	"""
 
 	ConfigDefaults = {
@@ -44,25 +46,28 @@ class HTTPBatchLookupProvider(LookupBatchProviderABC):
 				self.UseCache = False
 				L.warning("No cache path specified. Cache disabled.")
 
+		self.SessionPool = HTTPClientSessionPool(self.App, self.Id, limit=1)
+
 	async def load(self):
 		headers = {}
 		if self.ETag is not None:
 			headers['ETag'] = self.ETag
 
-		async with aiohttp.ClientSession() as session:
-			try:
-				response = await session.get(
-					self.URL,
-					headers=headers,
-					timeout=float(self.Config['master_timeout'])
-				)
-			except aiohttp.ClientConnectorError as e:
-				L.warning("{}: Failed to contact lookup master at '{}': {}".format(self.Id, self.URL, e))
-				return self.load_from_cache()
-			except asyncio.TimeoutError as e:
-				L.warning("{}: Failed to contact lookup master at '{}' (timeout): {}".format(self.Id, self.URL, e))
-				return self.load_from_cache()
-
+		session = self.SessionPool.get()
+		try:
+			response = await session.get(
+				self.URL,
+				headers=headers,
+				timeout=aiohttp.ClientTimeout(total=float(self.Config['master_timeout']))
+			)
+		except aiohttp.ClientConnectorError as e:
+			L.warning("{}: Failed to contact lookup master at '{}': {}".format(self.Id, self.URL, e))
+			return self.load_from_cache()
+		except asyncio.TimeoutError as e:
+			L.warning("{}: Failed to contact lookup master at '{}' (timeout): {}".format(self.Id, self.URL, e))
+			return self.load_from_cache()
+
+		async with response:
 			if response.status == 304:
 				L.info("Lookup '{}' is up to date at {}.".format(self.Id, self.URL))
 				return False
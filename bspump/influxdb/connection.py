@@ -1,4 +1,5 @@
 import asyncio
+import gzip
 import logging
 import re
 import aiohttp
@@ -46,6 +47,15 @@ class InfluxDBConnection(Connection):
 
 	response_codes_to_retry : 404, 502, 503, 504
 
+	compression : '' (lines are sent uncompressed) or gzip
+
+	compression_level : 1 (gzip compression level, 1-9)
+
+	loaders : 1 (number of concurrent writers)
+
+	Lines are collected as bytes in a bucket, that is sent to InfluxDB when it exceeds `output_bucket_max_size` bytes
+	or on the application tick. Each writer keeps its HTTP connection alive between buckets.
+
 	"""
 
 	ConfigDefaults = {
@@ -56,7 +66,10 @@ class InfluxDBConnection(Connection):
 		'output_bucket_max_size': 1000 * 1000,
 		'timeout': 30,
 		'retry_enabled': False,
-		'response_codes_to_retry': '404,502,503,504'
+		'response_codes_to_retry': '404,502,503,504',
+		'compression': '',
+		'compression_level': 1,
+		'loaders': 1,
 	}
 
 	def __init__(self, app, id=None, config=None):
@@ -91,16 +104,26 @@ class InfluxDBConnection(Connection):
 			[int(x) for x in re.findall(r"[0-9]+", self.Config['response_codes_to_retry'])]
 		)
 
+		self._compression = self.Config['compression'].strip().lower()
+		if self._compression not in ('', 'gzip'):
+			raise RuntimeError("Unknown compression '{}'".format(self._compression))
+		self._compression_level = int(self.Config['compression_level'])
+		self._headers = {'Content-Encoding': 'gzip'} if self._compression == 'gzip' else None
+
 		self._output_queue = asyncio.Queue()
 		self._started = True
 
-		self._output_bucket = ""
+		# The bucket is a list of encoded lines, they are joined only once when the bucket is flushed
+		self._output_bucket = []
+		self._output_bucket_size = 0
 
 		self.PubSub = app.PubSub
 		self.PubSub.subscribe("Application.tick!", self._on_tick)
 		self.PubSub.subscribe("Application.exit!", self._on_exit)
 
-		self._future = asyncio.ensure_future(self._loader())
+		self.ProactorService = app.get_service('asab.ProactorService')
+
+		self._futures = [asyncio.ensure_future(self._loader()) for _ in range(max(int(self.Config['loaders']), 1))]
 
 	def consume(self, data):
 		"""
@@ -108,30 +131,37 @@ class InfluxDBConnection(Connection):
 
 		**Parameters**
 
-		data :
+		data : bytes or str
+			Lines in the InfluxDB line protocol, terminated by a new line.
 
 		"""
-		self._output_bucket += data
-		if len(self._output_bucket) > self._output_bucket_max_size:
+		if isinstance(data, str):
+			data = data.encode('utf-8')
+
+		self._output_bucket.append(data)
+		self._output_bucket_size += len(data)
+		if self._output_bucket_size > self._output_bucket_max_size:
 			self.flush()
 
 	async def _on_exit(self, event_name):
-		self._started = False
 		self.flush()
-		await self._output_queue.put(None)  # By sending None via queue, we signalize end of life
-		await self._future  # Wait till the _loader() terminates
+		self._started = False
+		for _ in self._futures:
+			await self._output_queue.put(None)  # By sending None via queue, we signalize end of life
+		await asyncio.wait(self._futures)  # Wait till the _loader()s terminate
 
 	async def _on_tick(self, event_name):
-		if self._started and self._future.done():
-			# Ups, _loader() task crashed during runtime, we need to restart it
-			try:
-				r = self._future.result()
-				# This error should never happen
-				L.error("Influx error observed, returned: '{}' (should be None)".format(r))
-			except Exception as e:
-				L.exception(f"Influx error, {e}, observed, restoring the order")
-
-			self._future = asyncio.ensure_future(self._loader())
+		for i, future in enumerate(self._futures):
+			if self._started and future.done():
+				# Ups, _loader() task crashed during runtime, we need to restart it
+				try:
+					r = future.result()
+					# This error should never happen
+					L.error("Influx error observed, returned: '{}' (should be None)".format(r))
+				except Exception as e:
+					L.exception(f"Influx error, {e}, observed, restoring the order")
+
+				self._futures[i] = asyncio.ensure_future(self._loader())
 		self.flush()
 
 	def flush(self, event_name=None):
@@ -143,19 +173,24 @@ class InfluxDBConnection(Connection):
 		event_name : ?, default = None
 
 		"""
-		if len(self._output_bucket) == 0:
+		if self._output_bucket_size == 0:
 			return
 
-		assert (self._output_bucket is not None)
-		self._output_queue.put_nowait(self._output_bucket)
-		self._output_bucket = ""
+		self._output_queue.put_nowait(b"".join(self._output_bucket))
+		self._output_bucket = []
+		self._output_bucket_size = 0
 
 		if self._output_queue.qsize() == self._output_queue_max_size:
 			self.PubSub.publish("InfluxDBConnection.pause!", self)
 
 	async def _loader(self):
+		# The session keeps the connection alive between buckets
+		async with aiohttp.ClientSession(timeout=self._timeout) as session:
+			await self._load(session)
+
+	async def _load(self, session):
 		# A cycle that regularly sends buckets if there are any
-		while self._started:
+		while True:
 			_output_bucket = await self._output_queue.get()
 			if _output_bucket is None:
 				break
@@ -165,23 +200,27 @@ class InfluxDBConnection(Connection):
 
 			# Sending the data asynchronously
 
+			if self._compression == 'gzip':
+				data = await self.ProactorService.execute(gzip.compress, _output_bucket, self._compression_level)
+			else:
+				data = _output_bucket
+
 			try:
-				async with aiohttp.ClientSession(timeout=self._timeout) as session:
-					async with session.post(self._url_write, data=_output_bucket) as resp:
-						resp_body = await resp.text()
-						if resp.status in self.AllowedBulkResponseCodes and self.RetryEnabled:
-							L.warning(
-								f"Retryable response code recieved, retrying. Queue size {self._output_queue.qsize()}"
-							)
-							self._output_queue.put_nowait(_output_bucket)
-							self.PubSub.publish("InfluxDBConnection.pause!", self)
-							await asyncio.sleep(3)
-							self.PubSub.publish("InfluxDBConnection.unpause!", self)
-
-						elif resp.status is None:
-							L.error(
-								"Failed to insert a line into Influx status:{} body:{}".format(resp.status, resp_body))
-							raise RuntimeError("Failed to insert line into Influx")
+				async with session.post(self._url_write, data=data, headers=self._headers) as resp:
+					resp_body = await resp.text()
+					if resp.status in self.AllowedBulkResponseCodes and self.RetryEnabled:
+						L.warning(
+							f"Retryable response code recieved, retrying. Queue size {self._output_queue.qsize()}"
+						)
+						self._output_queue.put_nowait(_output_bucket)
+						self.PubSub.publish("InfluxDBConnection.pause!", self)
+						await asyncio.sleep(3)
+						self.PubSub.publish("InfluxDBConnection.unpause!", self)
+
+					elif resp.status is None:
+						L.error(
+							"Failed to insert a line into Influx status:{} body:{}".format(resp.status, resp_body))
+						raise RuntimeError("Failed to insert line into Influx")
 
 			# Here we define errors, that we want to retry
 			except OSError:
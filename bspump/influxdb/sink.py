@@ -66,26 +66,47 @@ class InfluxDBSink(Sink):
 
 		"""
 
+		# Passing the processed event to the connection
+		self._connection.consume(self._wire_line(event))
+
+
+	def process_batch(self, context, events):
+		"""
+		Description: Formats all events of the batch and passes them to the connection at once.
+
+		"""
+		# Tuple events, which are the most common, are formatted by a single join
+		if all(type(event) is tuple for event in events):
+			wire_lines = "".join([
+				"{},{} {} {}\n".format(measurement, tag_set, field_set, int(timestamp * 1e9))
+				for measurement, tag_set, field_set, timestamp in events
+			]).encode('utf-8')
+		else:
+			wire_lines = b"".join([self._wire_line(event) for event in events])
+
+		self._connection.consume(wire_lines)
+		return []
+
+
+	def _wire_line(self, event):
 		if isinstance(event, tuple):
 			measurement, tag_set, field_set, timestamp = event
-			wire_line = "{},{} {} {}\n".format(measurement, tag_set, field_set, int(timestamp * 1e9))
+			return "{},{} {} {}\n".format(measurement, tag_set, field_set, int(timestamp * 1e9)).encode('utf-8')
 
 		elif isinstance(event, bytes):
-			wire_line = event.decode('utf-8')
-			if wire_line[-1:] != '\n':
-				wire_line += '\n'
+			# Bytes are passed as they are, without decoding
+			if event[-1:] != b'\n':
+				event += b'\n'
+			return event
 
 		elif isinstance(event, str):
-			wire_line = event
-			if wire_line[-1:] != '\n':
-				wire_line += '\n'
+			if event[-1:] != '\n':
+				event += '\n'
+			return event.encode('utf-8')
 
 		else:
 			raise RuntimeError("Incorrect format")
 
-		# Passing the processed event to the connection
-		self._connection.consume(wire_line)
-
 
 
 	def _connection_throttle(self, event_name, connection):
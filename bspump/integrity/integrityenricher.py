@@ -7,6 +7,7 @@ import base64
 import orjson
 
 from ..abc.processor import Processor
+from ..crypto.offload import OffloadMixin
 
 ###
 
@@ -15,7 +16,7 @@ L = logging.getLogger(__name__)
 ###
 
 
-class IntegrityEnricher(Processor):
+class IntegrityEnricher(Processor, OffloadMixin):
 	"""
 	IntegrityEnricher is a enricher processor, which enriches JSON data
 	by hashed events.
@@ -24,6 +25,13 @@ class IntegrityEnricher(Processor):
 	'SHA256', 'dsaEncryption', 'MD4', 'sha256', 'sha3_512', 'DSA', 'sha3_256', 'sha3_384', 'SHA512', 'md5', 'SHA224',
 	'MD5', 'sha', 'whirlpool', 'ripemd160', 'SHA384', 'ecdsa-with-SHA1', 'RIPEMD160', 'sha1', 'blake2s', 'shake_128',
 	'blake2b', 'sha512', 'sha224', 'md4', 'SHA', 'dsaWithSHA', 'sha384', 'sha3_224', 'shake_256', 'DSA-SHA', 'SHA1'
+
+	Each hash depends on the previous one, so the hash chain cannot be computed in parallel.
+	When `offload_chunk` is set, a batch of events is pipelined instead: the events are serialized in chunks
+	with a placeholder of the previous hash, while the hash chain of the previous chunk is computed in a thread
+	of `asab.ProactorService`. The last chunk is hashed by the calling thread.
+	The result is the same as if the events were processed one by one.
+	`process_batch()` returns when the whole batch is hashed, so it blocks the event loop meanwhile.
 	"""
 
 	ConfigDefaults = {
@@ -41,6 +49,12 @@ class IntegrityEnricher(Processor):
 		self.SaltLength = int(self.Config['salt_length'])
 		self.PreviousHash = None
 
+		self.initialize_offload(app)
+
+		# The previous hash is serialized as a placeholder of the same length and replaced while hashing
+		self.Placeholder = "0" * (hashlib.new(self.Algorithm).digest_size * 2)
+		self.PlaceholderKey = orjson.dumps(self.PrevHashKey) + b':"' + self.Placeholder.encode('ascii') + b'"'
+
 	def process(self, context, event):
 
 		# Check that the event is a dictionary
@@ -72,6 +86,66 @@ class IntegrityEnricher(Processor):
 		return event
 
 
+	def process_batch(self, context, events):
+		if self.OffloadChunk <= 0 or len(events) <= self.OffloadChunk:
+			return [self.process(context, event) for event in events]
+
+		start = 0
+		if self.PreviousHash is None:
+			# The first event of the chain has no previous hash
+			self.process(context, events[0])
+			start = 1
+
+		future = None
+		serialized = None
+		for i in range(start, len(events), self.OffloadChunk):
+			if serialized is not None:
+				if future is not None:
+					future.result()
+				future = self.Executor.submit(self._hash_chain, serialized)
+			serialized = [self._serialize(event) for event in events[i:i + self.OffloadChunk]]
+
+		# The last chunk is hashed inline instead of waiting for the thread
+		if future is not None:
+			future.result()
+		if serialized is not None:
+			self._hash_chain(serialized)
+
+		return events
+
+
+	def _serialize(self, event):
+		assert isinstance(event, dict)
+		event.pop(self.HashKey, None)
+		event["_s"] = secrets.token_urlsafe(self.SaltLength)
+		event[self.PrevHashKey] = self.Placeholder
+
+		data = orjson.dumps(event, option=orjson.OPT_SORT_KEYS)
+		offset = data.find(self.PlaceholderKey)
+		if offset == -1:
+			raise RuntimeError("Cannot locate '{}' in the serialized event".format(self.PrevHashKey))
+
+		# Offset of the placeholder value
+		offset += len(self.PlaceholderKey) - len(self.Placeholder) - 1
+		return event, data, offset
+
+
+	def _hash_chain(self, serialized):
+		# Runs in the thread, chunks are hashed one after another, so the chain is preserved
+		placeholder_length = len(self.Placeholder)
+		for event, data, offset in serialized:
+			data = memoryview(data)
+			h = hashlib.new(self.Algorithm)
+			h.update(data[:offset])
+			h.update(self.PreviousHash.encode('ascii'))
+			h.update(data[offset + placeholder_length:])
+			hash_base64 = h.hexdigest()
+
+			event[self.PrevHashKey] = self.PreviousHash
+			event[self.HashKey] = hash_base64
+			self.PreviousHash = hash_base64
+
+
 def orjson_default(obj):
 	if isinstance(obj, bytes):
 		return base64.b64encode(obj).decode('ascii')
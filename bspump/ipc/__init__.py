@@ -4,6 +4,8 @@ from .datagram import DatagramSource, DatagramSink
 
 from .stream_client_sink import StreamClientSink
 from .stream_server_source import StreamServerSource
+from .protocol import SourceProtocolABC, LineSourceProtocol
+from .framer import FramerABC, DelimiterFramer, NewLineFramer, CRLFFramer, OctetCountingFramer, LengthPrefixFramer
 
 # Backward compatibility
 StreamSource = StreamServerSource
@@ -16,4 +18,12 @@ __all__ = (
 	'StreamClientSink',
 	'StreamSink',
 	'StreamSource',
+	'SourceProtocolABC',
+	'LineSourceProtocol',
+	'FramerABC',
+	'DelimiterFramer',
+	'NewLineFramer',
+	'CRLFFramer',
+	'OctetCountingFramer',
+	'LengthPrefixFramer',
 )
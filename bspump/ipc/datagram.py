@@ -14,7 +14,15 @@ L = logging.getLogger(__name__)
 
 class DatagramSource(Source):
 	"""
-	Description:
+	Description: Receives datagrams (UDP or unix datagram socket) and passes them to the pipeline.
+
+	If `batch_size` is greater than 1, the socket is drained without awaiting until it is empty
+	or `batch_size` datagrams have been received, into a preallocated receive buffer.
+	Consecutive datagrams from the same peer are passed to the pipeline as a batch (see `Pipeline.process_batch()`),
+	so that the context, that contains the peer, stays valid for all events of the batch.
+
+	The socket is bound with `SO_REUSEPORT`, so the load of one address can be spread across CPU cores
+	by running several instances of the application with the same configuration.
 
 	"""
 
@@ -23,6 +31,7 @@ class DatagramSource(Source):
 		'address': '127.0.0.1 8888',  # IPv4, IPv6 or unix socket path
 		'max_packet_size': 64 * 1024,
 		'receiver_buffer_size': 0,
+		'batch_size': 1,  # Maximal number of datagrams received at once, 1 means one by one
 	}
 
 
@@ -67,10 +76,15 @@ class DatagramSource(Source):
 			self.Socket.bind(self.Address)
 
 		self.MaxPacketSize = int(self.Config['max_packet_size'])
+		self.BatchSize = int(self.Config['batch_size'])
+		self.ReceiveBuffer = None
 
 
 	async def main(self):
-		task = asyncio.ensure_future(self._receive())
+		if self.BatchSize > 1:
+			task = asyncio.ensure_future(self._receive_batches())
+		else:
+			task = asyncio.ensure_future(self._receive())
 
 		await self.stopped()
 
@@ -96,6 +110,72 @@ class DatagramSource(Source):
 				raise
 
 
+	async def _receive_batches(self):
+		while True:
+			try:
+				await self.Pipeline.ready()
+				packets = self._drain()
+				if len(packets) == 0:
+					await self._readable()
+					continue
+
+				# Split the packets into batches of consecutive packets from the same peer
+				start = 0
+				for i in range(1, len(packets) + 1):
+					if i == len(packets) or packets[i][1] != packets[start][1]:
+						peer = packets[start][1]
+						if i - start == 1:
+							await self.process(packets[start][0], context={'datagram': peer})
+						else:
+							await self.process_batch([event for event, _ in packets[start:i]], context={'datagram': peer})
+						start = i
+
+			except asyncio.CancelledError:
+				break
+
+			except Exception:
+				L.exception("Error in datagram source.")
+				raise
+
+
+	def _drain(self):
+		"""
+		Description: Receives datagrams from the socket until it is empty or `batch_size` datagrams are received.
+
+		:return: list of `(event, peer)` tuples
+
+		"""
+		if self.ReceiveBuffer is None:
+			self.ReceiveBuffer = memoryview(bytearray(self.MaxPacketSize))
+
+		buffer = self.ReceiveBuffer
+		recvfrom_into = self.Socket.recvfrom_into
+		packets = []
+		while len(packets) < self.BatchSize:
+			try:
+				size, peer = recvfrom_into(buffer)
+			except (BlockingIOError, InterruptedError):
+				break
+			packets.append((bytes(buffer[:size]), peer))
+
+		return packets
+
+
+	async def _readable(self):
+		fileno = self.Socket.fileno()
+		future = self.Loop.create_future()
+		self.Loop.add_reader(fileno, self._on_readable, future)
+		try:
+			await future
+		finally:
+			self.Loop.remove_reader(fileno)
+
+
+	def _on_readable(self, future):
+		if not future.done():
+			future.set_result(None)
+
+
 class DatagramSink(Sink):
 	"""
 	Description:
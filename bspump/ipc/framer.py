@@ -0,0 +1,129 @@
+import struct
+
+
+class FramerABC(object):
+	'''
+	Description: Framer splits a stream of bytes into frames (i.e. messages).
+
+	The `find_frame()` method works with offsets into the receive buffer of the protocol, so that no data are copied
+	until the frame is complete.
+	'''
+
+	def find_frame(self, buffer, start, end):
+		"""
+		Description: Seeks for the next complete frame in `buffer[start:end]`.
+
+		**Parameters**
+
+		buffer : bytearray
+				Receive buffer of the protocol.
+
+		start : int
+				Offset of the first byte, that has not been framed yet.
+
+		end : int
+				Offset after the last received byte.
+
+		:return: Tuple `(frame_start, frame_end, next_start)` or `None` if there is no complete frame in the buffer.
+
+		"""
+		raise NotImplementedError()
+
+
+class DelimiterFramer(FramerABC):
+	'''
+	Description: Frames are separated by a delimiter, e.g. a new line.
+	The delimiter is not part of the frame.
+	'''
+
+	def __init__(self, delimiter=b'\n'):
+		self.Delimiter = delimiter
+		self.DelimiterLength = len(delimiter)
+
+	def find_frame(self, buffer, start, end):
+		pos = buffer.find(self.Delimiter, start, end)
+		if pos == -1:
+			return None
+		return start, pos, pos + self.DelimiterLength
+
+
+class NewLineFramer(DelimiterFramer):
+	'''
+	Description: Frames are separated by a new line (`\\n`).
+	'''
+
+	def __init__(self):
+		super().__init__(b'\n')
+
+
+class CRLFFramer(DelimiterFramer):
+	'''
+	Description: Frames are separated by `\\r\\n`, e.g. in text based protocols like SMTP or HTTP.
+	'''
+
+	def __init__(self):
+		super().__init__(b'\r\n')
+
+
+class OctetCountingFramer(FramerABC):
+	'''
+	Description: Octet-counted framing of syslog over TCP, see RFC 6587, section 3.4.1.
+
+		MSG-LEN SP SYSLOG-MSG
+
+	Frames that do not start with a digit are framed by a new line (non-transparent framing, RFC 6587, section 3.4.2),
+	since many syslog senders use it.
+	'''
+
+	MaxLengthDigits = 10
+
+	def __init__(self):
+		self.Fallback = NewLineFramer()
+
+	def find_frame(self, buffer, start, end):
+		if start == end:
+			return None
+
+		# 0x30 - 0x39 are ASCII digits
+		if not (0x30 <= buffer[start] <= 0x39):
+			return self.Fallback.find_frame(buffer, start, end)
+
+		sp = buffer.find(b' ', start, min(end, start + self.MaxLengthDigits + 1))
+		if sp == -1:
+			if end - start > self.MaxLengthDigits:
+				raise RuntimeError("Invalid octet-counted frame, MSG-LEN is too long")
+			return None
+
+		frame_start = sp + 1
+		frame_end = frame_start + int(buffer[start:sp])
+		if frame_end > end:
+			return None
+		return frame_start, frame_end, frame_end
+
+
+class LengthPrefixFramer(FramerABC):
+	'''
+	Description: Binary frames prefixed by their length, 4 bytes in the network byte order (big-endian) by default.
+	The length prefix is not part of the frame.
+	'''
+
+	def __init__(self, prefix_format='>I'):
+		self.Prefix = struct.Struct(prefix_format)
+
+	def find_frame(self, buffer, start, end):
+		frame_start = start + self.Prefix.size
+		if frame_start > end:
+			return None
+
+		frame_end = frame_start + self.Prefix.unpack_from(buffer, start)[0]
+		if frame_end > end:
+			return None
+		return frame_start, frame_end, frame_end
+
+
+Framers = {
+	'newline': NewLineFramer,
+	'crlf': CRLFFramer,
+	'octet-counting': OctetCountingFramer,
+	'length-prefix': LengthPrefixFramer,
+}
@@ -1,5 +1,7 @@
 import codecs
 
+from .framer import Framers
+
 
 class SourceProtocolABC(object):
 	'''
@@ -28,7 +30,16 @@ class SourceProtocolABC(object):
 
 class LineSourceProtocol(SourceProtocolABC):
 	'''
-	Description: Basically readline() for reading lines from a socket.
+	Description: Basically readline() for reading lines (or other frames) from a socket.
+
+	Frames are found by a framer (see `bspump.ipc.framer`), selected by the `framing` option of the source:
+	`newline` (default), `crlf`, `octet-counting` (syslog, RFC 6587) or `length-prefix` (4-byte big-endian length).
+	A custom framer can be assigned to `self.Framer` in a subclass.
+
+	Data are received into a single buffer, that is compacted in place when it gets full and grown only if a frame
+	does not fit into it (up to `max_frame_size`).
+	If the `batch` option is enabled, all complete frames from one receive are passed to the pipeline as a batch.
+	Events of the batch share one context, so processors that write the context per event should not follow.
 	'''
 
 	def __init__(self, app, pipeline, config):
@@ -39,9 +50,15 @@ class LineSourceProtocol(SourceProtocolABC):
 		"""
 		super().__init__(app, pipeline, config)
 
-		# TODO: All following values could be read from configuration
-		self.EOL = b'\n'
-		self.SaneBufferSize = 64 * 1024  # The maximum buffer size considered as sane
+		framing = config['framing']
+		framer_class = Framers.get(framing)
+		if framer_class is None:
+			raise RuntimeError("Unknown framing '{}'".format(framing))
+		self.Framer = framer_class()
+
+		self.BufferSize = int(config['buffer_size'])
+		self.SaneBufferSize = int(config['max_frame_size'])  # The maximum buffer size considered as sane
+		self.Batch = config.getboolean('batch')
 
 		# Line decoder
 		decode_codec = config['decode']
@@ -60,52 +77,64 @@ class LineSourceProtocol(SourceProtocolABC):
 
 		"""
 		pipeline = source.Pipeline
+		find_frame = self.Framer.find_frame
 
-		input_buffer = bytearray(b' ' * 8)
+		input_buffer = bytearray(self.BufferSize)
 		input_buffer_mv = memoryview(input_buffer)
-		input_buffer_pos = 0
-		last_eol_pos = 0
+		start = 0  # Offset of the first byte, that has not been framed yet
+		end = 0  # Offset after the last received byte
 
 		while True:
-			recv_bytes = await stream.recv_into(input_buffer_mv[input_buffer_pos:])
+			if end == len(input_buffer):
+				if start > 0:
+					# Move the incomplete frame to the beginning of the buffer
+					input_buffer_mv[:end - start] = input_buffer_mv[start:end]
+					end -= start
+					start = 0
+				else:
+					# Grow the input_buffer, if the incomplete frame fills it completely
+					if len(input_buffer) >= self.SaneBufferSize:
+						raise RuntimeError("Insane buffer size requested")
+					new_input_buffer = bytearray(min(len(input_buffer) * 2, self.SaneBufferSize))
+					new_input_buffer_mv = memoryview(new_input_buffer)
+					new_input_buffer_mv[:end] = input_buffer_mv[:end]  # Copy the content of the old buffer
+					input_buffer, input_buffer_mv = new_input_buffer, new_input_buffer_mv
+
+			recv_bytes = await stream.recv_into(input_buffer_mv[end:])
 			if recv_bytes <= 0:
 				# Client closed the connection
 				if recv_bytes < 0:
 					raise RuntimeError("Client sock_recv_into returned {}".format(recv_bytes))
 				return
 
-			input_buffer_pos += recv_bytes
-			if len(input_buffer) == input_buffer_pos:
-				if len(input_buffer) > self.SaneBufferSize:
-					raise RuntimeError("Insane buffer size requested")
-				# Grow the input_buffer if the size touches the top
-				new_input_buffer = bytearray(b' ' * (len(input_buffer) * 2))
-				input_buffer_mv = memoryview(new_input_buffer)
-				input_buffer_mv[:len(input_buffer)] = input_buffer  # Copy the content of the old buffer
-				input_buffer = new_input_buffer
-
-			while last_eol_pos < input_buffer_pos:
-				# Seek for end of line symbol in the buffer
-				eol_pos = input_buffer[:input_buffer_pos].find(self.EOL, last_eol_pos)
-				if eol_pos == -1:
+			end += recv_bytes
+
+			lines = []
+			while True:
+				frame = find_frame(input_buffer, start, end)
+				if frame is None:
 					break
+				frame_start, frame_end, start = frame
+				lines.append(self.LineDecoder(
+					line_bytes=input_buffer_mv[frame_start:frame_end]
+				))
 
-				line = self.LineDecoder(
-					line_bytes=input_buffer[last_eol_pos:eol_pos]
-				)
-				last_eol_pos = eol_pos + 1
+			if start == end:
+				start = 0
+				end = 0
 
-				await pipeline.ready()
-				await source.process(line, context=context.copy())
-
-			# TODO: HIGH PRIORITY This definitively doesn't cover all possible cases
+			if len(lines) == 0:
+				continue
 
-			# If the '\n' is at the end of the buffer, reset the buffer position
-			if last_eol_pos == input_buffer_pos:
-				input_buffer_pos = 0
-				last_eol_pos = 0
+			if self.Batch and len(lines) > 1:
+				await pipeline.ready()
+				await source.process_batch(lines, context=context.copy())
 				continue
 
+			for line in lines:
+				await pipeline.ready()
+				await source.process(line, context=context.copy())
+
 	def _line_codec_decoder(self, line_bytes):
 		line, _ = self.Codec.decode(
 			line_bytes
@@ -113,4 +142,4 @@ class LineSourceProtocol(SourceProtocolABC):
 		return line
 
 	def _line_bytes_decoder(self, line_bytes):
-		return line_bytes
+		return bytes(line_bytes)
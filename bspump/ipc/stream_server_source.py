@@ -29,6 +29,12 @@ class StreamServerSource(Source):
 		# An encoding a line is going to be decoded from
 		# - Pass '' (empty string) to prevent decoding
 		'decode': 'utf-8',
+
+		# Framing of messages in the stream: 'newline', 'crlf', 'octet-counting' (syslog, RFC 6587) or 'length-prefix'
+		'framing': 'newline',
+		'buffer_size': 64 * 1024,  # The initial size of the receive buffer of a connection
+		'max_frame_size': 1024 * 1024,  # The maximum size of a frame, the connection is closed when exceeded
+		'batch': 'no',  # Emit all frames received at once as a batch sharing one context (see `Pipeline.process_batch()`)
 	}
 
 	def __init__(self, app, pipeline, id=None, config=None, protocol_class=LineSourceProtocol):
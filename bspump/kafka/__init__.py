@@ -1,6 +1,7 @@
 from .connection import KafkaConnection
 from .source import KafkaSource
 from .sink import KafkaSink
+from .batchsink import KafkaBatchSink
 from .keyfilter import KafkaKeyFilter
 from .topic_initializer import KafkaTopicInitializer
 
@@ -8,6 +9,7 @@ __all__ = [
 	"KafkaConnection",
 	"KafkaSource",
 	"KafkaSink",
+	"KafkaBatchSink",
 	"KafkaKeyFilter",
 	"KafkaTopicInitializer",
 ]
@@ -1,105 +1,212 @@
 import json
-import typing
+import logging
 
-import asyncio
+import asab
 
 from .sink import KafkaSink
 
+#
 
-class KafkaBatchSink(KafkaSink):
-	"""
-	KafkaBatchSink is a sink processor that forwards the event to
-	an Apache Kafka specified by a KafkaConnection object in batches.
+L = logging.getLogger(__name__)
 
-	It is a proof of concept sink, that allows faster processing of events in the pipeline,
-	but does not guarantee processing of all events in situations when the pump is closed etc.
+#
 
-	There is a work to be done with cooperation with aiokafka, so the send_and_wait method works
-	properly and is able to send events in batches.
-	"""
 
-	ConfigDefaults = {
-		"batch_size": 10000,
-	}
+class KafkaBatchSink(KafkaSink):
+	"""
+	Description: KafkaBatchSink is a sink processor that forwards events to an Apache Kafka
+	specified by a KafkaConnection object in batches.
 
-	def __init__(self, app, pipeline, connection, key_serializer=None, id=None, config=None):
-		"""
-		Initializing parameters passed to the BatchSink class.
+	Events passed by `process()` are serialized (dictionaries to JSON, strings by `encoding`) and collected in a buffer.
+	The buffer is produced in a tight loop, when it contains `buffer.messages` messages or `buffer.bytes` bytes,
+	or `buffer.linger` seconds after its first message. Batches passed by `process_batch()` are produced at once.
+	Delivery reports are drained by `poll(0)` after each produced batch, failed deliveries are counted in the `kafka.sink` metric.
 
-		**Parameters**
+	The pipeline is throttled, when the queue of librdkafka is longer than `watermark.high` messages or when it is full,
+	and released, when it drops below `watermark.low`. Messages that do not fit into the full queue stay in the buffer.
 
-		app : Application
-			Name of the `Application <https://asab.readthedocs.io/en/latest/asab/application.html#>`_.
+	The batching of librdkafka is tuned by `linger.ms`, `batch.size`, `batch.num.messages` and `compression.type`.
 
-		pipeline : Pipeline
-			Name of the Pipeline.
+	"""
 
-		connection : Connection
-			Information needed to creates connection.
+	ConfigDefaults = {
+		"buffer.messages": "10000",  # Number of messages in the buffer that triggers produce
+		"buffer.bytes": "1000000",  # Size of the buffer in bytes that triggers produce
+		"buffer.linger": "0.05",  # Seconds after which the buffer is produced
+		"encoding": "utf-8",
+		"compression.type": "lz4",
+		"delivery.report.only.error": "true",  # Avoid a Python callback for every delivered message
+	}
 
-		key_serializer :  ,default None
+	SinkOptions = KafkaSink.SinkOptions + ("buffer.messages", "buffer.bytes", "buffer.linger", "encoding")
+
+
+	def __init__(self, app, pipeline, connection, id=None, config=None):
+		super().__init__(app, pipeline, connection, id=id, config=config)
+
+		self.Loop = app.Loop
+		self.BufferMessages = int(self.Config["buffer.messages"])
+		self.BufferBytes = int(self.Config["buffer.bytes"])
+		self.BufferLinger = float(self.Config["buffer.linger"])
+		self.Encoding = self.Config["encoding"]
+
+		# Buffered messages (topic, value, key, headers)
+		self.Buffer = []
+		self.BufferSize = 0
+		self.LingerHandle = None
+		self.ThrottleHandle = None
+		self.DeliveryErrors = 0
+		self.LastDeliveryError = None
+
+		metrics_service = app.get_service('asab.MetricsService')
+		self.Counter = metrics_service.create_counter(
+			"kafka.sink",
+			tags={
+				'pipeline': pipeline.Id,
+				'sink': self.Id,
+			},
+			init_values={
+				'produced': 0,
+				'failed': 0,
+				'batches': 0,
+			}
+		)
+
+
+	def create_producer(self, producer_config):
+		producer_config["on_delivery"] = self._on_delivery
+		# The Python client requires bool
+		producer_config["delivery.report.only.error"] = \
+			str(producer_config.get("delivery.report.only.error")).lower() in ("true", "yes", "1")
+		return super().create_producer(producer_config)
+
+
+	def _on_delivery(self, error, message):
+		if error is not None:
+			self.Counter.add('failed', 1)
+			# Reported on the tick, so that the log is not flooded
+			self.DeliveryErrors += 1
+			self.LastDeliveryError = (message.topic(), error)
+
+
+	def serialize(self, event):
+		if isinstance(event, bytes):
+			return event
+		if isinstance(event, dict):
+			return json.dumps(event).encode(self.Encoding)
+		if isinstance(event, str):
+			return event.encode(self.Encoding)
+		raise TypeError("Only bytes, str or dict allowed, {} supplied".format(type(event)))
+
+
+	def process(self, context, event):
+		value = self.serialize(event)
+		self.Buffer.append((
+			context["kafka_topic"] if "kafka_topic" in context else self.Topic,
+			value,
+			context["kafka_key"] if "kafka_key" in context else None,
+			context["kafka_headers"] if "kafka_headers" in context else None,
+		))
+		self.BufferSize += len(value)
+
+		if len(self.Buffer) >= self.BufferMessages or self.BufferSize >= self.BufferBytes:
+			self._flush_buffer()
+		elif self.LingerHandle is None:
+			self.LingerHandle = self.Loop.call_later(self.BufferLinger, self._on_linger)
+
+
+	def process_batch(self, context, events):
+		topic = context["kafka_topic"] if "kafka_topic" in context else self.Topic
+		key = context["kafka_key"] if "kafka_key" in context else None
+		headers = context["kafka_headers"] if "kafka_headers" in context else None
+
+		serialize = self.serialize
+		self.Buffer.extend([(topic, serialize(event), key, headers) for event in events])
+		self._flush_buffer()
+		return []
+
+
+	def _on_linger(self):
+		self.LingerHandle = None
+		self._flush_buffer()
+
+
+	def _flush_buffer(self):
+		if self.LingerHandle is not None:
+			self.LingerHandle.cancel()
+			self.LingerHandle = None
+
+		buffer = self.Buffer
+		if len(buffer) == 0:
+			return
+
+		produce = self.Producer.produce
+		produced = 0
+		while produced < len(buffer):
+			topic, value, key, headers = buffer[produced]
+			try:
+				produce(topic, value=value, key=key, headers=headers)
+			except BufferError:
+				# The queue of librdkafka is full, the rest of the buffer is produced later
+				break
+			except Exception as e:
+				self.Counter.add('failed', 1)
+				L.exception("Error occurred when sending data to Kafka: '{}'".format(e))
+			produced += 1
+
+		self.Counter.add('produced', produced)
+		self.Counter.add('batches', 1)
+
+		if produced == len(buffer):
+			self.Buffer = []
+			self.BufferSize = 0
+		else:
+			self.Buffer = buffer[produced:]
+			self.BufferSize = sum(len(message[1]) for message in self.Buffer)
+
+		# Serve delivery reports
+		self.Producer.poll(0)
+
+		if not self.IsThrottling and (len(self.Buffer) > 0 or len(self.Producer) > self.HighWatermark):
+			self.IsThrottling = True
+			self.Pipeline.throttle(self, True)
 
-		id :  , default = None
+		if self.IsThrottling and self.ThrottleHandle is None:
+			self.ThrottleHandle = self.Loop.call_later(self.PollTimeout, self._on_throttle_check)
 
-		config : JSON, default = None
-			Configuration file with additional information.
 
-		"""
-		super().__init__(app, pipeline, connection, key_serializer, id, config)
-		self._batch_size = int(self.Config["batch_size"])
-		self._throttled = False
+	def _on_throttle_check(self):
+		self.ThrottleHandle = None
+		self._flush_buffer()
+		self.Producer.poll(0)
 
-	def process(self, context, event: typing.Union[dict, str, bytes]):
-		"""
-		Starts the sink process.
+		if self.IsThrottling and len(self.Buffer) == 0 and len(self.Producer) < self.LowWatermark:
+			self.IsThrottling = False
+			self.Pipeline.throttle(self, False)
 
-		**Parameters**
+		elif self.IsThrottling and self.ThrottleHandle is None:
+			self.ThrottleHandle = self.Loop.call_later(self.PollTimeout, self._on_throttle_check)
 
-		context : type?
-			Additional information.
 
-		event: typing.Union[dict, str, bytes] : type?
+	@asab.subscribe("Application.tick!")
+	async def _on_tick(self, event_name):
+		self.Producer.poll(0)
 
-		"""
-		if type(event) == dict:
-			event = json.dumps(event)
-			event = event.encode(self.Encoding)
-		elif type(event) == str:
-			event = event.encode(self.Encoding)
-		kafka_topic = context.get("kafka_topic", self.Topic)
-		kafka_key = context.get("kafka_key")
+		if self.DeliveryErrors > 0:
+			L.warning("Failed to deliver {} messages to Kafka, last to topic '{}': {}".format(
+				self.DeliveryErrors, *self.LastDeliveryError
+			))
+			self.DeliveryErrors = 0
 
-		if self._key_serializer is not None and kafka_key is not None:
-			kafka_key = self._key_serializer(kafka_key)
 
-		self._output_queue.put_nowait((kafka_topic, event, kafka_key))
+	@asab.subscribe("Application.exit!")
+	async def _on_exit(self, event_name):
+		self._flush_buffer()
+		if self.ThrottleHandle is not None:
+			self.ThrottleHandle.cancel()
+			self.ThrottleHandle = None
 
-		if not self._throttled and self._output_queue.qsize() >= self._output_queue_max_size:
-			self.Pipeline.throttle(self, True)
-			self._throttled = True
-
-	async def _connection(self):
-		producer = await self.Connection.create_producer(**self._producer_params)
-		try:
-			await producer.start()
-			while True:
-				futures = []
-				iterations = 0
-				while iterations < self._batch_size:
-					iterations = iterations + 1
-					topic, message, kafka_key = await self._output_queue.get()
-
-					if topic is None and message is None:
-						continue
-					future = await producer.send(topic, message, key=kafka_key)
-					futures.append(future)
-
-					if self._throttled and self._output_queue.qsize() < self._output_queue_max_size:
-						self.Pipeline.throttle(self, False)
-						self._throttled = False
-
-				if futures:
-					await asyncio.gather(*futures)
-
-		finally:
-			await producer.stop()
+		# Wait for the delivery of queued messages
+		remaining = await self.ProactorService.execute(self.Producer.flush, self.PollTimeout * 10)
+		if remaining > 0:
+			L.warning("{} messages were not delivered to Kafka".format(remaining))
@@ -71,6 +71,9 @@ class KafkaSink(Sink):
 		# "compression.type": "snappy",
 	}
 
+	# Options that are not passed to the producer
+	SinkOptions = ("topic", "poll.timeout")
+
 
 	def __init__(self, app, pipeline, connection, id=None, config=None):
 		super().__init__(app, pipeline, id=id, config=config)
@@ -83,15 +86,15 @@ class KafkaSink(Sink):
 		for key, value in connection.Config.items():
 			producer_config[key.replace("_", ".")] = value
 
-		# Copy configuration options, avoid the topic, watermark and poll.timeout params
+		# Copy configuration options, avoid options of the sink itself
 		for key, value in self.Config.items():
 
-			if key == "topic" or key.startswith("watermark") or key == 'poll.timeout':
+			if key in self.SinkOptions or key.startswith("watermark"):
 				continue
 
 			producer_config[key.replace("_", ".")] = value
 
-		self.Producer = confluent_kafka.Producer(producer_config, logger=L)
+		self.Producer = self.create_producer(producer_config)
 
 		self.Topic = self.Config["topic"]
 		self.LowWatermark = int(self.Config["watermark.low"])
@@ -104,6 +107,10 @@ class KafkaSink(Sink):
 		app.PubSub.subscribe_all(self)
 
 
+	def create_producer(self, producer_config):
+		return confluent_kafka.Producer(producer_config, logger=L)
+
+
 	@asab.subscribe("Application.tick!")
 	async def _on_tick(self, event_name):
 		if self.IsThrottling and (len(self.Producer) < self.LowWatermark):
@@ -128,3 +135,22 @@ class KafkaSink(Sink):
 		if not self.IsThrottling and (len(self.Producer) > self.HighWatermark):
 			self.IsThrottling = True
 			self.Pipeline.throttle(self, True)
+
+
+	def process_batch(self, context, events):
+		topic = context["kafka_topic"] if "kafka_topic" in context else self.Topic
+		key = context["kafka_key"] if "kafka_key" in context else None
+		headers = context["kafka_headers"] if "kafka_headers" in context else None
+
+		produce = self.Producer.produce
+		for event in events:
+			try:
+				produce(topic, value=event, key=key, headers=headers)
+			except Exception as e:
+				L.exception("Error occurred when sending data to Kafka: '{}'".format(e))
+
+		if not self.IsThrottling and (len(self.Producer) > self.HighWatermark):
+			self.IsThrottling = True
+			self.Pipeline.throttle(self, True)
+
+		return []
@@ -1,5 +1,7 @@
 import asyncio
+import concurrent.futures
 import logging
+import threading
 
 import confluent_kafka
 
@@ -40,6 +42,16 @@ class KafkaSource(Source):
 	Otherwise, the session_timeout_ms should be raised to prevent Kafka from disconnecting the consumer
 	from the partition, thus causing rebalance.
 
+	When `batch_size` is set, messages are consumed in batches and passed to the pipeline via `process_batch()`.
+	Each batch contains consecutive messages from a single topic and partition, that are stored in the context
+	(`_kafka_topic`, `_kafka_partition` and `_kafka_offset` of the first message of the batch).
+	Message keys and headers are not available in the batch mode.
+
+	When `consumer_thread` is enabled, `Consumer.consume()` is called on a dedicated thread, so that the event loop
+	is never blocked by waiting for messages. Consumed messages are handed to the pipeline through a bounded queue
+	of `queue_size` batches. When the pipeline is throttled, the queue fills up and the consumer thread waits.
+	If `enable.auto.commit` is disabled, offsets are committed after each batch of messages has been processed.
+
 	Standard Kafka configuration options can be used,
 	as specified in librdkafka library,
 	where the options are simply passed to:
@@ -50,6 +62,11 @@ class KafkaSource(Source):
 	ConfigDefaults = {
 		"topic": "unconfigured",
 		"refresh_topics": 0,
+		"batch_size": 0,  # The maximum number of messages passed to the pipeline at once, 0 means message by message
+		"consumer_thread": "no",  # Consume messages on a dedicated thread instead of the event loop
+		"consume_messages": 1000,  # The maximum number of messages returned by one Consumer.consume() call on the thread
+		"consume_timeout": 1.0,  # The timeout of Consumer.consume() on the thread in seconds
+		"queue_size": 10,  # The number of consumed message lists waiting for the pipeline
 		"enable.auto.commit": "true",
 		"auto.commit.interval.ms": "1000",
 		"auto.offset.reset": "smallest",
@@ -84,6 +101,10 @@ class KafkaSource(Source):
 		self.ConsumerConfig = {}
 
 		self.SpecialKeys = frozenset(["oauth_cb"])
+		self.NonKafkaKeys = frozenset([
+			"topic", "refresh_topics", "batch_size",
+			"consumer_thread", "consume_messages", "consume_timeout", "queue_size",
+		])
 
 		# Copy connection options
 		for key, value in self.Connection.Config.items():
@@ -97,7 +118,7 @@ class KafkaSource(Source):
 		# Copy configuration options, avoid the topic
 		for key, value in self.Config.items():
 
-			if key == "topic" or key == "refresh_topics":
+			if key in self.NonKafkaKeys:
 				continue
 
 			if key in self.SpecialKeys:
@@ -121,9 +142,21 @@ class KafkaSource(Source):
 		self.RefreshTopics = int(self.Config["refresh_topics"])
 		self.LastRefreshTopicsTime = self.App.time()
 
+		self.BatchSize = int(self.Config["batch_size"])
+
+		self.ConsumerThread = self.Config.getboolean("consumer_thread")
+		self.ConsumeMessages = int(self.Config["consume_messages"])
+		self.ConsumeTimeout = float(self.Config["consume_timeout"])
+		self.QueueSize = int(self.Config["queue_size"])
+		self.ManualCommit = not self.Config.getboolean("enable.auto.commit")
+
 
 	async def main(self):
 
+		if self.ConsumerThread:
+			await self._main_threaded()
+			return
+
 		while self.Running:
 
 			try:
@@ -149,6 +182,15 @@ class KafkaSource(Source):
 						self.LastRefreshTopicsTime = current_time
 						break
 
+					if self.BatchSize > 0:
+						messages = c.consume(self.BatchSize, 0.2)
+						if len(messages) == 0:
+							await asyncio.sleep(self.Sleep)
+							continue
+
+						await self.process_messages(messages)
+						continue
+
 					m = c.poll(0.2)
 
 					if m is None:
@@ -160,13 +202,7 @@ class KafkaSource(Source):
 						await asyncio.sleep(self.Sleep)
 						continue
 
-					await self.process(m.value(), context={
-						"kafka_key": m.key(),
-						"kafka_headers": m.headers(),
-						"_kafka_topic": m.topic(),
-						"_kafka_partition": m.partition(),
-						"_kafka_offset": m.offset(),
-					})
+					await self.process_message(m)
 
 			except asyncio.CancelledError:
 				self.Running = False
@@ -174,3 +210,186 @@ class KafkaSource(Source):
 			except BaseException as e:
 				L.exception("Error when processing Kafka message")
 				self.Pipeline.set_error(None, None, e)
+
+
+	async def process_message(self, m):
+		"""
+		Passes a single consumed message to the pipeline.
+
+		**Parameters**
+
+		m : Message
+				Message returned by `Consumer.poll()` or `Consumer.consume()`.
+
+		"""
+		await self.process(m.value(), context={
+			"kafka_key": m.key(),
+			"kafka_headers": m.headers(),
+			"_kafka_topic": m.topic(),
+			"_kafka_partition": m.partition(),
+			"_kafka_offset": m.offset(),
+		})
+
+
+	async def process_messages(self, messages):
+		"""
+		Passes consumed messages to the pipeline in batches of consecutive messages from the same topic and partition.
+
+		**Parameters**
+
+		messages : list
+				List of messages returned by `Consumer.consume()`.
+
+		"""
+		batch = []
+		batch_context = None
+
+		for m in messages:
+			if m.error():
+				L.error("The following error occured while polling for messages: '{}'.".format(m.error()))
+				continue
+
+			# The batch is passed on, when it is full or the next message is from another partition
+			partition = (m.topic(), m.partition())
+			if batch_context is not None and (len(batch) >= self.BatchSize or (batch_context["_kafka_topic"], batch_context["_kafka_partition"]) != partition):
+				await self.process_batch(batch, context=batch_context)
+				batch = []
+				batch_context = None
+
+			if batch_context is None:
+				batch_context = {
+					"_kafka_topic": m.topic(),
+					"_kafka_partition": m.partition(),
+					"_kafka_offset": m.offset(),
+				}
+
+			batch.append(m.value())
+
+		if len(batch) > 0:
+			await self.process_batch(batch, context=batch_context)
+
+
+	async def _main_threaded(self):
+		"""
+		Processes messages consumed by `_consume_thread()`.
+		After an error, the consumer and its thread are created again, as in `main()`.
+
+		"""
+		while self.Running:
+
+			try:
+				c = confluent_kafka.Consumer(self.ConsumerConfig, logger=L)
+
+			except BaseException as e:
+				L.exception("Error when connecting to Kafka")
+				self.Pipeline.set_error(None, None, e)
+				return
+
+			c.subscribe(self.Subscribe)
+
+			queue = asyncio.Queue(maxsize=self.QueueSize)
+			stop = threading.Event()
+			thread = threading.Thread(
+				target=self._consume_thread,
+				args=(c, queue, stop),
+				name="KafkaSource:{}".format(self.Id),
+				daemon=True,
+			)
+			thread.start()
+
+			try:
+				while True:
+					await self.Pipeline.ready()
+
+					messages = await queue.get()
+					if isinstance(messages, BaseException):
+						raise messages
+
+					if self.BatchSize > 0:
+						await self.process_messages(messages)
+					else:
+						for m in messages:
+							if m.error():
+								L.error("The following error occured while polling for messages: '{}'.".format(m.error()))
+								continue
+							await self.process_message(m)
+
+					if self.ManualCommit:
+						self._commit(c, messages)
+
+			except asyncio.CancelledError:
+				self.Running = False
+
+			except BaseException as e:
+				L.exception("Error when processing Kafka message")
+				self.Pipeline.set_error(None, None, e)
+
+			finally:
+				stop.set()
+				# Release the consumer thread, if it waits for a free slot in the queue
+				while not queue.empty():
+					queue.get_nowait()
+				await self.App.Loop.run_in_executor(None, thread.join)
+
+
+	def _consume_thread(self, c, queue, stop):
+		"""
+		Consumes messages on a dedicated thread and puts them to the queue.
+		The thread waits when the queue is full, hence it is throttled together with the pipeline.
+
+		"""
+		try:
+			while not stop.is_set():
+				current_time = self.App.time()
+				if self.RefreshTopics > 0 and current_time > self.LastRefreshTopicsTime + self.RefreshTopics:
+					L.info("Topics refreshed in '{}'.".format(self.Id))
+					c.subscribe(self.Subscribe)
+					self.LastRefreshTopicsTime = current_time
+
+				try:
+					messages = c.consume(self.ConsumeMessages, self.ConsumeTimeout)
+				except BaseException as e:
+					self._put_threadsafe(queue, stop, e)
+					return
+
+				if len(messages) == 0:
+					continue
+
+				self._put_threadsafe(queue, stop, messages)
+
+		finally:
+			c.close()
+
+
+	def _put_threadsafe(self, queue, stop, item):
+		future = asyncio.run_coroutine_threadsafe(queue.put(item), self.App.Loop)
+		while not stop.is_set():
+			try:
+				future.result(timeout=1.0)
+				return
+			except concurrent.futures.TimeoutError:
+				continue
+		future.cancel()
+
+
+	def _commit(self, c, messages):
+		"""
+		Commits offsets of processed messages, i.e. the highest offset + 1 for each partition.
+
+		"""
+		offsets = {}
+		for m in messages:
+			if m.error():
+				continue
+			key = (m.topic(), m.partition())
+			offset = m.offset() + 1
+			if offset > offsets.get(key, -1):
+				offsets[key] = offset
+
+		if len(offsets) == 0:
+			return
+
+		c.commit(
+			offsets=[confluent_kafka.TopicPartition(topic, partition, offset) for (topic, partition), offset in offsets.items()],
+			asynchronous=True,
+		)
@@ -1,6 +1,10 @@
-import logging
 import csv
 import ipaddress
+import json
+import logging
+import os
+
+import numpy as np
 
 from bspump.abc.lookup import DictionaryLookup
 
@@ -22,18 +26,31 @@ Free versions: IP2LOCATION-LITE-DB5.IPV6.CSV and IP2LOCATION-LITE-DB5.IPV4.CSV
 For better precision visit https://lite.ip2location.com to buy a commercial version of database.
 
 Usage: specify in configuration the path to the database in csv format.
+
+IP ranges are kept in sorted numpy arrays and searched by `np.searchsorted()`,
+locations are deduplicated and referenced by an index.
+IPv6 addresses are stored as pairs of 64-bit integers (`IP6DType`).
+The database is parsed in a thread. If `cache_path` is specified, the parsed database is saved to this directory
+and memory mapped on the next start, as long as the CSV file has not been changed.
 '''
 
 
 	ConfigDefaults = {
 		'path': '',
 		'ipv4mapped': 'no',  # IPv4-mapped IPv6 address (enables to use IPv6 lookups for IPv4 addresses)
+		'cache_path': '',  # Directory for the binary cache of the parsed database
 	}
 
+	IP6DType = np.dtype([('hi', 'u8'), ('lo', 'u8')])
+	IP4MappedOffset = 281470681743360  # ::ffff:0.0.0.0
+
 	def __init__(self, app, id=None, config=None):
 		super().__init__(app, id=id, config=config)
-		self.TreeRoot = None
-		self.Locations = {}
+		self.Starts = None
+		self.Ends = None
+		self.LocationIndexes = None
+		self.Locations = []
+		self.CachePath = self.Config['cache_path']
 		if self.Config['ipv4mapped'].lower() == 'yes':
 			self.IP4Mapped = True
 		else:
@@ -45,118 +62,253 @@ Usage: specify in configuration the path to the database in csv format.
 		if fname == '':
 			return
 
-		with open(fname, 'r') as f:
-			array = []
+		starts, ends, location_indexes, locations = await self.Loop.run_in_executor(None, self._load, fname)
+		self.set(starts, ends, location_indexes, locations)
+		L.debug("IPGeoLookup {} was successfully created".format(self.Id))
+		return True
+
+
+	def set(self, starts, ends, location_indexes, locations):
+		'''
+		Sets sorted arrays of range `starts` and `ends`, `location_indexes` into the list of `locations` for each range.
+		'''
+		self.Starts = starts
+		self.Ends = ends
+		self.LocationIndexes = location_indexes
+		self.Locations = locations
+
+	# REST
+
+	def rest_get(self):
+		rest = super().rest_get()
+		rest["Ranges"] = len(self.Starts) if self.Starts is not None else 0
+		rest["Locations"] = len(self.Locations)
+		rest["IP4Mapped"] = self.IP4Mapped
+		return rest
+
+	# Loading
 
+	def _load(self, fname):
+		if len(self.CachePath) > 0:
+			try:
+				return self._load_cache(fname)
+			except FileNotFoundError:
+				pass
+			except Exception as e:
+				L.warning("Failed to load IPGeoLookup cache from '{}': {}".format(self.CachePath, e))
+
+		result = self._parse_csv(fname)
+
+		if len(self.CachePath) > 0:
+			try:
+				self._save_cache(fname, *result)
+			except Exception as e:
+				L.warning("Failed to save IPGeoLookup cache to '{}': {}".format(self.CachePath, e))
+
+		return result
+
+
+	def _parse_csv(self, fname):
+		starts = []
+		ends = []
+		location_indexes = []
+		locations = []
+		location_map = {}
+
+		with open(fname, 'r') as f:
 			for line in csv.reader(f, delimiter=","):
-				ip_int_address_start = int(line[0])
-				ip_int_address_end = int(line[1])
-				array.append(ip_int_address_start)
-				array.append(ip_int_address_end)
 				lat = float(line[6])
 				lon = float(line[7])
+				location_key = (line[2], line[4], line[5], lat, lon)
 
-				if (lat == 0.0) or (lon == 0.0):
-					d = {'lat': None, 'lon': None}
-				else:
-					d = {'lat': lat, 'lon': lon}
+				index = location_map.get(location_key)
+				if index is None:
+					if (lat == 0.0) or (lon == 0.0):
+						d = {'lat': None, 'lon': None}
+					else:
+						d = {'lat': lat, 'lon': lon}
 
-				if line[2] != '-':
-					d['country'] = line[2]
-				if line[4] != '-':
-					d['region'] = line[4]
-				if line[5] != '-':
-					d['city'] = line[5]
+					if line[2] != '-':
+						d['country'] = line[2]
+					if line[4] != '-':
+						d['region'] = line[4]
+					if line[5] != '-':
+						d['city'] = line[5]
 
-				self.Locations[ip_int_address_start] = d
-				self.Locations[ip_int_address_end] = d
+					index = len(locations)
+					locations.append(d)
+					location_map[location_key] = index
 
-		self.TreeRoot = self.sorted_array_to_bst(array)
-		del array
-		L.debug("IPGeoLookup {} was successfully created".format(self.Id))
-		return True
+				starts.append(int(line[0]))
+				ends.append(int(line[1]))
+				location_indexes.append(index)
 
-	def set(self, tree):
-		self.TreeRoot = tree
+		wide = len(ends) > 0 and max(ends) >= (1 << 64)
+		starts = self._to_array(starts, wide)
+		ends = self._to_array(ends, wide)
+		location_indexes = np.array(location_indexes, dtype='i4')
 
-	# REST
+		order = np.argsort(starts, kind='stable')
+		return starts[order], ends[order], location_indexes[order], locations
 
-	def rest_get(self):
-		rest = super().rest_get()
-		rest["TreeRoot"] = self.TreeRoot
-		rest["Locations"] = self.Locations
-		rest["IP4Mapped"] = self.IP4Mapped
-		return rest
 
-	def sorted_array_to_bst(self, arr):
-		if not arr:
-			return None
+	def _cache_files(self):
+		return [os.path.join(self.CachePath, name) for name in ('starts.npy', 'ends.npy', 'locations.npy', 'locations.json')]
 
-		mid = int(len(arr) / 2)
-		root = Node(arr[mid])
-		root.left = self.sorted_array_to_bst(arr[:mid])
-		root.right = self.sorted_array_to_bst(arr[mid + 1:])
-		return root
 
+	def _source_stamp(self, fname):
+		stat = os.stat(fname)
+		return {'path': os.path.abspath(fname), 'mtime': stat.st_mtime, 'size': stat.st_size}
 
-	def search(self, value):
-		root = self.TreeRoot
-		while True:
-			if root.data == value:
-				return root.data
 
-			if root.data > value:
+	def _load_cache(self, fname):
+		starts_path, ends_path, indexes_path, locations_path = self._cache_files()
+		with open(locations_path, 'r') as f:
+			data = json.load(f)
 
-				left = root.left
-				if left is None:
-					return root.data
-				else:
-					root = left
-			if root.data < value:
-				right = root.right
-				if right is None:
-					return root.data
-				else:
-					root = right
+		if data.get('source') != self._source_stamp(fname):
+			raise FileNotFoundError("The cache is outdated")
 
+		starts = np.load(starts_path, mmap_mode='r')
+		ends = np.load(ends_path, mmap_mode='r')
+		location_indexes = np.load(indexes_path, mmap_mode='r')
+		return starts, ends, location_indexes, data['locations']
 
-	def lookup_location_ipv4(self, address):
-		if self.TreeRoot is None:
-			# L.warning("Cannot enrich the location")
-			return None
 
-		address_int = int(ipaddress.IPv4Address(address))
+	def _save_cache(self, fname, starts, ends, location_indexes, locations):
+		os.makedirs(self.CachePath, exist_ok=True)
+		starts_path, ends_path, indexes_path, locations_path = self._cache_files()
+		np.save(starts_path, starts)
+		np.save(ends_path, ends)
+		np.save(indexes_path, location_indexes)
 
-		if self.IP4Mapped:
-			# https://blog.ip2location.com/knowledge-base/ipv4-mapped-ipv6-address/
-			# 191.239.213.197 -> ::ffff:191.239.213.197
-			address_int += 281470681743360
+		# The JSON is written last, it validates the whole cache
+		with open(locations_path, 'w') as f:
+			json.dump({'source': self._source_stamp(fname), 'locations': locations}, f)
 
-		value = self.search(address_int)
-		return self.Locations.get(value)
+	# Lookups
 
+	def _to_array(self, values, wide):
+		if wide:
+			mask = (1 << 64) - 1
+			return np.array([(v >> 64, v & mask) for v in values], dtype=self.IP6DType)
+		return np.array(values, dtype='u8')
 
-	def lookup_location_ipv6(self, address):
-		if self.TreeRoot is None:
-			# L.warning("Cannot enrich the location")
-			return None
 
-		address_int = int(ipaddress.IPv6Address(address))
+	def _search(self, address_ints):
+		'''
+		Returns an array of location indexes for integer addresses, -1 if the address is not in any range.
+		'''
+		wide = self.Starts.dtype == self.IP6DType
+		if not wide:
+			# Addresses out of the range of the database can not be found
+			valid = np.array([address_int < (1 << 64) for address_int in address_ints], dtype=bool)
+			address_ints = [address_int if address_int < (1 << 64) else 0 for address_int in address_ints]
+		else:
+			valid = np.ones(len(address_ints), dtype=bool)
 
-		value = self.search(address_int)
-		return self.Locations.get(value)
+		if self.Starts.shape[0] == 0:
+			return np.full(len(address_ints), -1)
 
-	def lookup_location(self, address):
+		keys = self._to_array(address_ints, wide)
+		ranges = np.searchsorted(self.Starts, keys, side='right') - 1
+		clipped = np.maximum(ranges, 0)
+		ends = self.Ends[clipped]
+		if wide:
+			within = (keys['hi'] < ends['hi']) | ((keys['hi'] == ends['hi']) & (keys['lo'] <= ends['lo']))
+		else:
+			within = keys <= ends
+
+		found = valid & (ranges >= 0) & within
+		return np.where(found, self.LocationIndexes[clipped], -1)
+
+
+	def _address_to_int(self, address):
 		if '.' in address:
-			return self.lookup_location_ipv4(address)
+			address_int = int(ipaddress.IPv4Address(address))
+			if self.IP4Mapped:
+				# https://blog.ip2location.com/knowledge-base/ipv4-mapped-ipv6-address/
+				# 191.239.213.197 -> ::ffff:191.239.213.197
+				address_int += self.IP4MappedOffset
+			return address_int
 		elif ':' in address:
-			return self.lookup_location_ipv6(address)
+			return int(ipaddress.IPv6Address(address))
 		else:
 			raise ValueError("Invalid IPv4/IPv6 format")
 
 
-class Node:
-	def __init__(self, d):
-		self.data = d
-		self.left = None
-		self.right = None
+	def _lookup_int(self, address_int):
+		'''
+		Single address is searched without building arrays, `_search()` is used by `lookup_many()`.
+		'''
+		if self.Starts.shape[0] == 0:
+			return None
+
+		if self.Starts.dtype == self.IP6DType:
+			key = np.array((address_int >> 64, address_int & ((1 << 64) - 1)), dtype=self.IP6DType)
+		elif address_int < (1 << 64):
+			key = np.uint64(address_int)
+		else:
+			return None
+
+		index = int(np.searchsorted(self.Starts, key, side='right')) - 1
+		if index < 0:
+			return None
+
+		end = self.Ends[index]
+		if self.Starts.dtype == self.IP6DType:
+			end = (int(end['hi']) << 64) | int(end['lo'])
+		if address_int > end:
+			return None
+		return self.Locations[self.LocationIndexes[index]]
+
+
+	def lookup_location_ipv4(self, address):
+		if self.Starts is None:
+			return None
+
+		address_int = int(ipaddress.IPv4Address(address))
+		if self.IP4Mapped:
+			address_int += self.IP4MappedOffset
+		return self._lookup_int(address_int)
+
+
+	def lookup_location_ipv6(self, address):
+		if self.Starts is None:
+			return None
+		return self._lookup_int(int(ipaddress.IPv6Address(address)))
+
+
+	def lookup_location(self, address):
+		if self.Starts is None:
+			# L.warning("Cannot enrich the location")
+			return None
+		return self._lookup_int(self._address_to_int(address))
+
+
+	def lookup_many(self, addresses):
+		'''
+		Returns a list of locations for the list of IPv4/IPv6 `addresses`, `None` for invalid or unknown addresses.
+		The search is vectorized, so it is much faster than calling `lookup_location()` for each address.
+		'''
+		if self.Starts is None:
+			return [None] * len(addresses)
+
+		positions = []
+		address_ints = []
+		for position, address in enumerate(addresses):
+			try:
+				address_ints.append(self._address_to_int(address))
+			except ValueError:
+				continue
+			positions.append(position)
+
+		result = [None] * len(addresses)
+		if len(address_ints) == 0:
+			return result
+
+		for position, index in zip(positions, self._search(address_ints).tolist()):
+			if index >= 0:
+				result[position] = self.Locations[index]
+
+		return result
@@ -5,6 +5,7 @@ import numpy as np
 
 import asab
 from .utils.closedrows import ClosedRows, PersistentClosedRows
+from .utils.memmap import resize_memmap
 
 ###
 
@@ -55,12 +56,14 @@ class Matrix(abc.ABC, asab.Configurable):
 
 		Object main attributes:
 		`Array` is numpy ndarray, the actual data representation of the matrix object.
-		`ClosedRows` is a set, where some row ids can be stored before deletion during the matrix rebuild.
+		`ClosedRows` keeps row ids that can be reused or deleted during the matrix rebuild.
+		`Storage` is an array with a spare capacity of rows, `Array` is its view.
 
 	'''
 
 	ConfigDefaults = {
 		'max_closed_rows_capacity': 0.2,
+		'grow_factor': 2.0,  # The allocated capacity of rows is multiplied by this factor, when exhausted
 	}
 
 	def __init__(self, app, dtype='float_', persistent=False, id=None, config=None):
@@ -75,6 +78,8 @@ class Matrix(abc.ABC, asab.Configurable):
 
 		self.DType = dtype
 		self.MaxClosedRowsCapacity = float(self.Config['max_closed_rows_capacity'])
+		self.GrowFactor = max(float(self.Config['grow_factor']), 1.0)
+		self.Storage = None
 		self.zeros()
 
 		metrics_service = app.get_service('asab.MetricsService')
@@ -92,6 +97,7 @@ class Matrix(abc.ABC, asab.Configurable):
 
 	def zeros(self, rows=1):
 		self.Array = np.zeros(self.build_shape(rows), dtype=self.DType)
+		self.Storage = None
 		self.ClosedRows = ClosedRows()
 		self.ClosedRows.add(0)
 
@@ -99,13 +105,13 @@ class Matrix(abc.ABC, asab.Configurable):
 	def flush(self):
 		'''
 		The matrix will be recreated without rows from `ClosedRows`.
+		Returns sorted numpy arrays of closed and saved row indexes.
 		'''
-		indexes = set(range(self.Array.shape[0]))
-		closed_indexes = set()
-		closed_indexes |= self.ClosedRows.get_rows()
-		saved_indexes = list(indexes - closed_indexes)
-		saved_indexes.sort()
+		open_mask = self.ClosedRows.get_open_mask(self.Array.shape[0])
+		closed_indexes = np.flatnonzero(~open_mask)
+		saved_indexes = np.flatnonzero(open_mask)
 		self.Array = self.Array.take(saved_indexes, axis=0)
+		self.Storage = None
 		self.ClosedRows.flush(self.Array.shape[0])
 		self.Gauge.set("rows.closed", 0)
 		self.Gauge.set("rows.active", self.Array.shape[0])
@@ -145,13 +151,32 @@ class Matrix(abc.ABC, asab.Configurable):
 
 	def _grow_rows(self, rows=1):
 		'''
-		Override this method to gain control on how a new closed rows are added to the matrix
+		Override this method to gain control on how a new closed rows are added to the matrix.
+		`Array` is a view of `Storage`, which is allocated with a spare capacity (see `grow_factor`),
+		so the most of the calls only extend the view without copying the data.
 		'''
 		current_rows = self.Array.shape[0]
-		self.Array = np.pad(self.Array.copy(), ((0, rows), (0, 0)), 'constant', constant_values=np.nan)
+		size = current_rows + rows
+		storage = self._get_storage()
+		if storage.shape[0] < size:
+			capacity = max(size, int(storage.shape[0] * self.GrowFactor))
+			storage = np.zeros((capacity,) + self.Array.shape[1:], dtype=self.Array.dtype)
+			storage[:current_rows] = self.Array
+
+		self.Storage = storage
+		self.Array = storage[:size]
 		self.ClosedRows.extend(current_rows, self.Array.shape[0])
 
 
+	def _get_storage(self):
+		'''
+		Returns the array, that holds `Array` together with its spare (never used) rows.
+		'''
+		if self.Storage is not None and self.Array.base is self.Storage:
+			return self.Storage
+		return self.Array
+
+
 	def time(self):
 		return self.App.time()
 
@@ -202,20 +227,24 @@ class PersistentMatrix(Matrix):
 		path = os.path.join(self.Path, 'closed_rows.dat')
 		self.ClosedRows = PersistentClosedRows(path, size=self.Array.shape[0])
 
+		# The file can contain spare rows, the actual number of rows is given by closed rows
+		self.Storage = self.Array
+		self.Array = self.Storage[:self.ClosedRows.CRBit.shape[0]]
+
 
 	def flush(self):
 		'''
 		The matrix will be recreated without rows from `ClosedRows`.
+		Returns sorted numpy arrays of closed and saved row indexes.
 		'''
-		indexes = set(range(self.Array.shape[0]))
-		closed_indexes = set()
-		closed_indexes |= self.ClosedRows.get_rows()
-		saved_indexes = list(indexes - closed_indexes)
-		saved_indexes.sort()
+		open_mask = self.ClosedRows.get_open_mask(self.Array.shape[0])
+		closed_indexes = np.flatnonzero(~open_mask)
+		saved_indexes = np.flatnonzero(open_mask)
 		self.Array = self.Array.take(saved_indexes, axis=0)
 		array = np.memmap(self.ArrayPath, dtype=self.DType, mode='w+', shape=self.Array.shape)
 		array[:] = self.Array[:]
 		self.Array = array
+		self.Storage = None
 
 		self.ClosedRows.flush(self.Array.shape[0])
 		self.Gauge.set("rows.closed", 0)
@@ -247,9 +276,13 @@ class PersistentMatrix(Matrix):
 		Override this method to gain control on how a new closed rows are added to the matrix
 		'''
 		current_rows = self.Array.shape[0]
-		array = np.zeros(self.Array.shape, dtype=self.DType)
-		array[:] = self.Array[:]
-		array.resize((current_rows + rows,) + self.Array.shape[1:], refcheck=False)
-		self.Array = np.memmap(self.ArrayPath, dtype=self.DType, mode='w+', shape=array.shape)
-		self.Array[:] = array[:]
+		size = current_rows + rows
+		storage = self._get_storage()
+		if storage.shape[0] < size:
+			# The file is extended in place, the data are not rewritten
+			capacity = max(size, int(storage.shape[0] * self.GrowFactor))
+			storage = resize_memmap(storage, self.ArrayPath, (capacity,) + self.Array.shape[1:])
+
+		self.Storage = storage
+		self.Array = storage[:size]
 		self.ClosedRows.extend(current_rows, self.Array.shape[0])
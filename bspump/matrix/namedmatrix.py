@@ -63,7 +63,7 @@ class NamedMatrix(Matrix):
 		The matrix will be recreated without rows from `ClosedRows`.
 		'''
 		closed_indexes, saved_indexes = super().flush()
-		self.Index.flush(closed_indexes)
+		self.Index.flush(saved_indexes)
 		return closed_indexes, saved_indexes
 
 
@@ -134,7 +134,7 @@ class PersistentNamedMatrix(PersistentMatrix):
 		The matrix will be recreated without rows from `ClosedRows`.
 		'''
 		closed_indexes, saved_indexes = super().flush()
-		self.Index.flush(closed_indexes)
+		self.Index.flush(saved_indexes)
 		return closed_indexes, saved_indexes
 
 
@@ -44,7 +44,17 @@ class TimeWindowMatrix(NamedMatrix):
 		^                       ^
 		End (past)   <          Start (== now)
 
+		If `ring_buffer` is enabled in the configuration, the time advance does not reallocate the array.
+		The columns form a circular buffer instead: the oldest column is cleared in place and reused as the newest one.
+		`get_column()` maps timestamps through the ring offset (see `get_head()`),
+		use `get_ordered_array()` to obtain columns ordered from the oldest to the newest.
+
 	'''
+
+	ConfigDefaults = {
+		'ring_buffer': False,
+	}
+
 	def __init__(self, app, dtype='float_', start_time=None, resolution=60, columns=15, clock_driven=False, id=None, config=None):
 		self.Columns = columns
 		if start_time is None:
@@ -134,9 +144,32 @@ class TimeWindowMatrix(NamedMatrix):
 					self.TimeConfig.get_end(), self.TimeConfig.get_resolution(), self.Array.shape[1]))
 			raise
 
+		if self.RingBuffer:
+			column_idx = (column_idx + self.get_head()) % self.Array.shape[1]
+
 		return column_idx
 
 
+	def get_head(self):
+		'''
+			Returns the index of the column with the oldest time slot in the `ring_buffer` mode.
+			The head is derived from the end of the time window, so it doesn't have to be stored.
+		'''
+		resolution = self.TimeConfig.get_resolution()
+		return int(round(self.TimeConfig.get_end() / resolution)) % int(self.TimeConfig.get_columns())
+
+
+	def get_ordered_array(self):
+		'''
+			Returns the array with columns ordered from the oldest to the newest one.
+			In the `ring_buffer` mode, the array is copied.
+		'''
+		if not self.RingBuffer:
+			return self.Array
+
+		return np.roll(self.Array, -self.get_head(), axis=1)
+
+
 	def advance(self, target_ts):
 		'''
 			Advance time window (add columns) so it covers target `timestamp` (`target_ts`)
@@ -193,6 +226,7 @@ class TimeWindowMatrix(NamedMatrix):
 
 	def zeros(self):
 		super().zeros()
+		self.RingBuffer = self.Config.getboolean('ring_buffer')
 		self.TimeConfig = TimeConfig(self.Resolution, self.Columns, self.Start)
 		self.End = self.TimeConfig.get_end()
 		self.WarmingUpCount = WarmingUpCount(self.Array.shape[0])
@@ -204,27 +238,40 @@ class TimeWindowMatrix(NamedMatrix):
 			the time flow. `Start` and `End` attributes are advanced as well.
 		'''
 
+		head = self.get_head()
 		self.TimeConfig.add_start(self.TimeConfig.get_resolution())
 		self.TimeConfig.add_end(self.TimeConfig.get_resolution())
 
 		if self.Array.shape[0] == 0:
 			return
 
-		column = np.empty((self.Array.shape[0], 1,) + self.Array.shape[2:], dtype=self.Array.dtype)
-		column[:] = np.nan
-		array = self.Array
-		array = np.hstack((array, column))
-		array = np.delete(array, 0, axis=1)
-		self.Array = array
+		if self.RingBuffer:
+			# The oldest column becomes the newest one
+			self.Array[:, head] = np.nan
+
+		else:
+			# Columns are shifted in place, so `Array` stays a view of `Storage`
+			self.Array[:, :-1] = self.Array[:, 1:]
+			self.Array[:, -1] = np.nan
 
-		open_rows = list(set(range(0, self.Array.shape[0])) - self.ClosedRows.get_rows())
-		self.WarmingUpCount.decrease(open_rows)
+		self.WarmingUpCount.decrease(self.ClosedRows.get_open_mask(self.Array.shape[0]))
 		self.Start = self.TimeConfig.get_start()
 		self.End = self.TimeConfig.get_end()
 
 
 
 class PersistentTimeWindowMatrix(PersistentNamedMatrix):
+	'''
+		Persistent version of the `TimeWindowMatrix`.
+
+		In the `ring_buffer` mode, the memory-mapped file is updated in place when the time advances.
+		The mode must not be switched for an existing file, because columns are stored in a different order.
+	'''
+
+	ConfigDefaults = {
+		'ring_buffer': False,
+	}
+
 	def __init__(self, app, dtype='float_', start_time=None, resolution=60, columns=15, clock_driven=False, id=None, config=None):
 		self.Columns = columns
 		if start_time is None:
@@ -318,9 +365,32 @@ class PersistentTimeWindowMatrix(PersistentNamedMatrix):
 					self.TimeConfig.get_end(), self.TimeConfig.get_resolution(), self.Array.shape[1]))
 			raise
 
+		if self.RingBuffer:
+			column_idx = (column_idx + self.get_head()) % self.Array.shape[1]
+
 		return column_idx
 
 
+	def get_head(self):
+		'''
+			Returns the index of the column with the oldest time slot in the `ring_buffer` mode.
+			The head is derived from the end of the time window, so it doesn't have to be stored.
+		'''
+		resolution = self.TimeConfig.get_resolution()
+		return int(round(self.TimeConfig.get_end() / resolution)) % int(self.TimeConfig.get_columns())
+
+
+	def get_ordered_array(self):
+		'''
+			Returns the array with columns ordered from the oldest to the newest one.
+			In the `ring_buffer` mode, the array is copied.
+		'''
+		if not self.RingBuffer:
+			return self.Array
+
+		return np.roll(self.Array, -self.get_head(), axis=1)
+
+
 	def advance(self, target_ts):
 		'''
 			Advance time window (add columns) so it covers target `timestamp` (`target_ts`)
@@ -377,6 +447,7 @@ class PersistentTimeWindowMatrix(PersistentNamedMatrix):
 
 	def zeros(self):
 		super().zeros()
+		self.RingBuffer = self.Config.getboolean('ring_buffer')
 		path = os.path.join(self.Path, 'time_config.dat')
 		self.TimeConfig = PersistentTimeConfig(path, self.Resolution, self.Columns, self.Start)
 		self.End = self.TimeConfig.get_end()
@@ -392,23 +463,22 @@ class PersistentTimeWindowMatrix(PersistentNamedMatrix):
 			the time flow. `Start` and `End` attributes are advanced as well.
 		'''
 
+		head = self.get_head()
 		self.TimeConfig.add_start(self.TimeConfig.get_resolution())
 		self.TimeConfig.add_end(self.TimeConfig.get_resolution())
 
 		if self.Array.shape[0] == 0:
 			return
 
-		column = np.zeros((self.Array.shape[0], 1,) + self.Array.shape[2:], dtype=self.Array.dtype)
-		array = np.zeros(self.Array.shape, dtype=self.DType)
-		array[:] = self.Array[:]
+		if self.RingBuffer:
+			# The oldest column becomes the newest one, the file is modified in place
+			self.Array[:, head] = 0
 
-		array = np.hstack((array, column))
-		array = np.delete(array, 0, axis=1)
-
-		self.Array = np.memmap(self.ArrayPath, dtype=self.DType, mode='w+', shape=array.shape)
-		self.Array[:] = array[:]
+		else:
+			# Columns are shifted in place, the file is not rewritten
+			self.Array[:, :-1] = self.Array[:, 1:]
+			self.Array[:, -1] = 0
 
-		open_rows = list(set(range(0, self.Array.shape[0])) - self.ClosedRows.get_rows())
-		self.WarmingUpCount.decrease(open_rows)
+		self.WarmingUpCount.decrease(self.ClosedRows.get_open_mask(self.Array.shape[0]))
 		self.Start = self.TimeConfig.get_start()
 		self.End = self.TimeConfig.get_end()
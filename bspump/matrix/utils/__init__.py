@@ -1,5 +1,6 @@
 from .closedrows import ClosedRows, PersistentClosedRows
 from .index import Index, PersistentIndex
+from .memmap import resize_memmap
 from .timeconfig import TimeConfig, PersistentTimeConfig
 from .warmingupcount import WarmingUpCount, PersistentWarmingUpCount
 
@@ -9,6 +10,7 @@ __all__ = [
 	'PersistentClosedRows',
 	'Index',
 	'PersistentIndex',
+	'resize_memmap',
 	'TimeConfig',
 	'PersistentTimeConfig',
 	'WarmingUpCount',
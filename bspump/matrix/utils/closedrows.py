@@ -1,10 +1,23 @@
 import numpy as np
 import os
 
+from .memmap import resize_memmap
+
 
 class ClosedRows(object):
+	'''
+	Closed rows of the matrix, i.e. rows that are free to be reused.
+
+	The state of rows is kept in `CRBit` (1 for an open row, 0 for a closed one),
+	closed rows are also stacked in `Free`, so that the allocation of a row is O(1).
+	'''
+
 	def __init__(self, max_len=None):
-		self.CR = set()
+		self.DType = 'i1'
+		self.CRBit = np.ones(0, dtype=self.DType)
+		self.Free = np.empty(0, dtype='i8')
+		self.FreeCount = 0
+
 		if max_len is None:
 			max_len = float('inf')
 
@@ -12,89 +25,129 @@ class ClosedRows(object):
 
 
 	def pop(self):
-		return self.CR.pop()
+		if self.FreeCount == 0:
+			raise KeyError("pop from empty closed rows")
+
+		self.FreeCount -= 1
+		element = int(self.Free[self.FreeCount])
+		self.CRBit[element] = 1
+		return element
 
 
 	def get_rows(self):
-		return self.CR
+		return set(self.Free[:self.FreeCount].tolist())
 
 
 	def add(self, element):
-		if len(self.CR) == self.MaxLen:
+		if self.FreeCount == self.MaxLen:
 			raise RuntimeError("Maximum size exceeded")
 
-		self.CR.add(element)
+		if element >= self.CRBit.shape[0]:
+			self._resize(element + 1)
+
+		if self.CRBit[element] == 0:
+			return
+
+		self.CRBit[element] = 0
+		self._push(np.array([element], dtype='i8'))
 
 
 	def __contains__(self, element):
-		if element in self.CR:
-			return True
-		return False
+		if element is None or element < 0 or element >= self.CRBit.shape[0]:
+			return False
+		return self.CRBit[element] == 0
 
 
 	def serialize(self):
-		return list(self.get_rows())
+		return self.Free[:self.FreeCount].tolist()
 
 
 	def deserialize(self, data):
-		self.CR = set(data)
+		self.flush(max(data) + 1 if len(data) > 0 else 0)
+		rows = np.array(sorted(set(data), reverse=True), dtype='i8')
+		self.CRBit[rows] = 0
+		self._push(rows)
 
 
 	def __len__(self):
-		return len(self.CR)
+		return self.FreeCount
 
 
 	def extend(self, start, stop):
-		self.CR |= frozenset(range(start, stop))
-		if len(self.CR) >= self.MaxLen:
+		if stop > self.CRBit.shape[0]:
+			self._resize(stop)
+
+		# Rows are stacked in the reverse order, so the lowest index is popped first
+		rows = np.arange(stop - 1, start - 1, -1, dtype='i8')
+		rows = rows[self.CRBit[rows] != 0]
+		self.CRBit[rows] = 0
+		self._push(rows)
+
+		if self.FreeCount >= self.MaxLen:
 			raise RuntimeError("Maximum size exceeded")
 
 
 	def flush(self, size=None):
-		self.CR = set()
+		if size is None:
+			size = self.CRBit.shape[0]
+		self.CRBit = np.ones(size, dtype=self.DType)
+		self.FreeCount = 0
+
+
+	def get_open_mask(self, size):
+		'''
+		Returns a boolean array of `size`, where open rows are `True`.
+		'''
+		mask = np.ones(size, dtype=bool)
+		length = min(size, self.CRBit.shape[0])
+		mask[:length] = self.CRBit[:length] != 0
+		return mask
+
+
+	def _push(self, rows):
+		count = rows.shape[0]
+		if self.FreeCount + count > self.Free.shape[0]:
+			free = np.empty(max(2 * self.Free.shape[0], self.FreeCount + count), dtype='i8')
+			free[:self.FreeCount] = self.Free[:self.FreeCount]
+			self.Free = free
+
+		self.Free[self.FreeCount:self.FreeCount + count] = rows
+		self.FreeCount += count
+
+
+	def _resize(self, size):
+		crbit = np.ones(size, dtype=self.DType)
+		crbit[:self.CRBit.shape[0]] = self.CRBit
+		self.CRBit = crbit
 
 
 
 class PersistentClosedRows(ClosedRows):
 	def __init__(self, path, size=None, max_len=None):
 		super().__init__(max_len=max_len)
-		self.DType = 'i1'
 		self.Path = path
 		if os.path.exists(self.Path):
 			self.CRBit = np.memmap(self.Path, dtype=self.DType, mode='readwrite')
-			for i in range(len(self.CRBit)):
-				if self.CRBit[i] == 0:
-					self.CR.add(i)
+			closed = np.flatnonzero(self.CRBit == 0)
+			self._push(closed[::-1].astype('i8'))
 		else:
 			if size is None:
 				raise RuntimeError("The size should correspond to array size")
-			self.CR.add(0)
 			self.ones(size)
+			self.add(0)
 
 
-	def pop(self):
-		element = super().pop()
-		self.CRBit[element] = 1
-		return element
-
-
-	def add(self, element):
-		super().add(element)
-		self.CRBit[element] = 0
-
-
-	def extend(self, start, stop):
-		cr_ = np.zeros(self.CRBit.shape[0], dtype=self.DType)
-		cr_[:] = self.CRBit[:]
-		cr_.resize(stop, refcheck=False)
-		self.CRBit = np.memmap(self.Path, dtype=self.DType, mode='w+', shape=cr_.shape)
-		self.CRBit[:] = cr_[:]
-		super().extend(start, stop)
+	def _resize(self, size):
+		start = self.CRBit.shape[0]
+		self.CRBit = resize_memmap(self.CRBit, self.Path, (size,))
+		self.CRBit[start:] = 1
 
 
-	def flush(self, size):
-		super().flush(size)
+	def flush(self, size=None):
+		if size is None:
+			size = self.CRBit.shape[0]
 		self.ones(size)
+		self.FreeCount = 0
 
 
 	def ones(self, size):
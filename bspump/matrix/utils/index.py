@@ -1,6 +1,9 @@
 import numpy as np
 import os
 import collections
+import itertools
+
+from .memmap import resize_memmap
 
 
 class Index(object):
@@ -30,21 +33,24 @@ class Index(object):
 		self.I2NMap[index] = name
 
 
-	def flush(self, indexes):
-		n2imap = collections.OrderedDict()
-		i2nmap = collections.OrderedDict()
-		i = 0
-		saved_indexes = []
-		for row_name, row_index in self.N2IMap.items():
-			if row_index not in indexes:
-				n2imap[row_name] = i
-				i2nmap[i] = row_name
-				saved_indexes.append(row_index)
-				i += 1
+	def flush(self, saved_indexes):
+		'''
+		Renumbers rows after the matrix has been rebuilt from `saved_indexes`,
+		which is a sorted array of row indexes, that have been kept.
+		'''
+		saved_indexes = np.asarray(saved_indexes, dtype='i8')
+		names = list(self.N2IMap.keys())
+		old_indexes = np.fromiter(self.N2IMap.values(), dtype='i8', count=len(names))
+
+		# The new index of the row is its position in `saved_indexes`
+		new_indexes = np.searchsorted(saved_indexes, old_indexes)
+		found = new_indexes < saved_indexes.shape[0]
+		found[found] = saved_indexes[new_indexes[found]] == old_indexes[found]
 
-		self.N2IMap = n2imap
-		self.I2NMap = i2nmap
-		return saved_indexes
+		names = list(itertools.compress(names, found.tolist()))
+		new_indexes = new_indexes[found].tolist()
+		self.N2IMap = collections.OrderedDict(zip(names, new_indexes))
+		self.I2NMap = collections.OrderedDict(zip(new_indexes, names))
 
 
 	def serialize(self):
@@ -83,11 +89,11 @@ class PersistentIndex(Index):
 
 		if os.path.exists(self.Path):
 			self.Map = np.memmap(self.Path, dtype=self.DType, mode='readwrite')
-			for i in range(len(self.Map)):
-				value = self.Map[i]
-				if value != '':
-					self.I2NMap[i] = value
-					self.N2IMap[value] = i
+			indexes = np.flatnonzero(self.Map != '')
+			names = self.Map[indexes].tolist()
+			indexes = indexes.tolist()
+			self.N2IMap = collections.OrderedDict(zip(names, indexes))
+			self.I2NMap = collections.OrderedDict(zip(indexes, names))
 		else:
 			if size is None:
 				raise RuntimeError("The size should correspond to array size")
@@ -108,17 +114,11 @@ class PersistentIndex(Index):
 
 
 	def extend(self, size):
-		map_ = np.zeros(self.Map.shape[0], dtype=self.DType)
-		map_[:] = self.Map[:]
-		map_.resize(size, refcheck=False)
-		self.Map = np.memmap(self.Path, dtype=self.DType, mode='w+', shape=map_.shape)
-		self.Map[:] = map_[:]
+		self.Map = resize_memmap(self.Map, self.Path, (size,))
 
 
-	def flush(self, closed_indexes):
-		saved_indexes = super().flush(closed_indexes)
-		self.Map = self.Map.take(saved_indexes, axis=0)
-		map_ = np.memmap(self.Path, dtype=self.DType, mode='w+', shape=self.Map.shape)
-		map_[:] = self.Map[:]
-		self.Map = map_
-		return saved_indexes
+	def flush(self, saved_indexes):
+		super().flush(saved_indexes)
+		map_ = self.Map.take(saved_indexes, axis=0)
+		self.Map = np.memmap(self.Path, dtype=self.DType, mode='w+', shape=map_.shape)
+		self.Map[:] = map_[:]
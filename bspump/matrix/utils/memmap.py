@@ -0,0 +1,19 @@
+import os
+
+import numpy as np
+
+
+def resize_memmap(array, path, shape):
+	'''
+	Resizes the file behind the memory mapped `array` in place (using `ftruncate`) and maps it again.
+	The data are not copied, so the cost does not depend on the size of the array.
+	New items are filled with zeros.
+	'''
+	if isinstance(array, np.memmap):
+		array.flush()
+
+	dtype = np.dtype(array.dtype)
+	with open(path, 'r+b') as f:
+		os.ftruncate(f.fileno(), int(np.prod(shape)) * dtype.itemsize)
+
+	return np.memmap(path, dtype=dtype, mode='r+', shape=tuple(shape))
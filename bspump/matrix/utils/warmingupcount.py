@@ -1,6 +1,8 @@
 import numpy as np
 import os
 
+from .memmap import resize_memmap
+
 
 class WarmingUpCount(object):
 	def __init__(self, size):
@@ -49,12 +51,7 @@ class PersistentWarmingUpCount(WarmingUpCount):
 	def extend(self, size, value):
 		start = self.WUC.shape[0]
 		end = size
-		wuc = np.empty(self.WUC.shape[0], dtype=self.DType)
-		wuc[:] = np.nan
-		wuc[:] = self.WUC[:]
-		wuc.resize(size, refcheck=False)
-		self.WUC = np.memmap(self.Path, dtype=self.DType, mode='w+', shape=wuc.shape)
-		self.WUC[:] = wuc[:]
+		self.WUC = resize_memmap(self.WUC, self.Path, (size,))
 		self.WUC[start:end] = value
 
 
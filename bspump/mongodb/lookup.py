@@ -145,9 +145,20 @@ The MongoDBLookup can be then located and used inside a custom enricher:
 	def build_query(self, key):
 		return {self.Key: key}
 
+	def build_find_many_query(self, keys):
+		return {self.Key: {'$in': keys}}
+
 	async def _find_one(self, query):
 		return await (self.Connection.Client[self.Database][self.Collection]).find_one(query)
 
+	async def _fetch_one(self, key):
+		return await self._find_one(self.build_query(key))
+
+	async def _fetch_many(self, keys):
+		cursor = (self.Connection.Client[self.Database][self.Collection]).find(self.build_find_many_query(keys))
+		documents = await cursor.to_list(length=None)
+		return {document.get(self.Key): document for document in documents}
+
 	async def _changestream(self):
 		try:
 			async with self.Connection.Client[self.Database][self.Collection].watch() as stream:
@@ -169,8 +180,7 @@ The MongoDBLookup can be then located and used inside a custom enricher:
 			value = self.Cache[key]
 			self.CacheCounter.add('hit', 1)
 		except KeyError:
-			query = self.build_query(key)
-			value = await self._find_one(query)
+			value = await self.fetch(key)
 			if value is not None:
 				self.Cache[key] = value
 				self.CacheCounter.add('miss', 1)
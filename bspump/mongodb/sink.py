@@ -2,6 +2,10 @@ from bspump import Sink
 import asyncio
 import logging
 
+import bson
+import pymongo.errors
+import pymongo.write_concern
+
 
 L = logging.getLogger(__name__)
 
@@ -20,11 +24,29 @@ class MongoDBSink(Sink):
     inside of this database in the sink itself by modifying the ConfigDefaults while instantiating
     the class.
 
+    Documents are collected in a batch per collection. The batch is written by `insert_many(ordered=False)`,
+    when it contains `batch_size` documents or `batch_bytes` bytes of BSON (0 disables this limit),
+    or when it is older than `batch_age` seconds. Up to `max_in_flight` batches are written concurrently.
+    The pipeline is throttled, when more than `max_outstanding` documents wait for the write,
+    and released, when half of them is written.
+
+    Documents, that fail to be inserted (e.g. because of a duplicate key), are counted in the `mongodb.sink` metric
+    and logged, the rest of the batch is inserted and the pipeline continues.
+
+    The write concern of inserts can be tuned by `write_concern` (e.g. `1`, `majority` or `0` for unacknowledged writes)
+    and `journal` (`yes` or `no`), empty values mean the defaults of the connection.
+
     """
 
     ConfigDefaults = {
-        "output_queue_max_size": 100,
         'collection': 'collection',  # default collection, if not specified inside context
+        'batch_size': 1000,  # maximal number of documents in one insert_many()
+        'batch_bytes': 0,  # maximal BSON size of a batch in bytes, 0 means unlimited
+        'batch_age': 1.0,  # seconds after which an incomplete batch is written
+        'max_in_flight': 4,  # number of batches written concurrently
+        'max_outstanding': 10000,  # number of not yet written documents that throttles the pipeline
+        'write_concern': '',  # 'w' of the write concern, e.g. '1', 'majority', '0'
+        'journal': '',  # 'j' of the write concern, 'yes' or 'no'
     }
 
     def __init__(self, app, pipeline, connection, id=None, config=None):
@@ -32,88 +54,139 @@ class MongoDBSink(Sink):
         # We make use of a connection and pipeline, defined in a different place of the pump.
         self.Connection = pipeline.locate_connection(app, connection)
         self.Pipeline = pipeline
+        self.Loop = app.Loop
 
-        self._output_queue = asyncio.Queue()
-        self._output_queue_max_size = int(self.Config['output_queue_max_size'])
         self.Collection = self.Config['collection']
-        assert (self._output_queue_max_size >= 1), "Output queue max size invalid"
-        self._conn_future = None
+        self.BatchSize = int(self.Config['batch_size'])
+        self.BatchBytes = int(self.Config['batch_bytes'])
+        self.BatchAge = float(self.Config['batch_age'])
+        self.MaxOutstanding = int(self.Config['max_outstanding'])
+        assert (self.BatchSize >= 1), "Batch size invalid"
+
+        self.WriteConcern = self._build_write_concern()
+
+        # Collection name -> [documents, size in bytes, time of the first document]
+        self.Batches = {}
+        self.Outstanding = 0
+        self.IsThrottling = False
+        self.InFlight = set()
+        self.Semaphore = asyncio.Semaphore(int(self.Config['max_in_flight']))
+
+        metrics_service = app.get_service('asab.MetricsService')
+        self.Counter = metrics_service.create_counter(
+            "mongodb.sink",
+            tags={
+                'pipeline': pipeline.Id,
+                'sink': self.Id,
+            },
+            init_values={
+                'inserted': 0,
+                'failed': 0,
+                'batches': 0,
+            }
+        )
 
-        self._on_health_check("Connection.open!")
         # This part subscribes to outside events used to control the flow of the whole pump.
         # Depending on the specific event, a related class method gets called.
         app.PubSub.subscribe("Application.stop!", self._on_application_stop)
-        app.PubSub.subscribe("Application.tick!", self._on_health_check)
+        app.PubSub.subscribe("Application.tick!", self._on_tick)
         app.PubSub.subscribe("Application.exit!", self._on_exit)
 
-    def _on_health_check(self, message_type):
-        # At this point we examine the state of the _conn_future instance variable, queueing _outfluxing
-        # in case it is None, returning early if the future is not done and resetting _conn_future to None otherwise.
-        if self._conn_future is not None:
-
-            if not self._conn_future.done():
-                return
-            try:
-                self._conn_future.result()
-            except Exception:
-            # Connection future threw an error
-                L.exception("Unexpected connection future error")
-
-            self._conn_future = None
-
-        assert (self._conn_future is None)
-
-        self._conn_future = asyncio.ensure_future(
-            self._insert(),
-        )
+    def _build_write_concern(self):
+        w = self.Config['write_concern'].strip()
+        j = self.Config['journal'].strip().lower()
+        if len(w) == 0 and len(j) == 0:
+            return None
+
+        kwargs = {}
+        if len(w) > 0:
+            kwargs['w'] = int(w) if w.isdigit() else w
+        if len(j) > 0:
+            kwargs['j'] = j in ('yes', 'true', '1', 'on')
+        return pymongo.write_concern.WriteConcern(**kwargs)
+
+    def _on_tick(self, message_type):
+        # Write batches that are waiting for too long
+        now = self.Loop.time()
+        for collection, batch in list(self.Batches.items()):
+            if now - batch[2] >= self.BatchAge:
+                self._flush(collection)
 
     def _on_application_stop(self, message_type, counter):
-        # On requested stop, we insert 'None' to the FIFO (first in first out) asyncio Queue this means (see later),
-        # that no task or item inserted after will be processed.
-        self._output_queue.put_nowait((None, None))
+        # On requested stop, we write all batches.
+        for collection in list(self.Batches.keys()):
+            self._flush(collection)
 
     async def _on_exit(self, message_type):
-        # On application exit, we first await completion of all tasks in the queue.
-        if self._conn_future is not None:
-            await asyncio.wait([self._conn_future], return_when=asyncio.ALL_COMPLETED)
+        # On application exit, we write the rest of batches and await completion of all writes.
+        self._on_application_stop(message_type, 0)
+        if len(self.InFlight) > 0:
+            await asyncio.wait(list(self.InFlight), return_when=asyncio.ALL_COMPLETED)
 
     def process(self, context, event: [dict, list]):
-        # This is where we check if the queue is overflowing in which case we apply throttling.
-        if self._output_queue.qsize() >= self._output_queue_max_size:
+        # The event should be either a dictionary or a list of dictionaries
+        if type(event) == dict:
+            documents = [event]
+        elif type(event) == list and len(event) > 0:
+            documents = event
+        else:
+            raise TypeError(f"Only dict or list of dicts allowed, {type(event)} supplied")
+
+        collection = context.get("collection", self.Collection)
+        batch = self.Batches.get(collection)
+        if batch is None:
+            batch = [[], 0, self.Loop.time()]
+            self.Batches[collection] = batch
+
+        batch[0].extend(documents)
+        if self.BatchBytes > 0:
+            batch[1] += sum(len(bson.encode(document)) for document in documents)
+
+        self.Outstanding += len(documents)
+
+        if len(batch[0]) >= self.BatchSize or (self.BatchBytes > 0 and batch[1] >= self.BatchBytes):
+            self._flush(collection)
+
+        # This is where we check if there are too many documents waiting in which case we apply throttling.
+        if not self.IsThrottling and self.Outstanding >= self.MaxOutstanding:
+            self.IsThrottling = True
             self.Pipeline.throttle(self, True)
-        # Here,  we take the event (in this case it should be either a dictionary or a list of dictionaries,
-        # and insert it into the queue to be available to the _outflux method.
-        self._output_queue.put_nowait((context, event))
-
-    async def _insert(self):
-
-        db = self.Connection.Client[self.Connection.Database]
 
-        while True:
-            # Here is where we await the event (which in this case contains the data we want to save to the database)
-            # to be pulled out of the queue and saved to a local variable.
-            context, event = await self._output_queue.get()
-
-            if event is None:
-                break
-
-            # We check the queue size and remove throttling if the size is smaller than its defined max size.
-            if self._output_queue.qsize() == self._output_queue_max_size - 1:
+    def _flush(self, collection):
+        documents = self.Batches.pop(collection)[0]
+        for i in range(0, len(documents), self.BatchSize):
+            task = asyncio.ensure_future(self._insert(collection, documents[i:i + self.BatchSize]))
+            self.InFlight.add(task)
+            task.add_done_callback(self.InFlight.discard)
+
+    async def _insert(self, collection_name, documents):
+        collection = self.Connection.Client[self.Connection.Database][collection_name]
+        if self.WriteConcern is not None:
+            collection = collection.with_options(write_concern=self.WriteConcern)
+
+        try:
+            async with self.Semaphore:
+                await collection.insert_many(documents, ordered=False)
+            self.Counter.add('inserted', len(documents))
+
+        except pymongo.errors.BulkWriteError as e:
+            # Unordered insert continues after an error, so only failed documents are lost
+            errors = e.details.get('writeErrors', [])
+            self.Counter.add('inserted', e.details.get('nInserted', len(documents) - len(errors)))
+            self.Counter.add('failed', len(errors))
+            L.warning("Failed to insert {} of {} documents into '{}': {}".format(
+                len(errors), len(documents), collection_name,
+                errors[0].get('errmsg') if len(errors) > 0 else e
+            ))
+
+        except Exception:
+            self.Counter.add('failed', len(documents))
+            L.exception("Failed to insert {} documents into '{}'".format(len(documents), collection_name))
+
+        finally:
+            self.Counter.add('batches', 1)
+            self.Outstanding -= len(documents)
+            # We remove throttling, if half of outstanding documents has been written.
+            if self.IsThrottling and self.Outstanding <= self.MaxOutstanding // 2:
+                self.IsThrottling = False
                 self.Pipeline.throttle(self, False)
-
-            # Obtain the collection to put the obtained item to
-            collection = db[context.get("collection", self.Collection)]
-
-            # At this point, we check what kind of item we pulled from the queue. If its None, it means we
-            # reached what was inserted by _on_application_stop and we break the loop immediately.
-            # If this is not the case we continue determining the type of the item and proceed accordingly,
-            # including raising a type error, if the type is unexpected.
-
-            if type(event) == dict:
-                await collection.insert_one(event)
-                self._output_queue.task_done()
-            elif type(event) == list and len(event) > 0:
-                await collection.insert_many(event)
-                self._output_queue.task_done()
-            else:
-                raise TypeError(f"Only dict or list of dicts allowed, {type(event)} supplied")
@@ -25,7 +25,7 @@ MySQLLookup feeds lookup data from MySQL database using a query.
 MySQLLookup also has a simple cache to reduce a number of database hits.
 
 MySQLLookup allows to specify custom cache strategy via `cache` parameter, as shown in the example below.
-LRUCacheDict removes last used elements, if the time they were lastly used exceeds the specified `max_duration` or the cache dictionary exceeds `max_size`.
+LRUCacheDict removes least recently used elements, if the cache dictionary exceeds `max_size`, and elements written more than `max_duration` seconds ago.
 For more information, please see: https://en.wikipedia.org/wiki/Cache_replacement_policies#Least_recently_used_(LRU)
 
 First, it is needed to create MySQLLookup instance and register it inside the BSPump service:
@@ -74,6 +74,7 @@ The MySQLLookup can be then located and used inside a custom enricher:
 		'from': '',  # Specify the FROM object, which can be a table or a query string
 		'key': '',  # Specify key name used for search
 		'query_find_one': 'SELECT {} FROM {} WHERE {}=%s;',  # Specify query string to find one record in database using key
+		'query_find_many': 'SELECT {} FROM {} WHERE {} IN ({});',  # Specify query string to find records of more keys (see `batch_size`)
 		'query_count': 'SELECT COUNT(*) as \'count\' FROM {};',  # Specify query string to count number of records in the database
 		'query_iter': 'SELECT {} FROM {};',  # Specify general query string for the iterator
 	}
@@ -87,6 +88,7 @@ The MySQLLookup can be then located and used inside a custom enricher:
 		self.Key = self.Config['key']
 
 		self.QueryFindOne = self.Config['query_find_one']
+		self.QueryFindMany = self.Config['query_find_many']
 		self.QueryCount = self.Config['query_count']
 		self.QueryIter = self.Config['query_iter']
 
@@ -114,6 +116,21 @@ The MySQLLookup can be then located and used inside a custom enricher:
 						return None
 					raise e
 
+	async def _fetch_many(self, keys):
+		query = self.QueryFindMany.format(self.Statement, self.From, self.Key, ', '.join(['%s'] * len(keys)))
+		async with self.Connection.acquire_connection() as connection:
+			async with connection.cursor(aiomysql.cursors.DictCursor) as cursor_async:
+				try:
+					await cursor_async.execute(query, keys)
+					result = await cursor_async.fetchall()
+				except (pymysql.err.InternalError, pymysql.err.ProgrammingError, pymysql.err.OperationalError) as e:
+					if e.args[0] in self.Connection.RetryErrors:
+						L.warning("Recoverable error '{}' occurred in MySQLLookup. Skipping lookup.".format(e.args[0]))
+						return {}
+					raise e
+
+		return {row.get(self.Key): row for row in result}
+
 	async def _count(self):
 		query = self.QueryCount.format(self.From)
 		async with self.Connection.acquire_connection() as connection:
@@ -131,7 +148,7 @@ The MySQLLookup can be then located and used inside a custom enricher:
 			value = self.Cache[key]
 			self.CacheCounter.add('hit', 1)
 		except KeyError:
-			value = await self._find_one(key)
+			value = await self.fetch(key)
 			self.Cache[key] = value
 			self.CacheCounter.add('miss', 1)
 
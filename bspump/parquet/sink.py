@@ -1,6 +1,10 @@
+import collections
+import datetime
+import decimal
 import logging
 import os
 import json
+import threading
 from asab.timer import Timer
 import pyarrow as pa
 import pyarrow.parquet as pq
@@ -32,6 +36,13 @@ class ParquetSink(Sink):
 				"type": "float"
 			}
 		}
+
+	With `mode` set to `arrow`, events are appended directly to columns derived from the schema file
+	(which is then required) and each chunk of `rows_in_chunk` rows is converted to a `pyarrow.RecordBatch` at once,
+	instead of building a pandas DataFrame for every event.
+	Writing to the Parquet file (`compression`, `row_group_size`, `use_dictionary`) runs in a thread of `asab.ProactorService`.
+	Item types of `list` and `array` columns can be specified by the `items` key (`string` by default),
+	`decimal` columns by `precision` and `scale` keys (38 and 9 by default).
 	"""
 
 	ConfigDefaults = {
@@ -40,6 +51,10 @@ class ParquetSink(Sink):
 		'rows_per_file': 10000,
 		'writing_period': '1d',  # only used if rollover_mechanism == 'time', valid units are s, m, h, d, w
 		'file_name_template': './sink{index}.parquet',
+		'mode': 'pandas',  # or arrow
+		'compression': 'snappy',  # only used if mode == 'arrow', e.g. none, snappy, gzip, zstd, lz4, brotli
+		'row_group_size': 0,  # only used if mode == 'arrow', maximal number of rows in a row group, 0 means the chunk size
+		'use_dictionary': 'yes',  # only used if mode == 'arrow', 'yes', 'no' or a comma-separated list of columns
 	}
 
 	def __init__(self, app, pipeline, id=None, config=None):
@@ -112,6 +127,14 @@ class ParquetSink(Sink):
 
 		self._pq_writer = None
 
+		self.Mode = self.Config['mode'].lower()
+		if self.Mode == 'arrow':
+			if not self.SchemaDefined:
+				raise RuntimeError("ParquetSink in the 'arrow' mode requires a valid 'schema_file'")
+			self._init_arrow(app)
+		elif self.Mode != 'pandas':
+			raise RuntimeError("Unknown mode '{}'".format(self.Mode))
+
 	def schema_validator(self, schema):
 
 		if schema is not None:
@@ -194,6 +217,10 @@ class ParquetSink(Sink):
 
 	def process(self, context, event):
 
+		if self.Mode == 'arrow':
+			self._process_arrow(event)
+			return
+
 		if self.SchemaDefined:
 			df = self.apply_schema(event)
 		else:
@@ -209,6 +236,10 @@ class ParquetSink(Sink):
 			self.flush()
 
 	def flush(self):
+		if self.Mode == 'arrow':
+			self._flush_arrow()
+			return
+
 		if len(self.Frames) != 0:
 			table = pa.Table.from_pandas(pd.concat(self.Frames))
 			if self._pq_writer is None:
@@ -227,6 +258,13 @@ class ParquetSink(Sink):
 			Call this to close the currently open file.
 		'''
 
+		if self.Mode == 'arrow':
+			self._flush_arrow()
+			self._enqueue(('rotate', None))
+			if self.RolloverMechanism == 'rows':
+				self.Chunks = 0
+			return
+
 		self.flush()
 		del self._pq_writer
 		self._pq_writer = None
@@ -238,3 +276,174 @@ class ParquetSink(Sink):
 			self.Chunks = 0
 
 		self.Index = self.Index + 1
+
+	# Arrow mode
+
+	def _init_arrow(self, app):
+		self.ProactorService = app.get_service('asab.ProactorService')
+
+		fields = []
+		self.Converters = []
+		for name, descr in self.Schema.items():
+			arrow_type, converter = self._arrow_type(descr)
+			fields.append(pa.field(name, arrow_type))
+			self.Converters.append((name, converter))
+		self.ArrowSchema = pa.schema(fields)
+		self.ColumnNames = frozenset(self.Schema.keys())
+		self.Columns = [[] for _ in self.Converters]
+		self.Rows = 0
+
+		self.Compression = self.Config['compression']
+		if self.Compression.lower() == 'none':
+			self.Compression = None
+		self.RowGroupSize = int(self.Config['row_group_size'])
+		if self.RowGroupSize <= 0:
+			self.RowGroupSize = None
+
+		use_dictionary = self.Config['use_dictionary'].strip()
+		if use_dictionary.lower() in ('yes', 'true', '1', 'on'):
+			self.UseDictionary = True
+		elif use_dictionary.lower() in ('no', 'false', '0', 'off', ''):
+			self.UseDictionary = False
+		else:
+			self.UseDictionary = [column.strip() for column in use_dictionary.split(',')]
+
+		# Operations on the file are done by a worker thread in the order they were enqueued
+		self.Pending = collections.deque()
+		self.WriterLock = threading.Lock()
+		self.WriterFuture = None
+		app.PubSub.subscribe("Application.exit!", self._on_exit_arrow)
+
+	def _arrow_type(self, descr):
+		value_type = descr['type']
+
+		if value_type == 'string':
+			return pa.string(), _converter(str)
+		if value_type == 'int':
+			return pa.int64(), _converter(int, lambda value: int(float(value)))
+		if value_type == 'float':
+			return pa.float64(), _converter(float)
+		if value_type == 'bool':
+			return pa.bool_(), _converter(bool, lambda value: False if type(value) is str and value.lower() == 'false' else bool(value))
+		if value_type in ('list', 'array'):
+			item_type, _ = self._arrow_type({'type': descr.get('items', 'string')})
+			return pa.list_(item_type), None
+		if value_type == 'decimal':
+			return pa.decimal128(int(descr.get('precision', 38)), int(descr.get('scale', 9))), _converter(decimal.Decimal, lambda value: decimal.Decimal(str(value)))
+		if value_type == 'date':
+			return pa.date32(), _converter(datetime.date, lambda value: value.date() if isinstance(value, datetime.datetime) else datetime.date.fromisoformat(value))
+		if value_type == 'time':
+			return pa.time64('us'), _converter(datetime.time, datetime.time.fromisoformat)
+		if value_type == 'bytearray':
+			return pa.binary(), _converter(bytes, lambda value: value.encode('utf-8') if type(value) is str else bytes(value))
+
+		raise RuntimeError("Unknown type '{}'".format(value_type))
+
+	def _process_arrow(self, event):
+		matched = 0
+		for column, (name, converter) in zip(self.Columns, self.Converters):
+			value = event.get(name)
+
+			if value is None:
+				self.MissingSet.add(name)
+			else:
+				matched += 1
+				if converter is not None:
+					try:
+						value = converter(value)
+					except (ValueError, TypeError, ArithmeticError):
+						self.Counter.add('parquet.error', 1)
+						value = None
+
+			column.append(value)
+
+		if len(event) > matched:
+			self.NewSet.update(key for key in event if key not in self.ColumnNames)
+
+		self.Rows += 1
+		if self.RolloverMechanism == 'rows' and self.Rows >= self.ChunkSize:
+
+			self.Chunks = self.Chunks + 1
+			if self.Chunks >= self.ChunksPerFile:
+				self.rotate()
+			else:
+				self.flush()
+
+	def _flush_arrow(self):
+		if self.Rows == 0:
+			return
+
+		try:
+			batch = pa.RecordBatch.from_arrays(
+				[pa.array(column, type=field.type) for column, field in zip(self.Columns, self.ArrowSchema)],
+				schema=self.ArrowSchema
+			)
+		except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+			self.Counter.add('parquet.error', self.Rows)
+			L.warning("Failed to build a record batch: {}".format(e))
+			batch = None
+
+		self.Columns = [[] for _ in self.Converters]
+		self.Rows = 0
+
+		if batch is not None:
+			self._enqueue(('write', batch))
+
+	def _enqueue(self, operation):
+		# Each call drains the whole queue under the lock, so the order of operations is kept
+		self.Pending.append(operation)
+		self.WriterFuture = self.ProactorService.execute(self._write_pending)
+
+	def _write_pending(self):
+		with self.WriterLock:
+			while len(self.Pending) > 0:
+				operation, batch = self.Pending.popleft()
+				try:
+					if operation == 'write':
+						self._write_batch(batch)
+					else:
+						self._rotate_file()
+				except Exception as e:
+					L.warning("Failed to {} the parquet file: {}".format(operation, e))
+
+	def _write_batch(self, batch):
+		if self._pq_writer is None:
+			self._pq_writer = pq.ParquetWriter(
+				self.build_filename('-open'),
+				self.ArrowSchema,
+				compression=self.Compression,
+				use_dictionary=self.UseDictionary,
+			)
+		self._pq_writer.write_table(pa.Table.from_batches([batch]), row_group_size=self.RowGroupSize)
+
+	def _rotate_file(self):
+		if self._pq_writer is None:
+			return
+
+		self._pq_writer.close()
+		self._pq_writer = None
+
+		current_fname = self.build_filename('-open')
+		os.rename(current_fname, current_fname[:-5])
+		self.Index = self.Index + 1
+
+	def _on_exit_arrow(self, event_name):
+		# The rest of rows is written and the file is closed, so that it is readable
+		self._flush_arrow()
+		self._write_pending()
+		with self.WriterLock:
+			if self._pq_writer is not None:
+				self._pq_writer.close()
+				self._pq_writer = None
+
+
+def _converter(python_type, convert=None):
+	if convert is None:
+		convert = python_type
+
+	def converter(value):
+		if type(value) is python_type:
+			return value
+		return convert(value)
+
+	return converter
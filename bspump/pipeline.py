@@ -13,6 +13,7 @@ import asab
 import asab.api
 from .abc.connection import Connection
 from .abc.generator import Generator
+from .abc.processor import ProcessorBase
 from .abc.sink import Sink
 from .abc.source import Source
 from .analyzer import Analyzer
@@ -46,6 +47,10 @@ class Pipeline(abc.ABC, asab.Configurable):
 						bspump.common.NullSink(app, self),
 					)
 
+	The :meth:`Pipeline <bspump.Pipeline()>` can run in a compiled mode (`compiled=yes` in its configuration).
+	Processors are then called through a specialized call chain, which updates metrics only on the metrics flush
+	and profiles only every `profiler_sampling`-th event.
+
 	"""
 
 
@@ -53,6 +58,8 @@ class Pipeline(abc.ABC, asab.Configurable):
 	ConfigDefaults = {
 		"async_concurency_limit": 1000,  # TODO concurrency
 		"reset_profiler": True,
+		"compiled": False,  # Use the compiled processor chain instead of the fully instrumented one
+		"profiler_sampling": 1000,  # In the compiled mode, only every n-th event is profiled
 	}
 
 	def __init__(self, app, id=None, config=None):
@@ -91,6 +98,10 @@ class Pipeline(abc.ABC, asab.Configurable):
 		self.ResetProfiler = self.Config.getboolean("reset_profiler")
 		assert (self.AsyncConcurencyLimit > 1)
 
+		self.Compiled = self.Config.getboolean("compiled")
+		self.ProfilerSampling = int(self.Config["profiler_sampling"])
+		assert (self.ProfilerSampling > 0)
+
 		# This object serves to identify the throttler, because list cannot be used as a throttler
 		self.AsyncFuturesThrottler = object()
 
@@ -134,6 +145,11 @@ class Pipeline(abc.ABC, asab.Configurable):
 		self.ProcessorsEPSMetrics = {}
 		self.ProcessorsCounter = {}
 
+		# Compiled processor chains, one per depth, see `_compile()`
+		self.CompiledChains = None
+		self._compiled_counters = []
+		self._compiled_event_in = 0
+
 		app.PubSub.subscribe(
 			"Metrics.flush!",
 			self._on_metrics_flush
@@ -197,6 +213,8 @@ class Pipeline(abc.ABC, asab.Configurable):
 
 		:return: xxxx
 		"""
+		self._fold_compiled_counters()
+
 		for field in self.MetricsCounter.Storage["fieldset"]:
 			values = field["values"]
 			if values["event.in"] == 0:
@@ -493,6 +511,223 @@ class Pipeline(abc.ABC, asab.Configurable):
 			ProcessingError("Incomplete pipeline, event '{}' is not consumed by a Sink".format(event))
 		)
 
+	def _do_process_batch(self, events, depth, context):
+		"""
+		Description: Batch counterpart of `_do_process()`.
+
+		Processors that do not implement `process_batch()` are called for each event separately,
+		so that a soft error in one event does not discard the rest of the batch.
+		A hard error (see `handle_error()`) stops the processing of the rest of the batch.
+		`handle_error()` receives a single event, the first event of the batch when `process_batch()` fails.
+
+		:return:
+		"""
+		last_depth = len(self.Processors) == (depth + 1)
+
+		for processor in self.Processors[depth]:
+			count_in = len(events)
+			if count_in == 0:
+				return
+
+			counter = self.ProcessorsCounter[processor.Id]
+			counter.add('event.in', count_in)
+			errors = 0
+
+			t0 = time.perf_counter()
+			if type(processor).process_batch is ProcessorBase.process_batch:
+				processed = []
+				for i, event in enumerate(events):
+					try:
+						event = processor.process(context, event)
+					except BaseException as e:
+						errors += 1
+						if depth > 0:
+							raise  # Handle error on the top depth
+						self.set_error(context, event, e)
+						if self._error is not None:
+							# Hard error stops the pipeline, the rest of the batch is dropped
+							# (events processed before the error continue, as in `_do_process()`)
+							errors += count_in - i - 1
+							break
+						continue
+					if event is not None:
+						processed.append(event)
+				events = processed
+
+			else:
+				try:
+					events = processor.process_batch(context, events)
+				except BaseException as e:
+					errors = count_in
+					if depth > 0:
+						raise  # Handle error on the top depth
+					# The failing event is not known, the first event of the batch represents it
+					self.set_error(context, events[0], e)
+					events = []
+
+			self.ProfilerCounter[processor.Id].add('duration', time.perf_counter() - t0)
+			self.ProfilerCounter[processor.Id].add('run', count_in)
+
+			processor.EventCount += count_in - errors
+			counter.add('event.out', count_in)
+			if errors > 0:
+				counter.add('event.drop', errors)
+
+			if self.MQTTService and self.PublishingProcessors.get(processor.Id, 0) > 0:
+				for event in events[:self.PublishingProcessors[processor.Id]]:
+					self.MQTTService.publish_event(self.Id, processor, event, self.PublishingProcessors[processor.Id])
+					self.PublishingProcessors[processor.Id] -= 1
+
+			consumed = count_in - len(events)
+			if consumed > 0 and last_depth:
+				if isinstance(processor, Sink):
+					self.MetricsEPSCounter.add('eps.out', consumed)
+					self.MetricsCounter.add('event.out', consumed)
+				else:
+					counter.add('event.drop', consumed)
+					self.MetricsEPSCounter.add('eps.drop', consumed)
+					self.MetricsCounter.add('event.drop', consumed)
+
+		if len(events) == 0:
+			return
+
+		self.set_error(
+			context,
+			events[0],
+			ProcessingError("Incomplete pipeline, {} event(s) are not consumed by a Sink".format(len(events)))
+		)
+
+	def _compile(self):
+		"""
+		Rebuilds compiled processor chains, one for each depth of the :meth:`Pipeline <bspump.Pipeline()>`.
+		It is called every time the :meth:`Processors <bspump.Processor()>` of the :meth:`Pipeline <bspump.Pipeline()>` change.
+
+		:hint: The compiled mode is enabled by the `compiled` configuration option.
+
+		"""
+		if not self.Compiled:
+			return
+
+		# Counts accumulated by the old chains must not be lost
+		self._fold_compiled_counters()
+		self._compiled_counters = []
+
+		self.CompiledChains = [self._compile_chain(depth) for depth in range(len(self.Processors))]
+
+	def _compile_chain(self, depth):
+		"""
+		Builds a call chain specialized for :meth:`Processors <bspump.Processor()>` in a given depth.
+
+		The chain calls processors directly and it only records, in plain integers, where each event stopped.
+		Processor and pipeline counters are derived from these records in `_fold_compiled_counters()` during the metrics flush.
+		Every `profiler_sampling`-th event (and every event while MQTT publishing is requested) is processed
+		by the fully instrumented `_do_process()` instead, so the profiler still receives sampled durations.
+
+		**Parameters**
+
+		depth : int
+				Level of depth.
+
+		:return: a callable with the `(event, context)` signature.
+
+		"""
+		processors = tuple(self.Processors[depth])
+		chain = tuple(enumerate(processor.process for processor in processors))
+
+		stops = [0] * (len(processors) + 1)  # The last item counts events that were not consumed by any processor
+		errors = [0] * len(processors)
+		self._compiled_counters.append((depth, processors, stops, errors, len(self.Processors) == (depth + 1)))
+
+		do_process = self._do_process
+		set_error = self.set_error
+		mqtt_service = self.MQTTService
+		publishing_processors = self.PublishingProcessors
+		sampling = self.ProfilerSampling
+		countdown = sampling
+
+		def compiled_chain(event, context):
+			nonlocal countdown
+
+			countdown -= 1
+			if countdown == 0:
+				countdown = sampling
+				do_process(event, depth, context)
+				return
+
+			if mqtt_service is not None and any(count > 0 for count in publishing_processors.values()):
+				do_process(event, depth, context)
+				return
+
+			idx = 0
+			try:
+				for idx, process in chain:
+					event = process(context, event)
+					if event is None:  # Event has been consumed on the way
+						stops[idx] += 1
+						return
+
+			except BaseException as e:
+				errors[idx] += 1
+				if depth > 0:
+					raise  # Handle error on the top depth
+				set_error(context, event, e)
+				return
+
+			stops[-1] += 1
+			set_error(
+				context,
+				event,
+				ProcessingError("Incomplete pipeline, event '{}' is not consumed by a Sink".format(event))
+			)
+
+		return compiled_chain
+
+	def _fold_compiled_counters(self):
+		"""
+		Adds counts accumulated by compiled chains to pipeline and processor metrics and resets them.
+
+		"""
+		if self._compiled_event_in > 0:
+			self.MetricsEPSCounter.add('eps.in', self._compiled_event_in)
+			self.MetricsCounter.add('event.in', self._compiled_event_in)
+			self._compiled_event_in = 0
+
+		for depth, processors, stops, errors, last_depth in self._compiled_counters:
+			reached = stops[-1]
+			for idx in range(len(processors) - 1, -1, -1):
+				processor = processors[idx]
+				# Events that reached this processor are those that stopped here or in any of following processors
+				reached += stops[idx] + errors[idx]
+				if reached == 0:
+					continue
+
+				processor.EventCount += reached - errors[idx]
+
+				counter = self.ProcessorsCounter[processor.Id]
+				counter.add('event.in', reached)
+				counter.add('event.out', reached)
+				if errors[idx] > 0:
+					counter.add('event.drop', errors[idx])
+
+				if not last_depth:
+					continue
+
+				# Errors on the top depth discard the event, see `_do_process()`
+				consumed = stops[idx] + (errors[idx] if depth == 0 else 0)
+				if consumed == 0:
+					continue
+
+				if isinstance(processor, Sink):
+					self.MetricsEPSCounter.add('eps.out', consumed)
+					self.MetricsCounter.add('event.out', consumed)
+				else:
+					counter.add('event.drop', consumed)
+					self.MetricsEPSCounter.add('eps.drop', consumed)
+					self.MetricsCounter.add('event.drop', consumed)
+
+			stops[:] = [0] * len(stops)
+			errors[:] = [0] * len(errors)
+
 	def inject(self, context, event, depth):
 		"""
 		Injects method serves to inject events into the :meth:`Pipeline <bspump.Pipeline()>`'s depth defined by the depth attribute.
@@ -519,7 +754,10 @@ class Pipeline(abc.ABC, asab.Configurable):
 			context = context.copy()
 			context.update(self._context)
 
-		self._do_process(event, depth, context)
+		if self.CompiledChains is not None:
+			self.CompiledChains[depth](event, context)
+		else:
+			self._do_process(event, depth, context)
 
 	async def process(self, event, context=None):
 		"""
@@ -541,13 +779,70 @@ class Pipeline(abc.ABC, asab.Configurable):
 		while not self.is_ready():
 			await self.ready()
 
-		self.MetricsEPSCounter.add('eps.in', 1)
-		self.MetricsCounter.add('event.in', 1)
+		if self.CompiledChains is not None:
+			self._compiled_event_in += 1
+		else:
+			self.MetricsEPSCounter.add('eps.in', 1)
+			self.MetricsCounter.add('event.in', 1)
 
 		self.inject(context, event, depth=0)
 
 
 
+	def inject_batch(self, context, events, depth):
+		"""
+		Injects a list of events into the :meth:`Pipeline <bspump.Pipeline()>`'s depth defined by the depth attribute.
+		All events of the batch share one copy of the context.
+
+		**Parameters**
+
+		context : dict
+				Information propagated through the :meth:`Pipeline <bspump.Pipeline()>`.
+
+		events : list
+				List of events.
+
+		depth : int
+				Level of depth.
+
+		:note: For normal operations, it is highly recommended to use process_batch method instead.
+
+		"""
+
+		if context is None:
+			context = self._context.copy()
+		else:
+			context = context.copy()
+			context.update(self._context)
+
+		self._do_process_batch(events, depth, context)
+
+	async def process_batch(self, events, context=None):
+		"""
+		Process batch method serves to inject a list of events into the :meth:`Pipeline <bspump.Pipeline()>`'s depth 0.
+		The readiness check, the context copy and metric updates are done once per batch instead of once per event.
+
+		:meth:`Processors <bspump.Processor()>` can implement `process_batch(context, events)` to work on the whole batch,
+		other processors are called for each event of the batch.
+
+		**Parameters**
+
+		events : list
+				List of events.
+
+		context : dict, default None
+				Additional information shared by all events of the batch.
+
+		"""
+
+		while not self.is_ready():
+			await self.ready()
+
+		self.MetricsEPSCounter.add('eps.in', len(events))
+		self.MetricsCounter.add('event.in', len(events))
+
+		self.inject_batch(context, events, depth=0)
+
 	def create_eps_counter(self):
 		"""
 		Creates a dictionary with information about the :meth:`Pipeline <bspump.Pipeline()>`. It contains eps (events per second), warnings and errors.
@@ -678,11 +973,13 @@ class Pipeline(abc.ABC, asab.Configurable):
 			for idx, processor in enumerate(depth):
 				if processor.Id != processor_id:
 					continue
+				self._fold_compiled_counters()
 				del depth[idx]
 				del self.ProfilerCounter[processor.Id]
 				del self.ProcessorsEPSMetrics[processor.Id]
 				if isinstance(processor, Analyzer):
 					del self.ProfilerCounter['analyzer_' + processor.Id]
+				self._compile()
 				return
 		raise KeyError("Cannot find processor '{}'".format(processor_id))
 
@@ -788,6 +1085,8 @@ class Pipeline(abc.ABC, asab.Configurable):
 			self.PublishingProcessors[processor.Id] = 0
 			self.MQTTService.subscribe(self.Id, processor.Id)
 
+		self._compile()
+
 	def build(self, source, *processors):
 		"""
 		This method enables to add sources, :meth:`Processors <bspump.Processor()>`, and sink to create the structure of the :meth:`Pipeline <bspump.Pipeline()>`.
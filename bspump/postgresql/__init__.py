@@ -1,5 +1,6 @@
 from .connection import PostgreSQLConnection
 from .sink import PostgreSQLSink
+from .statement import CopyStatement, InsertStatement
 from .logicalreplicationsource import PostgreSQLLogicalReplicationSource
 from .lookup import PostgreSQLLookup
 from .source import PostgreSQLSource
@@ -7,6 +8,8 @@ from .source import PostgreSQLSource
 __all__ = (
 	'PostgreSQLConnection',
 	'PostgreSQLSink',
+	'CopyStatement',
+	'InsertStatement',
 	'PostgreSQLLogicalReplicationSource',
 	'PostgreSQLLookup',
 	'PostgreSQLSource',
@@ -1,5 +1,7 @@
 import asyncio
+import io
 import logging
+import threading
 
 import aiopg
 import aiopg.utils
@@ -7,16 +9,36 @@ import aiopg.utils
 import psycopg2
 import psycopg2.errorcodes
 import psycopg2.extras
+import psycopg2.pool
 
-import asab
 from ..abc.connection import Connection
+from .statement import CopyStatement, InsertStatement
 
 
 L = logging.getLogger(__name__)
 
 
 class PostgreSQLConnection(Connection):
+	"""
+	Description: Connection to PostgreSQL.
 
+	Rows passed to `consume()` are collected in bulks per query, a bulk is sent to the database,
+	when it reaches `max_bulk_size` rows or on the application tick (every second).
+	The query can be:
+
+	- a query string, that is executed for each row; rows before a failing one are stored, the rest of the bulk is dropped,
+	- `InsertStatement`, that inserts all rows by a single multi-row `INSERT`,
+	- `CopyStatement`, that loads all rows by `COPY ... FROM STDIN`.
+
+	COPY is not supported by asynchronous connections, so it is executed on a pooled synchronous connection
+	in a thread of `asab.ProactorService`.
+
+	`InsertStatement` and `CopyStatement` are atomic, a single invalid row drops the whole bulk (the number of dropped rows is logged).
+
+	When more than `output_queue_max_size` bulks wait for the database, `PostgreSQLConnection.pause!` is published,
+	so that sinks throttle their pipelines.
+
+	"""
 
 	ConfigDefaults = {
 		'host': '127.0.0.1',
@@ -27,7 +49,8 @@ class PostgreSQLConnection(Connection):
 		'connect_timeout': 60,
 		'reconnect_delay': 5.0,
 		'output_queue_max_size': 10,
-		'max_bulk_size': 1,  # This is because execute many is not supported by aiopg
+		'max_bulk_size': 1,  # Number of rows sent to the database at once
+		'copy_pool_size': 2,  # Maximal number of synchronous connections used by COPY
 	}
 
 	# This is just guess work based on the existing MySQL retryables
@@ -50,8 +73,9 @@ class PostgreSQLConnection(Connection):
 		self.ConnectionEvent = asyncio.Event()
 		self.ConnectionEvent.clear()
 
-		self.PubSub = asab.PubSub(app)
+		self.PubSub = app.PubSub
 		self.Loop = app.Loop
+		self.ProactorService = app.get_service('asab.ProactorService')
 
 		self._host = self.Config['host']
 		self._port = int(self.Config['port'])
@@ -60,18 +84,22 @@ class PostgreSQLConnection(Connection):
 		self._connect_timeout = self.Config['connect_timeout']
 		self._db = self.Config['db']
 		self._reconnect_delay = self.Config['reconnect_delay']
-		self._output_queue_max_size = self.Config['output_queue_max_size']
+		self._output_queue_max_size = int(self.Config['output_queue_max_size'])
 		self._max_bulk_size = int(self.Config['max_bulk_size'])
+		self._copy_pool_size = int(self.Config['copy_pool_size'])
 
 		self._conn_sync = None
 		self._conn_future = None
 		self._connection_request = False
 		self._pause = False
+		self._copy_pool = None
+		self._copy_pool_lock = threading.Lock()
 
 		# Subscription
 		self._on_health_check('connection.open!')
 		app.PubSub.subscribe("Application.stop!", self._on_application_stop)
 		app.PubSub.subscribe("Application.tick!", self._on_health_check)
+		app.PubSub.subscribe("Application.tick!", self._on_tick)
 		app.PubSub.subscribe("PostgreSQLConnection.pause!", self._on_pause)
 		app.PubSub.subscribe("PostgreSQLConnection.unpause!", self._on_unpause)
 
@@ -79,21 +107,29 @@ class PostgreSQLConnection(Connection):
 		self._bulks = {}  # We have a "bulk" per query
 
 
-	def _on_pause(self):
-		self._pause = True
+	def _on_pause(self, event_type, connection):
+		if connection is self:
+			self._pause = True
+
+	def _on_unpause(self, event_type, connection):
+		if connection is self:
+			self._pause = False
 
-	def _on_unpause(self):
-		self._pause = False
+
+	def _on_tick(self, message_type):
+		if not self._pause:
+			self._flush()
 
 
 	def _flush(self):
-		for query in self._bulks.keys():
+		for query, bulk in self._bulks.items():
 			# Break if throttling was requested during the flush,
 			# so that put_nowait doesn't raise
 			if self._pause:
 				break
 
-			self._flush_bulk(query)
+			if len(bulk) > 0:
+				self._flush_bulk(query)
 
 	def _flush_bulk(self, query):
 
@@ -176,7 +212,10 @@ class PostgreSQLConnection(Connection):
 				self._conn_pool = pool
 				self.ConnectionEvent.set()
 
-				await self._loader()
+				try:
+					await self._loader()
+				finally:
+					self._close_copy_pool()
 
 		except (psycopg2.OperationalError, psycopg2.ProgrammingError, psycopg2.InternalError) as e:
 			if e.pgcode in self.RetryErrors:
@@ -243,6 +282,18 @@ class PostgreSQLConnection(Connection):
 
 
 	def consume(self, query, data):
+		"""
+		Description: Adds a row to the bulk of the query.
+
+		**Parameters**
+
+		query : str, InsertStatement or CopyStatement
+				Query string with placeholders or a bulk statement.
+
+		data : tuple
+				Values of the row.
+
+		"""
 		# Create a bulk for this query if doesn't yet exist
 		if query not in self._bulks:
 			self._bulks[query] = []
@@ -265,14 +316,62 @@ class PostgreSQLConnection(Connection):
 			if self._output_queue.qsize() == self._output_queue_max_size - 1:
 					self.PubSub.publish("PostgreSQLConnection.unpause!", self, asynchronously=True)
 
+			if isinstance(query, CopyStatement):
+				try:
+					await self.ProactorService.execute(self._copy, query, query.render(data))
+				except BaseException:
+					L.exception("Unexpected error when processing PostgreSQL COPY, {} rows were dropped.".format(len(data)))
+				continue
+
 			try:
 				async with self.acquire() as conn:
 					try:
 						async with conn.cursor() as cur:
-							for item in data:
-								_query = cur.mogrify(query, item)
-								await cur.execute(_query)
+							if isinstance(query, InsertStatement):
+								await cur.execute(query.render(cur, data))
+							else:
+								# Each row is a separate (autocommitted) statement,
+								# so rows before a failing one are stored
+								for item in data:
+									_query = cur.mogrify(query, item)
+									await cur.execute(_query)
 					except BaseException:
-						L.exception("Unexpected error when processing PostgreSQL query.")
+						if isinstance(query, InsertStatement):
+							L.exception("Unexpected error when processing PostgreSQL INSERT, {} rows were dropped.".format(len(data)))
+						else:
+							L.exception("Unexpected error when processing PostgreSQL query.")
 			except BaseException:
 				L.exception("Couldn't acquire connection")
+
+
+	def _copy(self, statement, payload):
+		"""
+		Description: Executes the `COPY` statement on a pooled synchronous connection, called in a thread.
+
+		"""
+		with self._copy_pool_lock:
+			if self._copy_pool is None:
+				self._copy_pool = psycopg2.pool.ThreadedConnectionPool(
+					0, self._copy_pool_size,
+					dsn=self.build_dsn(),
+					connect_timeout=self._connect_timeout
+				)
+			pool = self._copy_pool
+
+		conn = pool.getconn()
+		try:
+			with conn.cursor() as cur:
+				cur.copy_expert(statement.Query, io.BytesIO(payload))
+			conn.commit()
+		except BaseException:
+			conn.rollback()
+			raise
+		finally:
+			pool.putconn(conn, close=conn.closed != 0)
+
+
+	def _close_copy_pool(self):
+		with self._copy_pool_lock:
+			if self._copy_pool is not None:
+				self._copy_pool.closeall()
+				self._copy_pool = None
@@ -23,7 +23,7 @@ PostgreSQLLookup feeds lookup data from PostgreSQL database using a query.
 PostgreSQLLookup also has a simple cache to reduce a number of database hits.
 
 PostgreSQLLookup allows to specify custom cache strategy via `cache` parameter, as shown in the example below.
-LRUCacheDict removes last used elements, if the time they were lastly used exceeds the specified `max_duration` or the cache dictionary exceeds `max_size`.
+LRUCacheDict removes least recently used elements, if the cache dictionary exceeds `max_size`, and elements written more than `max_duration` seconds ago.
 For more information, please see: https://en.wikipedia.org/wiki/Cache_replacement_policies#Least_recently_used_(LRU)
 
 First, it is needed to create PostgreSQLLookup instance and register it inside the BSPump service:
@@ -72,6 +72,7 @@ The PostgreSQLLookup can be then located and used inside a custom enricher:
 		'from': '',  # Specify the FROM object, which can be a table or a query string
 		'key': '',  # Specify key name used for search
 		'query_find_one': 'SELECT {} FROM {} WHERE {}=%s;',  # Specify query string to find one record in database using key
+		'query_find_many': 'SELECT {} FROM {} WHERE {} IN %s;',  # Specify query string to find records of more keys (see `batch_size`)
 		'query_count': 'SELECT COUNT(*) as \"count\" FROM {};',  # Specify query string to count number of records in the database
 		'query_iter': 'SELECT {} FROM {};',  # Specify general query string for the iterator
 	}
@@ -85,6 +86,7 @@ The PostgreSQLLookup can be then located and used inside a custom enricher:
 		self.Key = self.Config['key']
 
 		self.QueryFindOne = self.Config['query_find_one']
+		self.QueryFindMany = self.Config['query_find_many']
 		self.QueryCount = self.Config['query_count']
 		self.QueryIter = self.Config['query_iter']
 
@@ -112,6 +114,22 @@ The PostgreSQLLookup can be then located and used inside a custom enricher:
 						return None
 					raise e
 
+	async def _fetch_many(self, keys):
+		query = self.QueryFindMany.format(self.Statement, self.From, self.Key)
+		async with self.Connection.acquire() as connection:
+			async with connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor_async:
+				try:
+					# psycopg2 adapts a tuple to the list of values for IN
+					await cursor_async.execute(query, (tuple(keys),))
+					result = await cursor_async.fetchall()
+				except (psycopg2.OperationalError, psycopg2.ProgrammingError, psycopg2.InternalError) as e:
+					if e.pgcode in self.Connection.RetryErrors:
+						L.warning("Recoverable error '{}' ({}) occurred in PostgreSQLLookup. Skipping lookup.".format(e.pgerror, e.pgcode))
+						return {}
+					raise e
+
+		return {row.get(self.Key): row for row in result}
+
 	async def _count(self):
 		query = self.QueryCount.format(self.From)
 		async with self.Connection.acquire() as connection:
@@ -129,7 +147,7 @@ The PostgreSQLLookup can be then located and used inside a custom enricher:
 			value = self.Cache[key]
 			self.CacheCounter.add('hit', 1)
 		except KeyError:
-			value = await self._find_one(key)
+			value = await self.fetch(key)
 			self.Cache[key] = value
 			self.CacheCounter.add('miss', 1)
 
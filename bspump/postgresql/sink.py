@@ -1,12 +1,28 @@
 from ..abc.sink import Sink
+from .statement import CopyStatement, InsertStatement
 
 
 class PostgreSQLSink(Sink):
+	"""
+	Description: Writes events to PostgreSQL.
 
+	Values of the `data` keys of the event form a row, that is written according to the `mode`:
+
+	- `query` executes the `query` with the row as parameters,
+	- `insert` inserts rows into the `table` by multi-row `INSERT` statements,
+	- `copy` loads rows into the `table` by `COPY ... FROM STDIN` in the `copy_format` (`csv` or `binary`).
+
+	Rows are sent in bulks of `max_bulk_size` of the connection, see `PostgreSQLConnection`.
+	In the `insert` and `copy` modes, the `data` keys are also names of columns of the `table`.
+
+	"""
 
 	ConfigDefaults = {
 		'query': '',
 		'data': '',
+		'mode': 'query',  # 'query', 'insert' or 'copy'
+		'table': '',  # Table for the 'insert' and 'copy' modes
+		'copy_format': 'csv',  # 'csv' or 'binary'
 	}
 
 
@@ -14,8 +30,17 @@ class PostgreSQLSink(Sink):
 		super().__init__(app, pipeline, id=id, config=config)
 
 		self._connection = pipeline.locate_connection(app, connection)
-		self._query = self.Config['query']
-		self._data_keys = self.Config['data'].split(',')
+		self._data_keys = [key.strip() for key in self.Config['data'].split(',')]
+
+		mode = self.Config['mode'].lower()
+		if mode == 'query':
+			self._query = self.Config['query']
+		elif mode == 'insert':
+			self._query = InsertStatement(self.Config['table'], self._data_keys)
+		elif mode == 'copy':
+			self._query = CopyStatement(self.Config['table'], self._data_keys, self.Config['copy_format'])
+		else:
+			raise RuntimeError("Unknown mode '{}'".format(mode))
 
 		app.PubSub.subscribe("PostgreSQLConnection.pause!", self._connection_throttle)
 		app.PubSub.subscribe("PostgreSQLConnection.unpause!", self._connection_throttle)
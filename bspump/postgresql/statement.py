@@ -0,0 +1,119 @@
+import io
+import math
+import struct
+
+
+class InsertStatement(object):
+	"""
+	Description: Multi-row `INSERT INTO table (columns) VALUES (...), (...), ...` statement.
+
+	It can be passed to `PostgreSQLConnection.consume()` instead of a query string,
+	the whole bulk of rows is then inserted by a single statement.
+
+	"""
+
+	def __init__(self, table, columns):
+		self.Table = table
+		self.Columns = tuple(columns)
+		self.Query = "INSERT INTO {} ({}) VALUES ".format(table, ", ".join(self.Columns))
+		self.Row = "({})".format(", ".join(["%s"] * len(self.Columns)))
+
+
+	def render(self, cursor, rows):
+		"""
+		Description: Renders the statement for `rows` using `cursor.mogrify()`.
+
+		:return: bytes
+
+		"""
+		return self.Query.encode('utf-8') + b", ".join(cursor.mogrify(self.Row, row) for row in rows)
+
+
+class CopyStatement(object):
+	"""
+	Description: `COPY table (columns) FROM STDIN` statement.
+
+	It can be passed to `PostgreSQLConnection.consume()` instead of a query string,
+	the whole bulk of rows is then loaded by a single `COPY`, which is the fastest way to insert rows into PostgreSQL.
+
+	The `csv` format supports all types that PostgreSQL can parse from text, `None` is written as NULL and bytes in the hex format of `bytea`.
+	The `binary` format is faster, but Python values are encoded to fixed PostgreSQL types, so the columns have to be:
+	`bigint` for int, `double precision` for float, `boolean` for bool, `text` (or `varchar`) for str and `bytea` for bytes.
+
+	"""
+
+	BinaryHeader = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+	BinaryTrailer = struct.pack('>h', -1)
+
+	def __init__(self, table, columns, format='csv'):
+		self.Table = table
+		self.Columns = tuple(columns)
+		self.Format = format.lower()
+
+		if self.Format == 'csv':
+			self.render = self._render_csv
+		elif self.Format == 'binary':
+			self.render = self._render_binary
+		else:
+			raise RuntimeError("Unknown COPY format '{}'".format(format))
+
+		self.Query = "COPY {} ({}) FROM STDIN WITH (FORMAT {})".format(table, ", ".join(self.Columns), self.Format)
+
+
+	def _render_csv(self, rows):
+		output = io.StringIO()
+		for row in rows:
+			output.write(",".join([self._csv_value(value) for value in row]))
+			output.write("\n")
+		return output.getvalue().encode('utf-8')
+
+
+	def _csv_value(self, value):
+		# NULL is an unquoted empty value, other values except of numbers are quoted
+		if value is None:
+			return ''
+		if isinstance(value, bool):
+			return 'true' if value else 'false'
+		if isinstance(value, int):
+			return repr(value)
+		if isinstance(value, float):
+			if math.isnan(value):
+				return 'NaN'
+			if math.isinf(value):
+				return 'Infinity' if value > 0 else '-Infinity'
+			return repr(value)
+		if isinstance(value, (bytes, bytearray, memoryview)):
+			# The hex format of bytea
+			return '"\\x{}"'.format(bytes(value).hex())
+		return '"{}"'.format(str(value).replace('"', '""'))
+
+
+	def _render_binary(self, rows):
+		output = io.BytesIO()
+		output.write(self.BinaryHeader)
+		field_count = struct.pack('>h', len(self.Columns))
+		for row in rows:
+			output.write(field_count)
+			for value in row:
+				if value is None:
+					output.write(b'\xff\xff\xff\xff')
+					continue
+
+				if isinstance(value, bool):
+					data = b'\x01' if value else b'\x00'
+				elif isinstance(value, int):
+					data = struct.pack('>q', value)
+				elif isinstance(value, float):
+					data = struct.pack('>d', value)
+				elif isinstance(value, str):
+					data = value.encode('utf-8')
+				elif isinstance(value, (bytes, bytearray, memoryview)):
+					data = bytes(value)
+				else:
+					raise TypeError("Type '{}' is not supported by the binary COPY".format(type(value).__name__))
+
+				output.write(struct.pack('>i', len(data)))
+				output.write(data)
+
+		output.write(self.BinaryTrailer)
+		return output.getvalue()
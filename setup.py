@@ -111,6 +111,7 @@ setup(
 	],
 	extras_require={
 		'ldap': 'python-ldap',
+		'zstd': 'zstandard',
 	},
 	scripts=[
 		'utils/bselastic',
@@ -5,7 +5,19 @@ from .file import *
 from .filter import *
 from .kafka import *
 from .matrix import *
+from .mongodb import *
+from .postgresql import *
 from .declarative import *
 from .integrity import *
+from .ipc import *
+from .cache import *
+from .elasticsearch import *
+from .http import *
+from .parquet import *
+from .anomaly import *
+from .lookup import *
+from .aggregation import *
 from .test_config_defaults import *
 from .test_metrics_service import *
+from .test_compiled_pipeline import *
+from .test_batch_pipeline import *
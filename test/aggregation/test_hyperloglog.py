@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+
+from bspump.aggregation import HyperLogLog
+
+
+class TestHyperLogLog(unittest.TestCase):
+
+	def setUp(self):
+		self.HLL = HyperLogLog(m=2048)
+
+
+	def test_count(self):
+		registers = self.HLL.zeros()
+		self.assertEqual(0, self.HLL.count(registers))
+
+		values = ["10.0.{}.{}".format(i // 256, i % 256) for i in range(50000)]
+		self.HLL.add_many(values, registers)
+		self.assertLess(self.HLL.compute_error(50000, self.HLL.count(registers)), 5)
+
+		# Adding the same values again does not change the estimate
+		copy = registers.copy()
+		self.HLL.add_many(values[:1000], registers)
+		self.assertTrue(np.array_equal(copy, registers))
+
+
+	def test_small_count(self):
+		registers = self.HLL.zeros()
+		for value in ["a", "b", "a", 1, 2, 1]:
+			self.HLL.add(value, registers)
+		self.assertEqual(4, self.HLL.count(registers))
+
+
+	def test_hash_consistency(self):
+		# The scalar and the vectorized hashing give the same results
+		self.assertEqual(self.HLL.hash_data(7), int(self.HLL.hash_values(np.array([7]))[0]))
+		self.assertEqual(self.HLL.hash_data(-7), int(self.HLL.hash_values(np.array([-7]))[0]))
+		self.assertEqual(self.HLL.hash_data("foo"), int(self.HLL.hash_values(np.array(["foo"]))[0]))
+		self.assertNotEqual(self.HLL.hash_data("foo"), self.HLL.hash_data("fop"))
+
+		mixed = self.HLL.hash_values(["foo", 7, b"bar", 1.5])
+		self.assertEqual(
+			[self.HLL.hash_data(v) for v in ["foo", 7, b"bar", 1.5]],
+			[int(h) for h in mixed]
+		)
+
+
+	def test_rows(self):
+		matrix = np.zeros((3, 2048), dtype="u1")
+		values = np.arange(30000)
+		self.HLL.add_many(values, matrix, rows=values % 3)
+
+		counts = self.HLL.count(matrix)
+		self.assertEqual((3,), counts.shape)
+		for count in counts:
+			self.assertLess(self.HLL.compute_error(10000, count), 5)
+
+
+	def test_merge_serialize(self):
+		a = self.HLL.zeros()
+		b = self.HLL.zeros()
+		self.HLL.add_many(np.arange(0, 20000), a)
+		self.HLL.add_many(np.arange(10000, 30000), b)
+
+		union = self.HLL.union(a, b)
+		self.assertLess(self.HLL.compute_error(30000, self.HLL.count(union)), 5)
+
+		# Merge gives the same registers as adding all values
+		c = self.HLL.zeros()
+		self.HLL.add_many(np.arange(0, 30000), c)
+		self.assertTrue(np.array_equal(union, c))
+
+		data = self.HLL.serialize(union)
+		self.assertTrue(np.array_equal(union, self.HLL.deserialize(data)))
+		with self.assertRaises(ValueError):
+			HyperLogLog(m=1024).deserialize(data)
+		with self.assertRaises(ValueError):
+			self.HLL.merge(a, HyperLogLog(m=1024).zeros())
+
+
+	def test_incorrect_m(self):
+		with self.assertRaises(RuntimeError):
+			HyperLogLog(m=2000)
@@ -5,3 +5,4 @@ from .test_timedriftanalyzer import *
 from .test_timewindowanalyzer import *
 from .test_sessionanalyzer import *
 
+from .test_cardinalityanalyzer import *
@@ -0,0 +1,51 @@
+import bspump.analyzer
+import bspump.unittest
+
+
+class TestCardinalityAnalyzer(bspump.unittest.ProcessorTestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.set_up_processor(bspump.analyzer.CardinalityAnalyzer, config={
+			'key_attribute': 'destination',
+			'value_attribute': 'source',
+		})
+		self.Analyzer = self.Pipeline.Processor
+
+
+	def test_cardinality_analyzer(self):
+		events = [
+			(None, {"destination": "A", "source": "1"}),
+			(None, {"destination": "A", "source": "2"}),
+			(None, {"destination": "A", "source": "1"}),
+			(None, {"destination": "B", "source": "1"}),
+			(None, {"foo": "bar"}),
+		]
+		output = self.execute(events)
+
+		self.assertEqual([event for context, event in output], [event for context, event in events])
+		self.assertEqual(2, self.Analyzer.count("A"))
+		self.assertEqual(1, self.Analyzer.count("B"))
+		self.assertIsNone(self.Analyzer.count("C"))
+
+
+	def test_cardinality_analyzer_batch(self):
+		events = [
+			{"destination": "dst{}".format(i % 10), "source": "10.0.{}.{}".format(i // 256, i % 256)}
+			for i in range(20000)
+		]
+		events.append({"foo": "bar"})
+
+		output = self.Analyzer.process_batch({}, events)
+		self.assertIs(events, output)
+
+		counts = self.Analyzer.counts()
+		self.assertEqual({"dst{}".format(i) for i in range(10)}, set(counts.keys()))
+		for count in counts.values():
+			self.assertLess(abs(count - 2000), 2000 * 0.1)
+
+		# The same values produced by another pump are merged
+		other = self.Analyzer.HyperLogLog.zeros()
+		self.Analyzer.HyperLogLog.add_many([event["source"] for event in events[:-1:10]], other)
+		self.Analyzer.merge("dst0", other)
+		self.assertEqual(counts["dst0"], self.Analyzer.count("dst0"))
@@ -0,0 +1 @@
+from .test_anomaly_storage import *
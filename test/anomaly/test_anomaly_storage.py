@@ -0,0 +1,75 @@
+import math
+import time
+import unittest.mock
+
+import asab
+
+import bspump.unittest
+from bspump.anomaly import AnomalyManager, AnomalyStorage
+
+
+class StorageSource(object):
+
+	def __init__(self):
+		self.Output = []
+
+	async def put_async(self, context, event):
+		self.Output.append((context["es_id"], event["status"]))
+
+
+class TestAnomalyStorage(bspump.unittest.ProcessorTestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.CloseRules = asab.Config["GeneralAnomaly"]["close_rules"]
+		asab.Config["GeneralAnomaly"]["close_rules"] = "default:status;timed:60"
+
+	def tearDown(self):
+		asab.Config["GeneralAnomaly"]["close_rules"] = self.CloseRules
+		super().tearDown()
+
+	def symptom(self, key, anomaly_type, timestamp, status="open"):
+		return {
+			"@timestamp": timestamp,
+			"key": key,
+			"key_dimensions": {"user_id": key},
+			"type": anomaly_type,
+			"symptom": {"@timestamp": timestamp, "status": status},
+		}
+
+	def test_anomaly_storage_flush(self):
+		storage = AnomalyStorage(self.App, None)
+		storage.LoadTasks[0].cancel()
+
+		source = StorageSource()
+		svc = self.App.get_service("bspump.PumpService")
+
+		self.set_up_processor(AnomalyManager, storage)
+		manager = self.Pipeline.Processor
+
+		now = int(time.time())
+		manager.process({}, self.symptom("A", "default", now - 10))
+		manager.process({}, self.symptom("B", "timed", now - 200))
+		manager.process({}, self.symptom("B", "timed", now - 100))
+		manager.process({}, self.symptom("C", "timed", now - 10))
+
+		with unittest.mock.patch.object(svc, "locate", return_value=source):
+			# B has expired, A and C are changed
+			self.App.Loop.run_until_complete(storage.flush("Application.tick/300!"))
+			self.assertEqual([("B", "closed")], source.Output[:1])
+			self.assertEqual({("A", "open"), ("C", "open")}, set(source.Output[1:]))
+			self.assertEqual({"A", "C"}, set(storage["open"].keys()))
+			self.assertEqual({"A": math.inf, "C": now - 10 + 60}, storage.Deadlines)
+
+			# Nothing has changed
+			source.Output.clear()
+			self.App.Loop.run_until_complete(storage.flush("Application.tick/300!"))
+			self.assertEqual([], source.Output)
+
+			# A is closed by the status of the latest symptom
+			manager.process({}, self.symptom("A", "default", now - 5, "closed"))
+			manager.process({}, self.symptom("A", "default", now - 20))
+			self.App.Loop.run_until_complete(storage.flush("Application.tick/300!"))
+			self.assertEqual([("A", "closed")], source.Output)
+			self.assertEqual({"C"}, set(storage["open"].keys()))
+			self.assertEqual({"A", "B"}, set(storage["closed"].keys()))
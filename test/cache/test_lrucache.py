@@ -0,0 +1,125 @@
+import os
+import tempfile
+
+import bspump.cache
+import bspump.unittest
+
+
+class TestLRUCache(bspump.unittest.TestCase):
+
+	def test_lru(self):
+		cache = bspump.cache.LRUCache(self.App, id="TestLRU", config={'max_size': 3})
+		for key in "abc":
+			cache[key] = key.upper()
+
+		self.assertEqual(cache["a"], "A")
+		cache["d"] = "D"
+
+		# "b" is the least recently used one
+		self.assertNotIn("b", cache)
+		self.assertEqual(sorted(cache.keys()), ["a", "c", "d"])
+		with self.assertRaises(KeyError):
+			cache["b"]
+
+		self.assertEqual(cache.Counter.Storage["fieldset"][0]["actuals"]["evicted"], 1)
+		self.assertEqual(cache.Counter.Storage["fieldset"][0]["actuals"]["miss"], 1)
+
+
+	def test_ttl(self):
+		cache = bspump.cache.LRUCache(self.App, id="TestTTL", config={'ttl': 10, 'negative_ttl': 100})
+		now = self.App.time()
+		cache["a"] = 1
+		cache["b"] = None
+
+		self.App.time = lambda: now + 50
+		with self.assertRaises(KeyError):
+			cache["a"]
+		self.assertIsNone(cache["b"])
+
+		self.App.time = lambda: now + 200
+		cache.sweep()
+		self.assertEqual(len(cache), 0)
+
+
+	def test_max_bytes(self):
+		cache = bspump.cache.LRUCache(self.App, id="TestBytes", config={'max_size': 0, 'max_bytes': 1000})
+		for i in range(100):
+			cache[i] = "x" * 100
+
+		self.assertLessEqual(cache.Bytes, 1000)
+		self.assertIn(99, cache)
+
+
+	def test_tinylfu(self):
+		cache = bspump.cache.LRUCache(self.App, id="TestTinyLFU", config={'max_size': 2, 'admission': 'tinylfu'})
+		cache["a"] = 1
+		cache["b"] = 2
+		for _ in range(5):
+			cache["a"]
+			cache["b"]
+
+		# A one-hit wonder does not push out popular keys
+		cache["c"] = 3
+		self.assertNotIn("c", cache)
+		self.assertIn("a", cache)
+		self.assertIn("b", cache)
+
+
+	def test_disk_tier(self):
+		path = os.path.join(tempfile.mkdtemp(), "cache")
+		cache = bspump.cache.LRUCache(self.App, id="TestDisk", config={'max_size': 1, 'path': path})
+		cache["a"] = {"name": "A"}
+		cache["b"] = {"name": "B"}
+		self.assertNotIn("a", cache)
+
+		# The evicted entry is promoted from the disk
+		self.assertEqual(cache["a"], {"name": "A"})
+		cache.Disk.close()
+
+		cache = bspump.cache.LRUCache(self.App, id="TestDisk2", config={'path': path})
+		self.assertEqual(cache["b"], {"name": "B"})
+		cache.Disk.close()
+
+
+	def test_disk_tier_bounds(self):
+		path = os.path.join(tempfile.mkdtemp(), "cache")
+		cache = bspump.cache.LRUCache(self.App, id="TestDiskBounds", config={'max_size': 1, 'path': path, 'disk_max_size': 2, 'ttl': 10})
+		for key in "abc":
+			cache[key] = key.upper()
+
+		self.assertEqual(len(cache.Disk), 2)
+		self.assertIsNone(cache.Disk.get("a"))
+		self.assertEqual(cache["b"], "B")
+
+		# Expired entries are swept from the index without reading the file
+		now = self.App.time()
+		self.App.time = lambda: now + 20
+		cache.sweep()
+		self.assertEqual(len(cache.Disk), 0)
+		cache.Disk.close()
+
+		disk = bspump.cache.DiskCacheTier(path, max_bytes=1)
+		self.assertEqual(len(disk), 0)
+		disk.set("a", "A", 0)
+		self.assertEqual(len(disk), 0)
+		disk.close()
+
+
+	def test_lru_cache_dict(self):
+		cache = bspump.cache.LRUCacheDict(self.App, max_size=2, max_duration=1000)
+		cache["a"] = 1
+		cache["b"] = 2
+		cache["c"] = 3
+		self.assertEqual(dict(cache.items()), {"b": 2, "c": 3})
+
+
+	def test_default_ids(self):
+		first = bspump.cache.LRUCacheDict(self.App, max_size=2)
+		second = bspump.cache.LRUCacheDict(self.App, max_size=2)
+		self.assertNotEqual(first.Id, second.Id)
+		self.assertIsNot(first.Counter, second.Counter)
+
+		first["a"] = 1
+		first.get("a")
+		self.assertEqual(1, first.Counter.Storage["fieldset"][0]["actuals"]["hit"])
+		self.assertEqual(0, second.Counter.Storage["fieldset"][0]["actuals"]["hit"])
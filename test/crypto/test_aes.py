@@ -53,3 +53,16 @@ class TestDecryptAESProcessor(bspump.unittest.ProcessorTestCase):
 			output[0][1],
 			b'deadc0de'
 		)
+
+
+class TestOffloadedAESProcessor(bspump.unittest.ProcessorTestCase):
+
+	def test_offloaded_aes_processor(self):
+		events = [b'deadc0de' * i for i in range(7)]
+
+		self.set_up_processor(CustomEncryptAESProcessor, config={"offload_chunk": 3})
+		encrypted = self.Pipeline.Processor.process_batch({}, events)
+		self.assertEqual(encrypted[1], b'3\xeaj\xb6\xc4S\xc2\x8a\xef]\xf6\xfc\t\xc1\xd2\x02')
+
+		decrypt = CustomDecryptAESProcessor(self.App, self.Pipeline, config={"offload_chunk": 3})
+		self.assertEqual(decrypt.process_batch({}, encrypted), events)
@@ -245,3 +245,17 @@ class TestMD5ContextHashingProcessor(bspump.unittest.ProcessorTestCase):
 			b'\xdb^R\x1f\xe0rP\xeb|o\x01\xda\xd9\xe4#\xfd'
 		)
 
+
+
+class TestOffloadedHashingProcessor(bspump.unittest.ProcessorTestCase):
+
+	def test_offloaded_hashing_processor(self):
+		events = [b'deadc0de' * i for i in range(7)]
+
+		self.set_up_processor(SHA256HashingProcessor, config={"offload_chunk": 2})
+
+		output = self.Pipeline.Processor.process_batch({}, events)
+		self.assertEqual(
+			output,
+			[self.Pipeline.Processor.process({}, event) for event in events]
+		)
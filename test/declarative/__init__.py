@@ -9,3 +9,6 @@ from .test_declarative_and import *
 from .test_declarative_add import *
 from .test_declarative_time import *
 from .test_declarative_nested_expression import *
+from .test_declarative_compiler import *
+from .test_declarative_ip import *
+from .test_declarative_cache import *
@@ -0,0 +1,80 @@
+import os
+
+import yaml
+
+import bspump.declarative
+import bspump.unittest
+
+
+class TestDeclarativeCache(bspump.unittest.ProcessorTestCase):
+
+	def setUp(self) -> None:
+		super().setUp()
+		bspump.declarative.get_declaration_cache(self.App).clear()
+		basedir = os.path.dirname(__file__)
+		with open(os.path.join(basedir, './test_compiler.yaml'), 'r') as f:
+			self.Declaration = f.read()
+
+
+	def initialize(self, processor):
+		self.App.Loop.run_until_complete(processor.initialize())
+		return processor
+
+
+	def test_cache_shared(self):
+		self.set_up_processor(bspump.declarative.DeclarativeProcessor, declaration=self.Declaration)
+		first = self.initialize(self.Pipeline.Processor)
+		second = self.initialize(bspump.declarative.DeclarativeProcessor(
+			self.App, self.Pipeline, declaration=self.Declaration, id="second"
+		))
+		self.assertIs(first.Expressions, second.Expressions)
+		self.assertIs(first.Compiled, second.Compiled)
+		self.assertEqual(6, second.process({}, {'key': 3}))
+
+		# The configuration of the builder is a part of the key
+		third = bspump.declarative.DeclarativeProcessor(
+			self.App, self.Pipeline, declaration=self.Declaration, id="third"
+		)
+		third.Builder.add_config_value("foo", "bar")
+		self.initialize(third)
+		self.assertIsNot(first.Expressions, third.Expressions)
+
+		# The cache can be disabled
+		fourth = self.initialize(bspump.declarative.DeclarativeProcessor(
+			self.App, self.Pipeline, declaration=self.Declaration, id="fourth", config={"cache": "no"}
+		))
+		self.assertIsNot(first.Expressions, fourth.Expressions)
+		self.assertEqual(6, fourth.process({}, {'key': 3}))
+
+
+	def test_loader_isolated(self):
+		builder = bspump.declarative.ExpressionBuilder(self.App)
+		self.App.Loop.run_until_complete(builder.parse(self.Declaration))
+
+		# Expression tags are not registered globally
+		self.assertNotIn("!WHEN", yaml.Loader.yaml_constructors)
+		self.assertIn("!WHEN", builder.LoaderClass.yaml_constructors)
+
+
+	def test_optimizer_single_pass(self):
+		builder = bspump.declarative.ExpressionBuilder(self.App)
+		optimizer = bspump.declarative.ExpressionOptimizer(self.App)
+
+		items = "\n".join("- !EQ\n  - !ITEM EVENT key{}\n  - {}".format(i, i) for i in range(300))
+		declaration = "---\n!AND\n" + items
+		expression = self.App.Loop.run_until_complete(builder.parse(declaration))[0]
+
+		calls = []
+		for obj in [obj for _, _, obj in expression.walk()]:
+			original = obj.optimize
+			obj.optimize = lambda original=original: calls.append(1) or original()
+
+		optimized = optimizer.optimize(expression)
+
+		# Each node is optimized at most a few times, instead of once per every rewrite
+		self.assertLess(len(calls), 3 * len(list(expression.walk())))
+
+		event = {"key{}".format(i): i for i in range(300)}
+		self.assertTrue(optimized({}, event))
+		event["key150"] = -1
+		self.assertFalse(optimized({}, event))
@@ -0,0 +1,68 @@
+import os
+
+import bspump.declarative
+import bspump.unittest
+
+
+class TestDeclarativeCompiler(bspump.unittest.TestCase):
+
+	def setUp(self) -> None:
+		super().setUp()
+		self.Builder = bspump.declarative.ExpressionBuilder(self.App)
+		self.Optimizer = bspump.declarative.ExpressionOptimizer(self.App)
+		self.Compiler = bspump.declarative.ExpressionCompiler(self.App)
+
+
+	def load(self, decl_fname):
+		basedir = os.path.dirname(__file__)
+		with open(os.path.join(basedir, decl_fname), 'r') as f:
+			expressions = self.App.Loop.run_until_complete(self.Builder.parse(f.read()))
+		return self.Optimizer.optimize_many(expressions)[0]
+
+
+	def test_compiler_01(self):
+		decl = self.load('./test_compiler.yaml')
+		compiled = self.Compiler.compile(decl)
+
+		# The whole tree is compiled, no expression is called
+		self.assertFalse(any(
+			isinstance(value, bspump.declarative.Expression) for value in compiled.__globals__.values()
+		))
+
+		events = [
+			{'key': 34, 'string': "Thirty four"},
+			{'key': 34, 'string': "Thirty four", 'flag': True},
+			{'key': 45},
+			{'key': 77, 'flag': False},
+			{'key': 3},
+		]
+		for event in events:
+			self.assertEqual(decl({}, event), compiled({}, event))
+
+		self.assertEqual(
+			["Thirty four thirty four", 68, "in range", "flagged", 6],
+			[compiled({}, event) for event in events]
+		)
+
+
+	def test_compiler_error(self):
+		decl = self.load('./test_compiler.yaml')
+		compiled = self.Compiler.compile(decl)
+
+		with self.assertRaises(bspump.declarative.DeclarationError):
+			compiled({}, {'key': 34, 'string': None})
+
+		# The comparison of None fails in both variants
+		with self.assertRaises(bspump.declarative.DeclarationError):
+			decl({}, {})
+		with self.assertRaises(bspump.declarative.DeclarationError):
+			compiled({}, {})
+
+
+	def test_compiler_processor(self):
+		decl = self.load('./test_when.yaml')
+		compiled = self.Compiler.compile_processor([decl])
+
+		self.assertEqual("Thirty four", compiled({}, {'key': 34}))
+		self.assertEqual("seventy five, seven, nine", compiled({}, {'key': 75}))
+		self.assertEqual("Unknown", compiled({}, {'key': 1}))
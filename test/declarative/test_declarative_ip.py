@@ -0,0 +1,83 @@
+import random
+
+import netaddr
+
+import bspump.declarative
+import bspump.unittest
+from bspump.declarative.expression.ip.insubnetexpr import IP_INSUBNET_optimized_VALUE, SubnetTable
+
+
+class TestDeclarativeIP(bspump.unittest.TestCase):
+
+	def setUp(self) -> None:
+		super().setUp()
+		self.Builder = bspump.declarative.ExpressionBuilder(self.App)
+		self.Optimizer = bspump.declarative.ExpressionOptimizer(self.App)
+
+
+	def parse(self, declaration):
+		return self.App.Loop.run_until_complete(self.Builder.parse(declaration))[0]
+
+
+	def test_insubnet_optimized(self):
+		declaration = """---
+!IP.INSUBNET
+what: !ITEM EVENT ip
+subnet:
+  - 10.0.0.0/8
+  - 192.168.1.0/24
+  - 192.168.1.128/25
+  - 192.168.2.0/24
+  - 2001:db8::/32
+"""
+		interpreted = self.parse(declaration)
+		optimized = self.Optimizer.optimize(self.parse(declaration))
+		self.assertIsInstance(optimized, IP_INSUBNET_optimized_VALUE)
+		self.assertEqual([167772160, 3232235776], optimized.SubnetTable.Starts[4])
+
+		compiled = bspump.declarative.ExpressionCompiler(self.App).compile(optimized)
+
+		for ip in [
+			"10.1.2.3", "11.0.0.0", "192.168.1.200", "192.168.2.255", "192.168.3.0", "9.255.255.255",
+			"2001:db8::1", "2001:db9::1", "::ffff:10.0.0.1", "not an ip", 167772161, netaddr.IPAddress("10.0.0.1"),
+		]:
+			event = {"ip": ip}
+			self.assertEqual(interpreted({}, event), optimized({}, event), ip)
+			self.assertEqual(interpreted({}, event), compiled({}, event), ip)
+
+
+	def test_subnet_table(self):
+		rnd = random.Random(7)
+		subnets = [
+			str(netaddr.IPNetwork((rnd.getrandbits(32), rnd.randint(8, 32))).cidr)
+			for _ in range(500)
+		]
+		table = SubnetTable(subnets)
+		networks = [netaddr.IPNetwork(subnet) for subnet in subnets]
+
+		for _ in range(500):
+			address = netaddr.IPAddress(rnd.getrandbits(32))
+			self.assertEqual(
+				any(address in network for network in networks),
+				table.contains(str(address))
+			)
+
+		for network in networks[:50]:
+			self.assertTrue(table.contains(str(network.network)))
+			self.assertTrue(table.contains(str(netaddr.IPAddress(network.last))))
+
+
+	def test_regex_compiled(self):
+		declaration = """---
+!REGEX
+what: !ITEM EVENT message
+regex: "^(error|fail)"
+hit: "bad"
+miss: "good"
+"""
+		expression = self.Optimizer.optimize(self.parse(declaration))
+		compiled = bspump.declarative.ExpressionCompiler(self.App).compile(expression)
+
+		for message in ["error: disk", "failed", "ok"]:
+			self.assertEqual(expression({}, {"message": message}), compiled({}, {"message": message}))
+		self.assertEqual("bad", compiled({}, {"message": "failure"}))
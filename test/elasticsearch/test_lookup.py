@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import bspump.unittest
+from bspump.elasticsearch import ElasticSearchLookup
+
+
+class FakeResponse(object):
+
+	def __init__(self, msg):
+		self.status = 200
+		self.Msg = msg
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		return False
+
+	async def json(self):
+		return self.Msg
+
+
+class FakeSession(object):
+	'''
+	Returns documents of `hits` for each request, requests are recorded.
+	'''
+
+	def __init__(self, hits):
+		self.Hits = hits
+		self.Requests = []
+
+	def post(self, url, json=None, data=None, headers=None):
+		self.Requests.append((url, json, data))
+		if url.endswith("_msearch"):
+			return FakeResponse({'responses': [{'hits': {'hits': [hit]}} for hit in self.Hits]})
+		return FakeResponse({'hits': {'hits': self.Hits}})
+
+
+class FakeConnection(object):
+
+	def __init__(self, hits):
+		self.Session = FakeSession(hits)
+
+	def get_url(self):
+		return "http://localhost:9200/"
+
+	def get_shared_session(self):
+		return self.Session
+
+
+class TestElasticSearchLookup(bspump.unittest.TestCase):
+
+	def fetch(self, config, hits, keys):
+		connection = FakeConnection(hits)
+		lookup = ElasticSearchLookup(self.App, connection, config=dict({
+			'index': 'users',
+			'source_url': '/dev/null',
+			'batch_size': 10,
+		}, **config))
+		values = self.App.Loop.run_until_complete(
+			asyncio.gather(*[lookup.get(key) for key in keys])
+		)
+		return values, connection.Session.Requests
+
+
+	def test_batch_msearch(self):
+		hits = [{'_source': {'user': 'Alice'}}, {'_source': {'user': 'Bob'}}]
+		values, requests = self.fetch({'key': 'user'}, hits, ["alice", "bob"])
+
+		# Keys of the batch are matched by the same query as single lookups
+		self.assertEqual(values, [{'user': 'Alice'}, {'user': 'Bob'}])
+		self.assertEqual(len(requests), 1)
+		url, _, data = requests[0]
+		self.assertTrue(url.endswith("users/_msearch"))
+		queries = [json.loads(line) for line in data.decode('utf-8').splitlines()[1::2]]
+		self.assertEqual(queries[0]['query'], {'match': {'user': 'alice'}})
+
+
+	def test_batch_terms_nested_key(self):
+		hits = [{'_source': {'user': {'name': 'alice'}}}, {'_source': {'user': {'name': 'bob'}}}]
+		values, requests = self.fetch({'key': 'user.name', 'batch_query': 'terms'}, hits, ["alice", "bob", "carol"])
+
+		self.assertEqual(values, [{'user': {'name': 'alice'}}, {'user': {'name': 'bob'}}, None])
+		self.assertEqual(requests[0][1]['query'], {'terms': {'user.name': ["alice", "bob", "carol"]}})
@@ -1,3 +1,8 @@
+import glob
+import gzip
+import os
+import sys
+import tempfile
 from unittest.mock import patch, call
 
 import bspump.file
@@ -30,3 +35,51 @@ class TestFileBlockSink(bspump.unittest.ProcessorTestCase):
 			)
 			self.assertEqual(mock_file.call_args, call(3, "wb"))
 			self.assertEqual(output, [])
+
+
+class TestBufferedFileBlockSink(bspump.unittest.ProcessorTestCase):
+
+	def test_buffered(self):
+		path = os.path.join(tempfile.mkdtemp(), "out.bin")
+		events = [(None, b'dead'), (None, b'c0de'), (None, "text")]
+
+		self.set_up_processor(bspump.file.FileBlockSink, config={'path': path, 'buffered': 'yes'})
+		self.execute(events)
+
+		with open(path, "rb") as f:
+			self.assertEqual(f.read(), b'deadc0detext')
+
+
+	def test_buffered_gzip_rotation(self):
+		path = os.path.join(tempfile.mkdtemp(), "out.gz")
+		events = [(None, b'x' * 10) for _ in range(5)]
+
+		self.set_up_processor(bspump.file.FileBlockSink, config={
+			'path': path,
+			'buffered': 'yes',
+			'flush_size': 10,
+			'compression': 'gzip',
+			'rotate_size': 30,
+		})
+		self.execute(events)
+
+		data = b''
+		for fname in sorted(glob.glob(path + "*")):
+			with gzip.open(fname, "rb") as f:
+				data += f.read()
+
+		self.assertEqual(data, b'x' * 50)
+		self.assertGreater(len(glob.glob(path + ".*")), 0)
+
+
+	def test_buffered_zstd_missing(self):
+		path = os.path.join(tempfile.mkdtemp(), "out.zst")
+
+		# The missing package is reported by the configuration, not by the writes
+		with patch.dict(sys.modules, {'zstandard': None}):
+			with self.assertRaises(RuntimeError):
+				self.set_up_processor(bspump.file.FileBlockSink, config={
+					'path': path,
+					'buffered': 'yes',
+					'compression': 'zstd',
+				})
@@ -0,0 +1,2 @@
+from .test_http_client_source import *
+from .test_http_session_pool import *
@@ -0,0 +1,68 @@
+import bspump
+import bspump.unittest
+from bspump.http import HTTPClientLineSource, HTTPClientNDJSONSource, HTTPClientJSONArraySource
+
+
+class ChunkedContent(object):
+
+	def __init__(self, chunks):
+		self.Chunks = chunks
+
+	async def iter_chunked(self, n):
+		for chunk in self.Chunks:
+			yield chunk
+
+
+class ChunkedResponse(object):
+
+	def __init__(self, body, chunk_size):
+		self.charset = 'utf-8'
+		self.content = ChunkedContent([body[i:i + chunk_size] for i in range(0, len(body), chunk_size)])
+
+
+class TestHTTPClientStreamingSource(bspump.unittest.TestCase):
+
+	def read(self, source_class, body, chunk_size=3):
+		pipeline = bspump.Pipeline(self.App, "HTTPPipeline")
+		source = source_class(self.App, pipeline)
+		events = []
+
+		async def process(event, context=None):
+			events.append(event)
+
+		source.process = process
+		self.App.Loop.run_until_complete(source.read(ChunkedResponse(body, chunk_size)))
+		return events
+
+
+	def test_lines(self):
+		body = "první\nsecond line\n\nčtvrtý\n".encode('utf-8')
+		for chunk_size in (1, 3, 100):
+			self.assertEqual(
+				self.read(HTTPClientLineSource, body, chunk_size),
+				"první\nsecond line\n\nčtvrtý\n".split('\n')
+			)
+
+		# A line spread over many chunks, the last line has no newline
+		body = ("x" * 1000 + "\ny\nend").encode('utf-8')
+		self.assertEqual(self.read(HTTPClientLineSource, body, 7), ["x" * 1000, "y", "end"])
+
+
+	def test_ndjson(self):
+		body = b'{"a": 1}\n\n{"b": [1, 2]}\n3\n'
+		self.assertEqual(self.read(HTTPClientNDJSONSource, body), [{"a": 1}, {"b": [1, 2]}, 3])
+
+
+	def test_json_array(self):
+		body = ' [ {"a": "x,]"}, 12345 ,[1, 2],"čau", null, 6.5e1 ] '.encode('utf-8')
+		expected = [{"a": "x,]"}, 12345, [1, 2], "čau", None, 65.0]
+		for chunk_size in (1, 2, 7, 1000):
+			self.assertEqual(self.read(HTTPClientJSONArraySource, body, chunk_size), expected)
+
+		self.assertEqual(self.read(HTTPClientJSONArraySource, b'[]'), [])
+		self.assertEqual(self.read(HTTPClientJSONArraySource, b'[7]', 1), [7])
+
+		with self.assertRaises(ValueError):
+			self.read(HTTPClientJSONArraySource, b'[1, 2')
+		with self.assertRaises(ValueError):
+			self.read(HTTPClientJSONArraySource, b'{"a": 1}')
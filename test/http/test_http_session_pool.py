@@ -0,0 +1,59 @@
+import aiohttp.web
+
+import bspump.unittest
+from bspump.http import HTTPClientSessionPool
+
+
+class TestHTTPClientSessionPool(bspump.unittest.TestCase):
+
+	def test_shared_session(self):
+		pool = HTTPClientSessionPool(self.App, "test", limit=5, limit_per_host=2)
+
+		async def get_sessions():
+			return pool.get(), pool.get()
+
+		first, second = self.App.Loop.run_until_complete(get_sessions())
+		self.assertIs(first, second)
+		self.assertEqual(first.connector.limit, 5)
+		self.assertEqual(first.connector.limit_per_host, 2)
+
+		pool._on_tick("Application.tick/10!")
+		values = pool.Gauge.Storage["fieldset"][0]["values"]
+		self.assertEqual(values["acquired"], 0)
+		self.assertEqual(values["limit"], 5)
+
+		self.App.Loop.run_until_complete(pool._on_exit("Application.exit!"))
+		self.assertTrue(first.closed)
+		self.assertIsNone(pool.Session)
+
+
+	def test_utilization(self):
+		pool = HTTPClientSessionPool(self.App, "test")
+
+		async def handle(request):
+			# The request is in progress until its response is received
+			return aiohttp.web.Response(text=str(pool.Acquired))
+
+		async def request_twice():
+			web_app = aiohttp.web.Application()
+			web_app.router.add_get("/", handle)
+			runner = aiohttp.web.AppRunner(web_app)
+			await runner.setup()
+			site = aiohttp.web.TCPSite(runner, "127.0.0.1", 0)
+			await site.start()
+			port = runner.addresses[0][1]
+			try:
+				for _ in range(2):
+					async with pool.get().get("http://127.0.0.1:{}/".format(port)) as response:
+						self.assertEqual(await response.text(), "1")
+			finally:
+				await pool._on_exit("Application.exit!")
+				await runner.cleanup()
+
+		self.App.Loop.run_until_complete(request_twice())
+
+		pool._on_tick("Application.tick/10!")
+		values = pool.Gauge.Storage["fieldset"][0]["values"]
+		self.assertEqual(values["acquired"], 0)
+		self.assertEqual(values["created"], 1)
+		self.assertEqual(values["reused"], 1)
@@ -1,3 +1,5 @@
+import gzip
+
 from aioresponses import aioresponses
 
 import bspump.unittest
@@ -43,6 +45,48 @@ class TestInfluxDBSink(bspump.unittest.ProcessorTestCase):
 		self.assertEqual(1, len(requests))
 		request = next(iter(requests))
 		self.assertEqual("http://test:8086/write?db=test", str(request[0][1]))
-		self.assertEqual("collection,tag1=a,tag2=b field=12 1234567890000000000", request[1][0][1]["data"].strip())
+		self.assertEqual(b"collection,tag1=a,tag2=b field=12 1234567890000000000", request[1][0][1]["data"].strip())
 
 		self.assertEqual(output, [])
+
+
+	@aioresponses()
+	def test_influxdb_sink_batch_gzip(self, mocked):
+		mocked.post(
+			"http://test:8086/write?db=test&precision=ns",
+			status=204
+		)
+
+		connection = InfluxDBConnection(
+			self.App,
+			"InfluxDBConnection",
+			config={
+				"url": "http://test:8086/",
+				"db": "test",
+				"compression": "gzip",
+			}
+		)
+		self.App.get_service("bspump.PumpService").add_connection(connection)
+
+		self.set_up_processor(
+			InfluxDBSink,
+			connection="InfluxDBConnection"
+		)
+
+		output = self.Pipeline.Processor.process_batch({}, [
+			("collection", "tag1=a", "field=1", 1),
+			("collection", "tag1=b", "field=2", 2),
+		])
+		self.assertEqual(output, [])
+		self.Pipeline.Processor.process({}, b"raw field=3 3")
+
+		self.App.Loop.run_until_complete(connection._on_exit("Application.exit!"))
+
+		requests = mocked.requests.items()
+		self.assertEqual(1, len(requests))
+		request = next(iter(requests))[1][0][1]
+		self.assertEqual({'Content-Encoding': 'gzip'}, request["headers"])
+		self.assertEqual(
+			b"collection,tag1=a field=1 1000000000\ncollection,tag1=b field=2 2000000000\nraw field=3 3\n",
+			gzip.decompress(request["data"])
+		)
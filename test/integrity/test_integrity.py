@@ -1,3 +1,7 @@
+import hashlib
+
+import orjson
+
 import bspump.unittest
 from bspump.integrity import IntegrityEnricher
 
@@ -52,3 +56,23 @@ class TestIntegrityEnricher(bspump.unittest.ProcessorTestCase):
 		# 	output[0][1],
 		# 	b'\x86ex\x08\x1a\x1d\xeas\xbeG\xdc\xdeE3K\x17\xb2\xcc\xc0=\x88-\xa2\xd0\xfb\x1eQ\xec\x9d\xdcse'
 		# )
+
+
+	def test_integrity_enricher_offload(self):
+		events = [{'number': i, 'string': "foo bar" * i} for i in range(7)]
+
+		self.set_up_processor(IntegrityEnricher, config={"offload_chunk": 2})
+
+		output = self.Pipeline.Processor.process_batch({}, events)
+		self.assertEqual(7, len(output))
+
+		previous_hash = None
+		for event in output:
+			self.assertEqual(previous_hash, event.get('_prev_id'))
+			event = dict(event)
+			event_hash = event.pop('_id')
+			self.assertEqual(
+				event_hash,
+				hashlib.sha256(orjson.dumps(event, option=orjson.OPT_SORT_KEYS)).hexdigest()
+			)
+			previous_hash = event_hash
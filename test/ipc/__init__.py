@@ -0,0 +1,2 @@
+from .test_protocol import *
+from .test_datagram import *
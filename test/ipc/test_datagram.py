@@ -0,0 +1,69 @@
+import asyncio
+import socket
+
+import bspump
+import bspump.unittest
+from bspump.ipc import DatagramSource
+
+
+class TestDatagramSource(bspump.unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.Pipeline = bspump.Pipeline(self.App, "DatagramPipeline")
+		self.Source = DatagramSource(self.App, self.Pipeline, config={
+			'address': '127.0.0.1:0',
+			'batch_size': 3,
+		})
+		self.Address = self.Source.Socket.getsockname()
+		self.Senders = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for _ in range(2)]
+		for sender in self.Senders:
+			sender.bind(('127.0.0.1', 0))
+
+
+	def tearDown(self):
+		for sender in self.Senders:
+			sender.close()
+		self.Source.Socket.close()
+		super().tearDown()
+
+
+	def test_drain(self):
+		for i in range(5):
+			self.Senders[0].sendto(b"packet %d" % i, self.Address)
+
+		self.App.Loop.run_until_complete(asyncio.wait_for(self.Source._readable(), 1))
+		self.assertEqual([event for event, _ in self.Source._drain()], [b"packet 0", b"packet 1", b"packet 2"])
+		self.assertEqual([event for event, _ in self.Source._drain()], [b"packet 3", b"packet 4"])
+		self.assertEqual(self.Source._drain(), [])
+
+
+	def test_batches_by_peer(self):
+		received = []
+
+		async def process(event, context=None):
+			received.append((context['datagram'], event))
+
+		async def process_batch(events, context=None):
+			received.append((context['datagram'], events))
+
+		async def ready():
+			return True
+
+		self.Pipeline.ready = ready
+		self.Source.process = process
+		self.Source.process_batch = process_batch
+
+		self.Senders[0].sendto(b"a", self.Address)
+		self.Senders[0].sendto(b"b", self.Address)
+		self.Senders[1].sendto(b"c", self.Address)
+		peers = [sender.getsockname() for sender in self.Senders]
+
+		async def run():
+			task = asyncio.ensure_future(self.Source._receive_batches())
+			await asyncio.sleep(0.1)
+			task.cancel()
+			await task
+
+		self.App.Loop.run_until_complete(run())
+		self.assertEqual(received, [(peers[0], [b"a", b"b"]), (peers[1], b"c")])
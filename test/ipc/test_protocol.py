@@ -0,0 +1,95 @@
+import configparser
+import struct
+
+import bspump.unittest
+from bspump.ipc.protocol import LineSourceProtocol
+
+
+class ChunkStream(object):
+
+	def __init__(self, chunks):
+		self.Chunks = list(chunks)
+
+	async def recv_into(self, buf):
+		if len(self.Chunks) == 0:
+			return 0
+		chunk = self.Chunks.pop(0)
+		size = min(len(chunk), len(buf))
+		buf[:size] = chunk[:size]
+		if size < len(chunk):
+			self.Chunks.insert(0, chunk[size:])
+		return size
+
+
+class CollectingPipeline(object):
+
+	async def ready(self):
+		return True
+
+
+class CollectingSource(object):
+
+	def __init__(self):
+		self.Pipeline = CollectingPipeline()
+		self.Events = []
+		self.Batches = []
+
+	async def process(self, event, context=None):
+		self.Events.append(event)
+
+	async def process_batch(self, events, context=None):
+		self.Batches.append(events)
+		self.Events.extend(events)
+
+
+class TestLineSourceProtocol(bspump.unittest.TestCase):
+
+	def handle(self, chunks, **config):
+		cfg = {
+			'framing': 'newline',
+			'buffer_size': 8,
+			'max_frame_size': 1024,
+			'batch': 'yes',
+			'decode': 'utf-8',
+		}
+		cfg.update(config)
+		parser = configparser.ConfigParser()
+		parser.read_dict({'protocol': cfg})
+		protocol = LineSourceProtocol(self.App, None, config=parser['protocol'])
+		source = CollectingSource()
+		self.App.Loop.run_until_complete(protocol.handle(source, ChunkStream(chunks), {}))
+		return source
+
+
+	def test_newline(self):
+		source = self.handle([b"first\nsec", b"ond line\nthird", b"\nfourth\nfifth\n"])
+		self.assertEqual(source.Events, ["first", "second line", "third", "fourth", "fifth"])
+
+		source = self.handle([b"first\nsec", b"ond line\nthird", b"\nfourth\nfifth\n"], buffer_size=64)
+		self.assertEqual(source.Events, ["first", "second line", "third", "fourth", "fifth"])
+		self.assertEqual(source.Batches, [["third", "fourth", "fifth"]])
+
+
+	def test_crlf_bytes(self):
+		source = self.handle([b"a\r\nb\r", b"\nc\r\n"], framing='crlf', decode='bytes', batch='no')
+		self.assertEqual(source.Events, [b"a", b"b", b"c"])
+		self.assertEqual(source.Batches, [])
+
+
+	def test_octet_counting(self):
+		messages = [b"<34>1 - first message", b"<34>1 - line\nwith new line", b"x" * 100]
+		data = b"".join(b"%d %s" % (len(message), message) for message in messages) + b"<13>non-transparent\n"
+		source = self.handle([data[i:i + 5] for i in range(0, len(data), 5)], framing='octet-counting', decode='bytes')
+		self.assertEqual(source.Events, messages + [b"<13>non-transparent"])
+
+
+	def test_length_prefix(self):
+		messages = [b"\x00\x01\x02", b"", b"\n" * 50]
+		data = b"".join(struct.pack(">I", len(message)) + message for message in messages)
+		source = self.handle([data], framing='length-prefix', decode='bytes')
+		self.assertEqual(source.Events, messages)
+
+
+	def test_insane_frame(self):
+		with self.assertRaises(RuntimeError):
+			self.handle([b"x" * 100], max_frame_size=64)
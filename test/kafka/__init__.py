@@ -1 +1,3 @@
 from .test_kafkasink import *
+from .test_kafkabatchsink import *
+from .test_kafkasource import *
@@ -0,0 +1,53 @@
+import bspump.unittest
+from bspump.kafka import KafkaConnection, KafkaBatchSink
+
+
+class TestKafkaBatchSink(bspump.unittest.ProcessorTestCase):
+
+	def setUp(self):
+		super().setUp()
+		svc = self.App.get_service("bspump.PumpService")
+		svc.add_connection(
+			KafkaConnection(
+				self.App,
+				"KafkaConnection",
+				config={
+					"bootstrap_servers": "localhost:1",
+				}
+			)
+		)
+
+	def test_buffer_and_throttle(self):
+		self.set_up_processor(
+			KafkaBatchSink,
+			connection="KafkaConnection",
+			config={
+				"buffer.messages": "3",
+				"watermark.high": "10",
+				"watermark.low": "5",
+			}
+		)
+		sink = self.Pipeline.Processor
+
+		for i in range(5):
+			sink.process({}, {"i": i})
+		self.assertEqual(3, self.produced(sink))
+		self.assertEqual([b'{"i": 3}', b'{"i": 4}'], [message[1] for message in sink.Buffer])
+		self.assertIsNotNone(sink.LingerHandle)
+
+		output = sink.process_batch({"kafka_topic": "other"}, [b"a", "b"] * 5)
+		self.assertEqual([], output)
+		self.assertEqual(15, self.produced(sink))
+		self.assertEqual([], sink.Buffer)
+		self.assertIsNone(sink.LingerHandle)
+		self.assertTrue(sink.IsThrottling)
+		self.assertIn(sink, self.Pipeline._throttles)
+
+		sink.Producer.purge()
+		sink._on_throttle_check()
+		self.assertFalse(sink.IsThrottling)
+		self.assertNotIn(sink, self.Pipeline._throttles)
+
+	def produced(self, sink):
+		# The length of the producer queue includes also log events of librdkafka
+		return sink.Counter.Storage["fieldset"][0]["actuals"]["produced"]
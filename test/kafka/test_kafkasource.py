@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import time
+import unittest.mock
+
+import bspump
+import bspump.unittest
+from bspump.kafka import KafkaConnection, KafkaSource
+
+
+class FakeMessage(object):
+
+	def __init__(self, topic, partition, offset, value=None, error=None):
+		self._topic = topic
+		self._partition = partition
+		self._offset = offset
+		self._value = value if value is not None else "{}:{}:{}".format(topic, partition, offset).encode()
+		self._error = error
+
+	def topic(self):
+		return self._topic
+
+	def partition(self):
+		return self._partition
+
+	def offset(self):
+		return self._offset
+
+	def value(self):
+		return self._value
+
+	def key(self):
+		return None
+
+	def headers(self):
+		return None
+
+	def error(self):
+		return self._error
+
+
+class FakeConsumer(object):
+	'''
+	Returns scripted results of `consume()`, an exception in the script is raised.
+	'''
+
+	def __init__(self, script):
+		self.Script = list(script)
+		self.ConsumeCalls = 0
+		self.Commits = []
+		self.Closed = False
+		self.Thread = None
+
+	def subscribe(self, topics):
+		pass
+
+	def consume(self, num_messages, timeout):
+		self.Thread = threading.current_thread()
+		self.ConsumeCalls += 1
+		if len(self.Script) == 0:
+			time.sleep(0.01)
+			return []
+		result = self.Script.pop(0)
+		if isinstance(result, BaseException):
+			raise result
+		return result
+
+	def commit(self, offsets, asynchronous):
+		self.Commits.append(sorted((tp.topic, tp.partition, tp.offset) for tp in offsets))
+
+	def close(self):
+		self.Closed = True
+
+
+class TestKafkaSourceThread(bspump.unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		svc = self.App.get_service("bspump.PumpService")
+		svc.add_connection(KafkaConnection(self.App, "KafkaConnection", config={"bootstrap_servers": "localhost:1"}))
+		self.Pipeline = bspump.Pipeline(self.App, "KafkaPipeline")
+		self.Errors = []
+		self.Pipeline.set_error = lambda context, event, exc: self.Errors.append(exc)
+
+
+	def source(self, script, **config):
+		cfg = {"consumer_thread": "yes", "queue_size": 1, "consume_timeout": 0.01}
+		cfg.update(config)
+		source = KafkaSource(self.App, self.Pipeline, "KafkaConnection", config=cfg)
+		source.Events = []
+
+		async def process(event, context=None):
+			source.Events.append(event)
+		source.process = process
+
+		self.Consumer = FakeConsumer(script)
+		self.Consumers = []
+		return source
+
+
+	def start(self, source):
+		self.Patch = unittest.mock.patch("confluent_kafka.Consumer", self.create_consumer)
+		self.Patch.start()
+		self.addCleanup(self.Patch.stop)
+		task = asyncio.ensure_future(source._main_threaded())
+		self.wait(0.2)
+		return task
+
+
+	def create_consumer(self, config, logger):
+		# The first consumer is scripted, the following ones (after errors) are idle
+		if len(self.Consumers) > 0:
+			self.Consumer = FakeConsumer([])
+		self.Consumers.append(self.Consumer)
+		return self.Consumer
+
+
+	def wait(self, seconds):
+		self.App.Loop.run_until_complete(asyncio.sleep(seconds))
+
+
+	def stop(self, task):
+		task.cancel()
+		self.App.Loop.run_until_complete(asyncio.wait_for(task, 5))
+		self.assertTrue(self.Consumer.Closed)
+		self.assertFalse(self.Consumer.Thread.is_alive())
+
+
+	def test_back_pressure(self):
+		script = [[FakeMessage("t", 0, i)] for i in range(5)]
+		source = self.source(script)
+
+		# The pipeline is not ready, so one list is in the queue and the thread waits with another one
+		task = self.start(source)
+		self.assertEqual(2, self.Consumer.ConsumeCalls)
+		self.assertEqual([], source.Events)
+		self.assertIsNot(threading.current_thread(), self.Consumer.Thread)
+
+		self.Pipeline.throttle(self, True)
+		self.Pipeline.throttle(self, False)
+		self.wait(0.3)
+		self.assertEqual([b"t:0:0", b"t:0:1", b"t:0:2", b"t:0:3", b"t:0:4"], source.Events)
+
+		self.stop(task)
+
+
+	def test_thread_exception(self):
+		source = self.source([[FakeMessage("t", 0, 0)], RuntimeError("Broker failed")])
+		self.Pipeline.throttle(self, True)
+		self.Pipeline.throttle(self, False)
+
+		with self.assertLogs("bspump.kafka.source", level="ERROR"):
+			task = self.start(source)
+
+		self.assertEqual([b"t:0:0"], source.Events)
+		self.assertEqual(1, len(self.Errors))
+		self.assertEqual("Broker failed", str(self.Errors[0]))
+
+		# The failed consumer is closed and the source consumes by a new one
+		self.assertEqual(2, len(self.Consumers))
+		self.assertTrue(self.Consumers[0].Closed)
+		self.assertFalse(self.Consumers[0].Thread.is_alive())
+		self.assertGreater(self.Consumers[1].ConsumeCalls, 0)
+		self.assertFalse(task.done())
+
+		self.stop(task)
+
+
+	def test_shutdown_with_full_queue(self):
+		script = [[FakeMessage("t", 0, i)] for i in range(100)]
+		source = self.source(script)
+
+		task = self.start(source)
+		self.assertEqual(2, self.Consumer.ConsumeCalls)
+
+		# The thread waits for a free slot in the queue, it is released and joined
+		self.stop(task)
+		self.assertEqual(2, self.Consumer.ConsumeCalls)
+		self.assertEqual([], source.Events)
+
+
+	def test_manual_commit(self):
+		messages = [
+			FakeMessage("t", 0, 5),
+			FakeMessage("t", 1, 7),
+			FakeMessage("t", 0, 6),
+			FakeMessage("t", 0, 100, error="Partition EOF"),
+			FakeMessage("t", 1, 2),
+			FakeMessage("u", 0, 1),
+		]
+		source = self.source([messages], **{"enable.auto.commit": "false", "batch_size": 10})
+		source.process_batch = source.process
+		self.Pipeline.throttle(self, True)
+		self.Pipeline.throttle(self, False)
+
+		with self.assertLogs("bspump.kafka.source", level="ERROR"):
+			task = self.start(source)
+
+		self.assertEqual([[("t", 0, 7), ("t", 1, 8), ("u", 0, 2)]], self.Consumer.Commits)
+		self.stop(task)
@@ -0,0 +1,2 @@
+from .test_async_lookup import *
+from .test_ipgeo_lookup import *
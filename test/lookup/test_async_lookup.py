@@ -0,0 +1,46 @@
+import asyncio
+
+import bspump.abc.lookup
+import bspump.unittest
+
+
+class CountingLookup(bspump.abc.lookup.AsyncLookupMixin):
+
+	def __init__(self, app, id=None, config=None):
+		super().__init__(app, id=id, config=config)
+		self.Queries = []
+
+	async def _fetch_one(self, key):
+		self.Queries.append([key])
+		await asyncio.sleep(0.01)
+		return key.upper()
+
+	async def _fetch_many(self, keys):
+		self.Queries.append(keys)
+		await asyncio.sleep(0.01)
+		return {key: key.upper() for key in keys if key != "missing"}
+
+	async def get(self, key):
+		return await self.fetch(key)
+
+
+class TestAsyncLookup(bspump.unittest.TestCase):
+
+	def test_single_flight(self):
+		lookup = CountingLookup(self.App, config={'source_url': '/dev/null'})
+		values = self.App.Loop.run_until_complete(
+			asyncio.gather(*[lookup.get("a") for _ in range(10)])
+		)
+		self.assertEqual(values, ["A"] * 10)
+		self.assertEqual(lookup.Queries, [["a"]])
+		self.assertEqual(lookup.InFlight, {})
+
+
+	def test_batch(self):
+		lookup = CountingLookup(self.App, config={'source_url': '/dev/null', 'batch_size': 3})
+		keys = ["a", "b", "a", "c", "d", "missing"]
+		values = self.App.Loop.run_until_complete(
+			asyncio.gather(*[lookup.get(key) for key in keys])
+		)
+		self.assertEqual(values, ["A", "B", "A", "C", "D", None])
+		self.assertEqual(lookup.Queries, [["a", "b", "c"], ["d", "missing"]])
@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+import bspump.lookup
+import bspump.unittest
+
+
+CSV = '''"0","16777215","-","-","-","-","0.000000","0.000000"
+"16777216","16777471","AU","Australia","Queensland","Brisbane","-27.467940","153.028090"
+"16777472","16778239","CN","China","Fujian","Fuzhou","26.061390","119.306110"
+"16778240","16779263","AU","Australia","Victoria","Melbourne","-37.814000","144.963320"
+"16779264","16781311","CN","China","Guangdong","Guangzhou","23.116670","113.250000"
+"42541956101370907050197289607612071936","42541956180599069564461627201156022271","US","United States","California","Mountain View","37.405990","-122.078514"
+'''
+
+
+class TestIPGeoLookup(bspump.unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.Dir = tempfile.mkdtemp()
+		self.Path = os.path.join(self.Dir, "db.csv")
+		with open(self.Path, "w") as f:
+			f.write(CSV)
+
+
+	def create_lookup(self, cache_path=''):
+		lookup = bspump.lookup.IPGeoLookup(self.App, config={
+			'path': self.Path,
+			'cache_path': cache_path,
+			'source_url': self.Path,
+		})
+		self.App.Loop.run_until_complete(lookup.load())
+		return lookup
+
+
+	def test_lookup(self):
+		lookup = self.create_lookup()
+		self.assertEqual(lookup.lookup_location("1.0.0.1")["city"], "Brisbane")
+		self.assertEqual(lookup.lookup_location("1.0.1.255")["city"], "Fuzhou")
+		self.assertEqual(lookup.lookup_location("2001:4860::8888")["city"], "Mountain View")
+		self.assertIsNone(lookup.lookup_location("1.0.64.0"))
+		self.assertEqual(lookup.lookup_location("0.0.0.1"), {'lat': None, 'lon': None})
+
+		# Locations are deduplicated
+		self.assertEqual(len(lookup.Locations), 6)
+
+
+	def test_lookup_many(self):
+		lookup = self.create_lookup()
+		locations = lookup.lookup_many(["1.0.8.1", "invalid", "2001:4860::1", "1.0.4.0", "ffff::"])
+		self.assertEqual(
+			[location.get("city") if location is not None else None for location in locations],
+			["Guangzhou", None, "Mountain View", "Melbourne", None]
+		)
+
+
+	def test_cache(self):
+		cache_path = os.path.join(self.Dir, "cache")
+		lookup = self.create_lookup(cache_path)
+		self.assertTrue(os.path.exists(os.path.join(cache_path, "locations.json")))
+
+		lookup = self.create_lookup(cache_path)
+		self.assertEqual(lookup.lookup_location("1.0.0.1")["city"], "Brisbane")
+		self.assertEqual(lookup.lookup_location("2001:4860::8888")["city"], "Mountain View")
+
+
+	def test_lookup_single_and_many(self):
+		lookup = self.create_lookup()
+		addresses = ["0.0.0.0", "1.0.0.0", "1.0.0.255", "1.0.1.0", "1.0.7.255", "1.0.15.255", "1.0.16.0", "2001:4860::", "2001:4861::", "::1", "ffff::"]
+		self.assertEqual(
+			[lookup.lookup_location(address) for address in addresses],
+			lookup.lookup_many(addresses)
+		)
@@ -51,6 +51,20 @@ class TestMatrix(bspump.unittest.TestCase):
 		self.assertEqual(matrix.Array.shape, (1,))
 
 
+	def test_matrix_grow_rows(self):
+		matrix = bspump.Matrix(app=self.App, dtype='i8')
+		storages = set()
+		for i in range(1000):
+			n = matrix.add_row()
+			matrix.Array[n] = i
+			storages.add(id(matrix.Storage))
+
+		# The rows are mostly added to the spare capacity of the storage
+		self.assertLess(len(storages), 10)
+		self.assertLessEqual(matrix.Array.shape[0], matrix.Storage.shape[0])
+		self.assertEqual(matrix.Array[:1000].tolist(), list(range(1000)))
+
+
 	# def test_matrix_flush(self):
 	# 	matrix = bspump.Matrix(app=self.App)
 
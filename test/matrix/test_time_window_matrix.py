@@ -1,3 +1,4 @@
+import math
 import time
 
 import bspump
@@ -52,6 +53,26 @@ class TestTimeWindowMatrix(bspump.unittest.TestCase):
 	# 	matrix.flush()
 	# 	self.assertEqual(0, matrix.Array.shape[0])
 
+
+	def test_matrix_flush(self):
+		matrix = bspump.matrix.TimeWindowMatrix(app=self.App, columns=3, clock_driven=False)
+		for i in range(20):
+			row_index = matrix.add_row("row{}".format(i))
+			matrix.Array[row_index, 0] = i
+
+		for i in range(0, 20, 3):
+			matrix.close_row("row{}".format(i))
+
+		matrix.flush()
+		self.assertEqual(len(matrix.ClosedRows), 0)
+		self.assertEqual(matrix.Array.shape[0], len(matrix.Index))
+		for i in range(20):
+			row_index = matrix.get_row_index("row{}".format(i))
+			if i % 3 == 0:
+				self.assertIsNone(row_index)
+			else:
+				self.assertEqual(matrix.Array[row_index, 0], i)
+
 	
 	def test_matrix_get_column(self):
 		columns = 10
@@ -88,3 +109,26 @@ class TestTimeWindowMatrix(bspump.unittest.TestCase):
 		target_ts = matrix.TimeConfig.get_start() + 0.5 * matrix.Resolution
 		added = matrix.advance(target_ts)
 		self.assertGreater(added, 0)
+
+
+	def test_matrix_ring_buffer(self):
+		columns = 3
+		cur_time = int(time.time())
+		matrix = bspump.matrix.TimeWindowMatrix(
+			app=self.App, start_time=cur_time, resolution=1, columns=columns, clock_driven=False,
+			config={'ring_buffer': True}
+		)
+		row_index = matrix.add_row("abc")
+		end = matrix.TimeConfig.get_end()
+		for i in range(columns):
+			matrix.Array[row_index, matrix.get_column(end + i + 0.5)] = i + 1
+
+		array = matrix.Array
+		matrix.add_column()
+		self.assertIs(matrix.Array, array)
+
+		ordered = matrix.get_ordered_array()
+		self.assertEqual(list(ordered[row_index, :2]), [2, 3])
+		self.assertEqual(matrix.Array[row_index, matrix.get_column(end + 1.5)], 2)
+		# The oldest column has been cleared and reused for the newest time slot
+		self.assertTrue(math.isnan(matrix.Array[row_index, matrix.get_column(end + 3.5)]))
@@ -0,0 +1,77 @@
+import asyncio
+
+import pymongo.errors
+
+import bspump
+import bspump.unittest
+from bspump.abc.connection import Connection
+from bspump.mongodb import MongoDBSink
+
+
+class FakeCollection(object):
+
+	def __init__(self):
+		self.Batches = []
+
+	async def insert_many(self, documents, ordered=True):
+		assert not ordered
+		await asyncio.sleep(0)
+		self.Batches.append(list(documents))
+		duplicates = [i for i, document in enumerate(documents) if document.get("duplicate")]
+		if len(duplicates) > 0:
+			raise pymongo.errors.BulkWriteError({
+				'nInserted': len(documents) - len(duplicates),
+				'writeErrors': [{'index': i, 'code': 11000, 'errmsg': 'duplicate key'} for i in duplicates],
+			})
+
+
+class FakeMongoDBConnection(Connection):
+
+	def __init__(self, app, id=None, config=None):
+		super().__init__(app, id=id, config=config)
+		self.Database = "database"
+		self.Collections = {"a": FakeCollection(), "b": FakeCollection()}
+		self.Client = {"database": self.Collections}
+
+
+class TestMongoDBSink(bspump.unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.Pipeline = bspump.Pipeline(self.App, "MongoDBPipeline")
+		self.Connection = FakeMongoDBConnection(self.App)
+
+
+	def test_batches(self):
+		sink = MongoDBSink(self.App, self.Pipeline, self.Connection, config={
+			'collection': 'a',
+			'batch_size': 3,
+			'max_outstanding': 4,
+		})
+
+		sink.process({}, {"n": 1})
+		sink.process({"collection": "b"}, {"n": 2})
+		sink.process({}, [{"n": 3}, {"n": 4, "duplicate": True}])
+		self.assertTrue(sink.IsThrottling)
+		sink.process({}, {"n": 5})
+
+		self.App.Loop.run_until_complete(sink._on_exit("Application.exit!"))
+
+		self.assertEqual(self.Connection.Collections["a"].Batches, [
+			[{"n": 1}, {"n": 3}, {"n": 4, "duplicate": True}],
+			[{"n": 5}],
+		])
+		self.assertEqual(self.Connection.Collections["b"].Batches, [[{"n": 2}]])
+		self.assertEqual(sink.Outstanding, 0)
+		self.assertFalse(sink.IsThrottling)
+
+		values = sink.Counter.Storage["fieldset"][0]["actuals"]
+		self.assertEqual(values["inserted"], 4)
+		self.assertEqual(values["failed"], 1)
+		self.assertEqual(values["batches"], 3)
+
+
+	def test_invalid_event(self):
+		sink = MongoDBSink(self.App, self.Pipeline, self.Connection)
+		with self.assertRaises(TypeError):
+			sink.process({}, "event")
@@ -0,0 +1 @@
+from .test_parquet_sink import *
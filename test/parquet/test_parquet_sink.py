@@ -0,0 +1,71 @@
+import glob
+import json
+import os
+import tempfile
+
+import pyarrow.parquet as pq
+
+import bspump
+import bspump.unittest
+from bspump.parquet import ParquetSink
+
+
+class TestParquetSinkArrow(bspump.unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.TempDir = tempfile.TemporaryDirectory()
+		self.SchemaFile = os.path.join(self.TempDir.name, "schema.json")
+		with open(self.SchemaFile, "w") as f:
+			json.dump({
+				"name": {"type": "string"},
+				"age": {"type": "int"},
+				"salary": {"type": "float"},
+				"active": {"type": "bool"},
+				"tags": {"type": "list"},
+			}, f)
+
+
+	def tearDown(self):
+		self.TempDir.cleanup()
+		super().tearDown()
+
+
+	def test_arrow(self):
+		pipeline = bspump.Pipeline(self.App, "ParquetPipeline")
+		sink = ParquetSink(self.App, pipeline, config={
+			'mode': 'arrow',
+			'schema_file': self.SchemaFile,
+			'rows_in_chunk': 2,
+			'rows_per_file': 4,
+			'compression': 'zstd',
+			'file_name_template': os.path.join(self.TempDir.name, 'sink{index}.parquet'),
+		})
+
+		events = [
+			{"name": "a", "age": 1, "salary": 1.5, "active": True, "tags": ["x"]},
+			{"name": "b", "age": "2", "salary": 2, "active": "false", "extra": 1},
+			{"name": 3, "age": "nan?", "salary": None, "active": 1, "tags": []},
+			{"name": "d", "age": 4.0, "salary": "4.5", "active": False, "tags": ["y", "z"]},
+			{"name": "e"},
+		]
+		for event in events:
+			sink.process({}, event)
+
+		self.App.Loop.run_until_complete(sink.WriterFuture)
+		sink._on_exit_arrow("Application.exit!")
+
+		closed = sorted(glob.glob(os.path.join(self.TempDir.name, "*.parquet")))
+		self.assertEqual([os.path.basename(fname) for fname in closed], ["sink0000.parquet"])
+		self.assertEqual(pq.read_table(closed[0]).to_pylist(), [
+			{"name": "a", "age": 1, "salary": 1.5, "active": True, "tags": ["x"]},
+			{"name": "b", "age": 2, "salary": 2.0, "active": False, "tags": None},
+			{"name": "3", "age": None, "salary": None, "active": True, "tags": []},
+			{"name": "d", "age": 4, "salary": 4.5, "active": False, "tags": ["y", "z"]},
+		])
+
+		# The last incomplete chunk is written on exit into the next file
+		table = pq.read_table(os.path.join(self.TempDir.name, "sink0001.parquet-open"))
+		self.assertEqual(table.column("name").to_pylist(), ["e"])
+		self.assertEqual(sink.NewSet, {"extra"})
+		self.assertEqual(sink.MissingSet, {"tags", "salary", "age", "active"})
@@ -0,0 +1,2 @@
+from .test_statement import *
+from .test_connection import *
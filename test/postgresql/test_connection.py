@@ -0,0 +1,206 @@
+import asyncio
+import unittest.mock
+
+import bspump
+import bspump.unittest
+from bspump.postgresql import CopyStatement, InsertStatement, PostgreSQLConnection, PostgreSQLSink
+
+
+class FakeCursor(object):
+
+	def __init__(self, executed):
+		self.Executed = executed
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		return False
+
+	def mogrify(self, query, row):
+		return (query % row).encode('utf-8')
+
+	async def execute(self, query):
+		if b"bad" in query:
+			raise RuntimeError("Invalid row")
+		self.Executed.append(query)
+
+
+class FakeConnection(object):
+
+	def __init__(self, executed):
+		self.Executed = executed
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		return False
+
+	def cursor(self):
+		return FakeCursor(self.Executed)
+
+
+class FakeSyncConnection(object):
+
+	def __init__(self):
+		self.Copied = []
+		self.Committed = 0
+		self.RolledBack = 0
+		self.closed = 0
+
+	def cursor(self):
+		return self
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc, tb):
+		return False
+
+	def copy_expert(self, query, file):
+		payload = file.read()
+		if b"bad" in payload:
+			raise RuntimeError("Invalid row")
+		self.Copied.append((query, payload))
+
+	def commit(self):
+		self.Committed += 1
+
+	def rollback(self):
+		self.RolledBack += 1
+
+
+class FakePool(object):
+
+	def __init__(self, minconn, maxconn, **kwargs):
+		self.MaxConn = maxconn
+		self.Connection = FakeSyncConnection()
+		self.Returned = 0
+
+	def getconn(self):
+		return self.Connection
+
+	def putconn(self, conn, close=False):
+		self.Returned += 1
+
+	def closeall(self):
+		pass
+
+
+class TestPostgreSQLConnection(bspump.unittest.TestCase):
+
+	def connection(self, **config):
+		# Connecting to the server is not tested
+		with unittest.mock.patch.object(PostgreSQLConnection, "_on_health_check"):
+			connection = PostgreSQLConnection(self.App, config=config)
+
+		self.Executed = []
+		connection.acquire = lambda: FakeConnection(self.Executed)
+		return connection
+
+
+	def run_loader(self, connection):
+		connection._output_queue.put_nowait((None, None))
+		self.App.Loop.run_until_complete(connection._loader())
+
+
+	def test_tick_flush(self):
+		connection = self.connection(max_bulk_size=10)
+		connection.consume("q1", (1,))
+		connection.consume("q1", (2,))
+		connection.consume("q2", (3,))
+		self.assertEqual(0, connection._output_queue.qsize())
+
+		# Paused connection does not flush
+		connection._pause = True
+		connection._on_tick("Application.tick!")
+		self.assertEqual(0, connection._output_queue.qsize())
+
+		connection._pause = False
+		connection._on_tick("Application.tick!")
+		self.assertEqual(("q1", [(1,), (2,)]), connection._output_queue.get_nowait())
+		self.assertEqual(("q2", [(3,)]), connection._output_queue.get_nowait())
+
+		# Empty bulks are not flushed
+		connection._on_tick("Application.tick!")
+		self.assertEqual(0, connection._output_queue.qsize())
+
+
+	def test_pause_unpause(self):
+		connection = self.connection(max_bulk_size=1, output_queue_max_size=2)
+
+		pipeline = bspump.Pipeline(self.App, "PostgreSQLPipeline")
+		sink = PostgreSQLSink(self.App, pipeline, connection, config={'query': 'INSERT %s', 'data': 'a'})
+		throttles = []
+		pipeline.throttle = lambda who, enable: throttles.append((who, enable))
+
+		sink.process({}, {'a': 1})
+		self.assertFalse(connection._pause)
+		sink.process({}, {'a': 2})
+
+		# Pause is published to the application PubSub, the connection and the sink react to it
+		self.assertTrue(connection._pause)
+		self.assertEqual([(sink, True)], throttles)
+
+		self.run_loader(connection)
+		self.assertEqual([b"INSERT 1", b"INSERT 2"], self.Executed)
+
+		# Unpause is published asynchronously
+		self.App.Loop.run_until_complete(asyncio.sleep(0))
+		self.assertFalse(connection._pause)
+		self.assertEqual([(sink, True), (sink, False)], throttles)
+
+
+	def test_query_per_statement(self):
+		connection = self.connection(max_bulk_size=4)
+		for row in [("a",), ("b",), ("bad",), ("c",)]:
+			connection.consume("INSERT %s", row)
+
+		with self.assertLogs("bspump.postgresql.connection", level="ERROR"):
+			self.run_loader(connection)
+
+		# Rows before the invalid one are stored
+		self.assertEqual([b"INSERT a", b"INSERT b"], self.Executed)
+
+
+	def test_insert_statement(self):
+		connection = self.connection(max_bulk_size=2)
+		statement = InsertStatement("events", ["a"])
+		connection.consume(statement, ("'x'",))
+		connection.consume(statement, ("'y'",))
+		connection.consume(statement, ("'bad'",))
+		connection.consume(statement, ("'z'",))
+
+		with self.assertLogs("bspump.postgresql.connection", level="ERROR") as logs:
+			self.run_loader(connection)
+
+		self.assertEqual([b"INSERT INTO events (a) VALUES ('x'), ('y')"], self.Executed)
+		self.assertIn("2 rows were dropped", logs.output[0])
+
+
+	def test_copy_pool(self):
+		connection = self.connection(max_bulk_size=2, copy_pool_size=3)
+		statement = CopyStatement("events", ["a", "b"])
+		connection.consume(statement, (1, "x"))
+		connection.consume(statement, (2, None))
+		connection.consume(statement, (3, "bad"))
+		connection.consume(statement, (4, "z"))
+
+		with unittest.mock.patch("psycopg2.pool.ThreadedConnectionPool", FakePool):
+			with self.assertLogs("bspump.postgresql.connection", level="ERROR") as logs:
+				self.run_loader(connection)
+
+			pool = connection._copy_pool
+			self.assertEqual(3, pool.MaxConn)
+			self.assertEqual(
+				[("COPY events (a, b) FROM STDIN WITH (FORMAT csv)", b'1,"x"\n2,\n')],
+				pool.Connection.Copied
+			)
+			self.assertEqual(1, pool.Connection.Committed)
+			self.assertEqual(1, pool.Connection.RolledBack)
+			self.assertEqual(2, pool.Returned)
+			self.assertIn("2 rows were dropped", logs.output[0])
+
+			connection._close_copy_pool()
+			self.assertIsNone(connection._copy_pool)
@@ -0,0 +1,65 @@
+import struct
+import unittest
+
+from bspump.postgresql import CopyStatement, InsertStatement
+
+
+class MogrifyCursor(object):
+
+	def mogrify(self, query, row):
+		return (query % tuple(repr(value) for value in row)).encode('utf-8')
+
+
+class TestStatement(unittest.TestCase):
+
+	def test_insert_render(self):
+		statement = InsertStatement("events", ["a", "b"])
+		self.assertEqual(
+			b"INSERT INTO events (a, b) VALUES (1, 'x'), (2, None)",
+			statement.render(MogrifyCursor(), [(1, 'x'), (2, None)])
+		)
+
+
+	def test_copy_csv(self):
+		statement = CopyStatement("events", ["a", "b", "c", "d", "e", "f"])
+		self.assertEqual("COPY events (a, b, c, d, e, f) FROM STDIN WITH (FORMAT csv)", statement.Query)
+
+		self.assertEqual(
+			b'1,1.5,,"say ""hi"", ok",true,"\\x00ff"\n'
+			b'-2,NaN,"",false,-Infinity,"line\nbreak"\n',
+			statement.render([
+				(1, 1.5, None, 'say "hi", ok', True, b"\x00\xff"),
+				(-2, float('nan'), '', False, float('-inf'), "line\nbreak"),
+			])
+		)
+
+
+	def test_copy_binary(self):
+		statement = CopyStatement("events", ["a", "b", "c", "d", "e"], format='binary')
+		self.assertEqual("COPY events (a, b, c, d, e) FROM STDIN WITH (FORMAT binary)", statement.Query)
+
+		payload = statement.render([(7, 0.5, None, "žluť", b"\x00\x01"), (False, -1.0, "", None, bytearray(b"x"))])
+
+		expected = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+		expected += struct.pack('>h', 5)
+		expected += struct.pack('>iq', 8, 7)
+		expected += struct.pack('>id', 8, 0.5)
+		expected += b'\xff\xff\xff\xff'
+		expected += struct.pack('>i', 6) + "žluť".encode('utf-8')
+		expected += struct.pack('>i', 2) + b"\x00\x01"
+		expected += struct.pack('>h', 5)
+		expected += struct.pack('>i', 1) + b'\x00'
+		expected += struct.pack('>id', 8, -1.0)
+		expected += struct.pack('>i', 0)
+		expected += b'\xff\xff\xff\xff'
+		expected += struct.pack('>i', 1) + b"x"
+		expected += struct.pack('>h', -1)
+		self.assertEqual(expected, payload)
+
+		with self.assertRaises(TypeError):
+			statement.render([(object(), None, None, None, None)])
+
+
+	def test_copy_unknown_format(self):
+		with self.assertRaises(RuntimeError):
+			CopyStatement("events", ["a"], format='xml')
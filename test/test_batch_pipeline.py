@@ -0,0 +1,113 @@
+import bspump.unittest
+from bspump import Processor, Pipeline
+from bspump.trigger import PubSubTrigger
+from bspump.unittest import UnitTestSource, UnitTestSink
+
+
+class BatchUnitTestSource(UnitTestSource):
+
+	async def cycle(self, *args, **kwags):
+		for context, events in self.Input:
+			await self.process_batch(events, context=context)
+
+
+class UpperBatchProcessor(Processor):
+
+	def process_batch(self, context, events):
+		return [event.upper() for event in events]
+
+
+class DropProcessor(Processor):
+
+	def process(self, context, event):
+		if event == "DROP":
+			return None
+		if event == "ERROR":
+			raise RuntimeError("Processing error")
+		return event
+
+
+class BatchPipeline(Pipeline):
+
+	def __init__(self, app, id=None, config=None):
+		super().__init__(app, id, config)
+		self.PubSub.subscribe("bspump.pipeline.cycle_end!", self._on_finished)
+		self.Source = BatchUnitTestSource(app, self).on(
+			PubSubTrigger(app, "Application.run!", app.PubSub)
+		)
+		self.Sink = UnitTestSink(app, self)
+		self.build(
+			self.Source,
+			UpperBatchProcessor(app, self),
+			DropProcessor(app, self),
+			self.Sink
+		)
+
+	def handle_error(self, exception, context, event):
+		return True
+
+	def _on_finished(self, event_name, pipeline):
+		self.App.stop()
+
+
+class TestBatchPipeline(bspump.unittest.TestCase):
+
+	def test_batch_pipeline(self):
+		svc = self.App.get_service("bspump.PumpService")
+
+		pipeline = BatchPipeline(self.App)
+		pipeline.Source.Input = [
+			({"batch": 1}, ["a", "drop", "b"]),
+			(None, ["error", "c"]),
+		]
+		svc.add_pipeline(pipeline)
+		self.App.run()
+
+		self.assertEqual(
+			[({"batch": 1}, "A"), ({"batch": 1}, "B"), ({}, "C")],
+			pipeline.Sink.Output
+		)
+
+		values = pipeline.MetricsCounter.Storage["fieldset"][0]["values"]
+		self.assertEqual(values["event.in"], 5)
+		self.assertEqual(values["event.out"], 3)
+		self.assertEqual(values["warning"], 1)
+		self.assertEqual(pipeline.Sink.EventCount, 3)
+
+
+	def test_batch_hard_error(self):
+		svc = self.App.get_service("bspump.PumpService")
+		pipeline = BatchPipeline(self.App)
+		svc.add_pipeline(pipeline)
+
+		handled = []
+
+		def handle_error(exception, context, event):
+			handled.append(event)
+			return False
+		pipeline.handle_error = handle_error
+
+		pipeline._do_process_batch(["a", "error", "b", "c"], 0, {})
+
+		# Events before the error reach the sink, the rest of the batch is not processed
+		self.assertEqual([({}, "A")], pipeline.Sink.Output)
+		self.assertEqual(["ERROR"], handled)
+		self.assertIsNotNone(pipeline._error)
+
+
+	def test_batch_processor_error(self):
+		svc = self.App.get_service("bspump.PumpService")
+		pipeline = BatchPipeline(self.App)
+		svc.add_pipeline(pipeline)
+
+		handled = []
+
+		def handle_error(exception, context, event):
+			handled.append(event)
+			return True
+		pipeline.handle_error = handle_error
+
+		# The failing process_batch() is represented by the first event of the batch
+		pipeline._do_process_batch([1, "b"], 0, {})
+		self.assertEqual([1], handled)
+		self.assertEqual([], pipeline.Sink.Output)
@@ -0,0 +1,71 @@
+import bspump.unittest
+from bspump import Processor, Pipeline
+from bspump.trigger import PubSubTrigger
+from bspump.unittest import UnitTestSource, UnitTestSink
+
+
+class DropProcessor(Processor):
+
+	def process(self, context, event):
+		if event == "drop":
+			return None
+		return event
+
+
+class CompiledPipeline(Pipeline):
+
+	def __init__(self, app, id=None, config=None):
+		super().__init__(app, id, config)
+		self.PubSub.subscribe("bspump.pipeline.cycle_end!", self._on_finished)
+		self.Source = UnitTestSource(app, self).on(
+			PubSubTrigger(app, "Application.run!", app.PubSub)
+		)
+		self.Processor = DropProcessor(app, self)
+		self.Sink = UnitTestSink(app, self)
+		self.build(
+			self.Source,
+			self.Processor,
+			self.Sink
+		)
+
+	def _on_finished(self, event_name, pipeline):
+		self.App.stop()
+
+
+class TestCompiledPipeline(bspump.unittest.TestCase):
+
+	def _values(self, counter):
+		return counter.Storage["fieldset"][0]["values"]
+
+
+	def test_compiled_pipeline(self):
+		svc = self.App.get_service("bspump.PumpService")
+
+		pipeline = CompiledPipeline(self.App, config={"compiled": "yes", "profiler_sampling": 3})
+		self.assertEqual(len(pipeline.CompiledChains), 1)
+
+		pipeline.Source.Input = [(None, "ok"), (None, "drop")] * 5
+		svc.add_pipeline(pipeline)
+		self.App.run()
+
+		self.assertEqual([({}, "ok")] * 5, pipeline.Sink.Output)
+
+		pipeline._on_metrics_flush("Metrics.flush!")
+
+		values = self._values(pipeline.MetricsCounter)
+		self.assertEqual(values["event.in"], 10)
+		self.assertEqual(values["event.out"], 5)
+		self.assertEqual(values["event.drop"], 5)
+
+		values = self._values(pipeline.ProcessorsCounter[pipeline.Processor.Id])
+		self.assertEqual(values["event.in"], 10)
+		self.assertEqual(values["event.out"], 10)
+		self.assertEqual(values["event.drop"], 5)
+
+		values = self._values(pipeline.ProcessorsCounter[pipeline.Sink.Id])
+		self.assertEqual(values["event.in"], 5)
+		self.assertEqual(pipeline.Sink.EventCount, 5)
+
+		# Only every 3rd event is profiled
+		values = self._values(pipeline.ProfilerCounter[pipeline.Processor.Id])
+		self.assertEqual(values["run"], 3)